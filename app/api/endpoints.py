@@ -1,24 +1,65 @@
+import asyncio
 import logging
-import io
-import datetime
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form
-from fastapi.responses import HTMLResponse, JSONResponse
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+from urllib.parse import urlencode
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query, Request, UploadFile, File, Form
+from fastapi.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from schemas.feedback import FeedbackCreate, FeedbackResponse
-from services.cognitive import analyze_feedback
-from services.db_async_sqlalchemy import init_db, save_feedback, get_all_feedbacks
-from services.storage import upload_file_to_blob
-import uvicorn
+from config import config
+from app import cache, metrics, startup
+from app.cache import FEEDBACKS_TAG, STATS_TAG, cache_stats, get_or_compute_response
+from app.schemas.feedback import FeedbackResponse, as_utc_naive, serialize_feedback
+from app.services import cognitive, dedup, events, ingestion
+from app.services.db_async_sqlalchemy import (
+    async_engine, write_engine, check_database, init_db, get_feedbacks_by_ids, get_feedbacks_page, get_sentiment_stats,
+)
+from app.services.pagination import decode_cursor, encode_cursor
+from app.services.bulk_import import IMPORT_FORMATS, import_feedbacks
+from app.services.export import EXPORT_MEDIA_TYPES, export_feedbacks
+from app.services.search import search_feedbacks
+from app.services.ingestion import QueueFullError, start_ingestion, stop_ingestion
+from app.services.retention import mover as retention_mover, start_retention, stop_retention
+from app.services.storage import close_storage, start_storage_init
+from app.services.submission import SubmissionError, process_submission
 
 logger = logging.getLogger(__name__)
+# JSON API routes; also included by the main application in app/main.py
+router = APIRouter()
 app = FastAPI()
+metrics.install(app)
+
+# Service counters exported as gauges on /metrics, read at scrape time
+metrics.register_stats("analysis", cognitive.resilience_stats)
+metrics.register_stats("analysis_cache", cognitive.cache_stats)
+metrics.register_stats("response_cache", cache_stats)
+metrics.register_stats("events", events.hub.stats)
+metrics.register_stats("ingestion", lambda: {"queue_depth": ingestion.queue.depth})
+metrics.register_stats("db_pool", lambda: metrics.pool_stats(async_engine.pool))
+if write_engine is not async_engine:
+    metrics.register_stats("db_write_pool", lambda: metrics.pool_stats(write_engine.pool))
+metrics.register_stats("retention", retention_mover.stats)
+metrics.register_stats("startup", startup.timer.stats)
+metrics.register_stats("dedup", dedup.detector.stats)
 
 # Mount static files directory
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
 @app.on_event("startup")
 async def startup_event():
-    await init_db()
+    if config.AUTO_CREATE_SCHEMA:
+        await init_db()
+    start_storage_init()
+    await start_ingestion()
+    start_retention()
+    dedup.start_dedup()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await dedup.stop_dedup()
+    await stop_retention()
+    await stop_ingestion()
+    close_storage()
 
 @app.get("/", response_class=HTMLResponse)
 async def read_index():
@@ -32,24 +73,237 @@ async def get_dashboard():
         html_content = f.read()
     return HTMLResponse(content=html_content)
 
-@app.get("/api/feedbacks", response_class=JSONResponse)
-async def api_get_all_feedbacks():
-    feedbacks = await get_all_feedbacks()
-    # Convert ORM objects to dicts; in a real app, use a serializer or Pydantic conversion.
-    result = []
-    for fb in feedbacks:
-        result.append({
-            "id": fb.id,
-            "name": fb.name,
-            "email": fb.email,
-            "feedback_text": fb.feedback_text,
-            "sentiment": fb.sentiment,
-            "confidence_scores": fb.confidence_scores,
-            "key_phrases": fb.key_phrases,
-            "attachment_url": fb.attachment_url,
-            "created_at": fb.created_at.isoformat() if fb.created_at else None
-        })
-    return JSONResponse(content=result)
+def feedback_filters(
+    sentiment: Optional[str] = Query(None, description="positive, neutral, negative or mixed"),
+    email: Optional[str] = Query(None),
+    since: Optional[datetime] = Query(None, description="Inclusive lower bound on created_at"),
+    until: Optional[datetime] = Query(None, description="Exclusive upper bound on created_at"),
+    min_positive: Optional[float] = Query(None, ge=0, le=1, description="Minimum positive confidence score"),
+    min_negative: Optional[float] = Query(None, ge=0, le=1, description="Minimum negative confidence score"),
+) -> Dict[str, Any]:
+    """Query-string filters shared by the feedback read endpoints."""
+    return {
+        "sentiment": sentiment,
+        "email": email,
+        "since": as_utc_naive(since),
+        "until": as_utc_naive(until),
+        "min_positive": min_positive,
+        "min_negative": min_negative,
+    }
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+async def cached_json_response(
+    request: Request,
+    tags: Iterable[str],
+    compute: Callable[[], Awaitable[Any]],
+    ttl: int = config.RESPONSE_CACHE_TTL,
+) -> Response:
+    """
+    Serve a JSON body through the response cache, keyed on the path and query
+    string. Answers 304 when the client's If-None-Match carries the current ETag.
+    """
+    key = request.url.path + "?" + urlencode(sorted(request.query_params.multi_items()))
+    entry = await get_or_compute_response(key, tags, compute, ttl=ttl)
+    # no-cache: clients may store the response but must revalidate it each time
+    headers = {"ETag": entry["etag"], "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), entry["etag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry["body"], media_type="application/json", headers=headers)
+
+@router.get("/api/feedbacks", response_class=JSONResponse)
+async def api_list_feedbacks(
+    request: Request,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    include_text: bool = Query(False, description="Include feedback_text in each item"),
+    filters: Dict[str, Any] = Depends(feedback_filters),
+):
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+    async def page() -> Dict[str, Any]:
+        rows, next_position = await get_feedbacks_page(limit=limit, after=after, include_text=include_text, **filters)
+        return {
+            "items": [serialize_feedback(row) for row in rows],
+            "next_cursor": encode_cursor(*next_position) if next_position else None,
+        }
+
+    return await cached_json_response(request, [FEEDBACKS_TAG], page)
+
+@router.get("/api/feedbacks/export")
+async def api_export_feedbacks(
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    include_text: bool = Query(True),
+    filters: Dict[str, Any] = Depends(feedback_filters),
+):
+    chunks = export_feedbacks(fmt=fmt, include_text=include_text, **filters)
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="feedbacks.{fmt}"'},
+    )
+
+@router.post("/api/feedbacks/import", response_class=JSONResponse)
+async def api_import_feedbacks(
+    file: UploadFile = File(...),
+    fmt: Optional[str] = Query(None, alias="format", pattern="^(jsonl|csv)$", description="Defaults to the file extension"),
+):
+    if fmt is None:
+        extension = (file.filename or "").rsplit(".", 1)[-1].lower()
+        fmt = extension if extension in IMPORT_FORMATS else "jsonl"
+    report = await import_feedbacks(file.file, fmt=fmt)
+    return JSONResponse(content=report)
+
+@router.get("/api/feedbacks/{feedback_id}/similar", response_class=JSONResponse)
+async def api_similar_feedbacks(
+    feedback_id: int,
+    limit: int = Query(10, ge=1, le=100),
+    min_similarity: float = Query(0.5, ge=0.0, le=1.0, description="Minimum shingle Jaccard similarity"),
+    include_text: bool = Query(False),
+):
+    if not dedup.detector.ready:
+        raise HTTPException(status_code=503, detail="Similarity index is not ready.", headers={"Retry-After": "5"})
+    rows = await get_feedbacks_by_ids([feedback_id], include_text=True)
+    if not rows:
+        raise HTTPException(status_code=404, detail="Feedback not found.")
+    matches = await dedup.detector.similar(
+        rows[0]["feedback_text"], min_similarity, limit=limit, exclude_id=feedback_id, include_text=include_text
+    )
+    return JSONResponse(content={"items": [serialize_feedback(row) for row in matches]})
+
+@router.get("/api/search", response_class=JSONResponse)
+async def api_search(
+    request: Request,
+    q: Optional[str] = Query(None, max_length=500, description="Words to match in feedback text and key phrases"),
+    phrase: Optional[str] = Query(None, max_length=255, description="Exact key phrase"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
+    include_text: bool = Query(False),
+    filters: Dict[str, Any] = Depends(feedback_filters),
+):
+    if not (q and q.strip()) and not phrase:
+        raise HTTPException(status_code=400, detail="Provide q or phrase.")
+
+    async def results() -> Dict[str, Any]:
+        rows, has_more = await search_feedbacks(
+            query=q, phrase=phrase, limit=limit, offset=offset, include_text=include_text, **filters
+        )
+        return {
+            "items": [serialize_feedback(row) for row in rows],
+            "next_offset": offset + limit if has_more else None,
+        }
+
+    return await cached_json_response(request, [FEEDBACKS_TAG], results)
+
+@router.get("/api/stats", response_class=JSONResponse)
+async def api_stats(
+    request: Request,
+    series: Optional[str] = Query(None, pattern="^(hour|day)$"),
+    points: int = Query(24, ge=1, le=366),
+):
+    return await cached_json_response(
+        request, [STATS_TAG], lambda: get_sentiment_stats(series=series, points=points), ttl=config.STATS_CACHE_TTL
+    )
+
+@router.get("/api/events")
+async def api_events():
+    """
+    Server-Sent Events stream of new and enriched feedback ("feedback"), deletions
+    ("deleted") and sentiment count changes ("stats").
+    """
+    try:
+        queue = events.hub.subscribe()
+    except events.TooManySubscribersError:
+        raise HTTPException(status_code=503, detail="Too many live dashboard connections.", headers={"Retry-After": "5"})
+
+    async def stream():
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    frame = await asyncio.wait_for(queue.get(), timeout=config.EVENTS_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    frame = ": keep-alive\n\n"
+                yield frame
+        finally:
+            events.hub.unsubscribe(queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/api/cache/stats", response_class=JSONResponse)
+async def api_cache_stats():
+    return JSONResponse(content={
+        "analysis": cognitive.cache_stats(),
+        "responses": cache_stats(),
+        "events": events.hub.stats(),
+    })
+
+@router.get("/api/analysis/stats", response_class=JSONResponse)
+async def api_analysis_stats():
+    return JSONResponse(content={
+        **cognitive.resilience_stats(),
+        "ingestion_queue_depth": ingestion.queue.depth,
+        "ingestion_running": ingestion.queue.running,
+    })
+
+@router.get("/api/retention/stats", response_class=JSONResponse)
+async def api_retention_stats():
+    return JSONResponse(content=retention_mover.stats())
+
+@router.get("/health", response_class=JSONResponse)
+async def health():
+    """
+    Liveness: the worker is up and serving; dependencies are not checked.
+    """
+    return JSONResponse(content={"status": "ok"})
+
+async def _check(probe: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+    try:
+        return await asyncio.wait_for(probe(), config.READY_CHECK_TIMEOUT)
+    except Exception as e:
+        return {"ok": False, "error": str(e) or type(e).__name__}
+
+async def _check_cache() -> Dict[str, Any]:
+    if cache.redis is None:
+        return {"ok": True, "backend": cache_stats()["backend"]}
+    await cache.redis.ping()
+    return {"ok": True, "backend": "redis"}
+
+@router.get("/ready", response_class=JSONResponse)
+async def ready():
+    """
+    Readiness: 200 once the database answers with the schema in place, 503 until
+    then. Also reports the worker's start-up timings.
+    """
+    checks = {
+        "database": await _check(check_database),
+        "cache": await _check(_check_cache),
+        # Informational: degraded mode or queued ingestion keep accepting feedback
+        "analysis": {"ok": True, "circuit_open": cognitive.circuit_open()},
+    }
+    is_ready = all(check["ok"] for check in checks.values())
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content={"status": "ready" if is_ready else "unavailable", "checks": checks, "startup": startup.timer.stats()},
+    )
+
+@router.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    if not metrics.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled.")
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
 
 @app.post("/submit", response_model=FeedbackResponse)
 async def submit_feedback(
@@ -59,34 +313,15 @@ async def submit_feedback(
     attachment: UploadFile = File(None)
 ):
     try:
-        cognitive_results = analyze_feedback(feedback_text)
-    except Exception as e:
-        logger.error(f"Cognitive analysis failed: {e}")
-        raise HTTPException(status_code=500, detail="Cognitive analysis error.")
+        feedback_data = await process_submission(name, email, feedback_text, attachment)
+    except QueueFullError:
+        raise HTTPException(status_code=429, detail="Too many pending submissions; retry later.", headers={"Retry-After": "1"})
+    except SubmissionError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return serialize_feedback(feedback_data)
 
-    attachment_url = None
-    if attachment:
-        content = await attachment.read()
-        attachment_url = upload_file_to_blob(io.BytesIO(content), attachment.filename)
-
-    feedback_data = {
-        "name": name,
-        "email": email,
-        "feedback_text": feedback_text,
-        "sentiment": cognitive_results.get("sentiment"),
-        "confidence_scores": str(cognitive_results.get("confidence_scores")),
-        "key_phrases": ", ".join(cognitive_results.get("key_phrases")),
-        "attachment_url": attachment_url,
-        "created_at": datetime.datetime.utcnow()
-    }
-    try:
-        feedback_id = await save_feedback(feedback_data)
-        feedback_data["id"] = feedback_id
-        feedback_data["created_at"] = feedback_data["created_at"].isoformat()
-        return feedback_data
-    except Exception as e:
-        logger.error(f"Error saving feedback: {e}")
-        raise HTTPException(status_code=500, detail="Error saving feedback.")
+app.include_router(router)
 
 if __name__ == "__main__":
+    import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
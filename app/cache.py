@@ -1,30 +1,366 @@
 # app/cache.py
-import aioredis
+"""
+Shared cache: Redis when it is reachable, otherwise an in-process store or, with
+``CACHE_FALLBACK=sqlite``, a SQLite file shared by the workers of one host.
+
+``get_cached_data``/``set_cached_data`` read and write the shared tier only
+(Redis or the SQLite file; callers keep their own in-process layer). ``get_or_compute_response`` caches
+serialized API responses with an ETag, versioned by tags that the data layer
+bumps through ``invalidate_tags`` on every write. For tests, pass a fake client
+(e.g. ``fakeredis.aioredis.FakeRedis()``) to ``init_cache``.
+"""
+import asyncio
+import hashlib
 import json
-from typing import Optional, Dict
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+from app.services.executor import run_blocking
+from config import config
+
+try:
+    from redis import asyncio as aioredis
+except ImportError:  # pragma: no cover - Redis is optional
+    aioredis = None
+
+# Tags of cached responses: listings and search results, and sentiment stats
+FEEDBACKS_TAG = "feedbacks"
+STATS_TAG = "stats"
+
+logger = logging.getLogger(__name__)
 
 redis = None
+# Response cache outcomes: served from cache, computed here, or computed by
+# another caller holding the lock
+_stats = {"hits": 0, "misses": 0, "waited": 0, "errors": 0}
+
+
+class MemoryBackend:
+    """
+    Bounded in-process key/value store with per-key expiry, used without Redis.
+    """
+
+    def __init__(self, maxsize: int = 1000):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[Optional[float], str]]" = OrderedDict()
+        # Counters (tag versions) are kept apart so that eviction never resets them
+        self._counters: Dict[str, int] = {}
+
+    def _live(self, key: str) -> Optional[str]:
+        if key in self._counters:
+            return str(self._counters[key])
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def get(self, key: str) -> Optional[str]:
+        return self._live(key)
+
+    async def mget(self, keys: Iterable[str]) -> list:
+        return [self._live(key) for key in keys]
+
+    async def set(self, key: str, value: str, ex: Optional[float] = None, nx: bool = False) -> bool:
+        if nx and self._live(key) is not None:
+            return False
+        self._entries[key] = (time.monotonic() + ex if ex else None, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return True
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+
+class SQLiteBackend:
+    """
+    Key/value store in a SQLite file in WAL mode, shared by the worker processes
+    of one host when there is no Redis. Same interface as MemoryBackend; each
+    thread of the blocking-I/O pool keeps its own connection. Expiry uses wall
+    clock time since the entries outlive the process that wrote them.
+    """
+
+    # Sets between sweeps of expired entries
+    PRUNE_EVERY = 500
+
+    def __init__(self, path: str, maxsize: int = 1000):
+        self.path = path
+        self.maxsize = maxsize
+        self._local = threading.local()
+        self._sets = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=config.SQLITE_BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            # Cache contents can be recomputed, so they are not worth an fsync
+            connection.execute("PRAGMA synchronous=OFF")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+            self._local.connection = connection
+        return connection
+
+    def _get(self, keys: list) -> list:
+        placeholders = ",".join("?" * len(keys))
+        rows = self._connect().execute(
+            f"SELECT key, value FROM cache_entries WHERE key IN ({placeholders}) "
+            "AND (expires_at IS NULL OR expires_at > ?)",
+            (*keys, time.time()),
+        ).fetchall()
+        found = dict(rows)
+        return [found.get(key) for key in keys]
+
+    def _set(self, key: str, value: str, ex: Optional[float], nx: bool) -> bool:
+        now = time.time()
+        expires_at = now + ex if ex else None
+        connection = self._connect()
+        if nx:
+            # Only replaces an entry that has expired
+            cursor = connection.execute(
+                "INSERT INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at "
+                "WHERE cache_entries.expires_at IS NOT NULL AND cache_entries.expires_at <= ?",
+                (key, value, expires_at, now),
+            )
+            stored = cursor.rowcount == 1
+        else:
+            connection.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at),
+            )
+            stored = True
+        self._sets += 1
+        if self._sets % self.PRUNE_EVERY == 0:
+            self._prune(connection, now)
+        return stored
+
+    def _prune(self, connection: sqlite3.Connection, now: float) -> None:
+        connection.execute("DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        # Then the entries closest to expiry beyond maxsize; counters never expire and are kept
+        connection.execute(
+            "DELETE FROM cache_entries WHERE key IN (SELECT key FROM cache_entries "
+            "WHERE expires_at IS NOT NULL ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (self.maxsize,),
+        )
+
+    def _incr(self, key: str) -> int:
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "INSERT INTO cache_entries (key, value, expires_at) VALUES (?, '1', NULL) "
+                "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1",
+                (key,),
+            )
+            (value,) = connection.execute("SELECT value FROM cache_entries WHERE key = ?", (key,)).fetchone()
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return int(value)
+
+    def _delete(self, key: str) -> None:
+        self._connect().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    async def get(self, key: str) -> Optional[str]:
+        return (await run_blocking(self._get, [key]))[0]
+
+    async def mget(self, keys: Iterable[str]) -> list:
+        keys = list(keys)
+        return await run_blocking(self._get, keys) if keys else []
+
+    async def set(self, key: str, value: str, ex: Optional[float] = None, nx: bool = False) -> bool:
+        return await run_blocking(self._set, key, value, ex, nx)
+
+    async def incr(self, key: str) -> int:
+        return await run_blocking(self._incr, key)
+
+    async def delete(self, key: str) -> None:
+        await run_blocking(self._delete, key)
 
-async def init_cache(redis_url: str = "redis://localhost") -> aioredis.Redis:
+
+_memory = MemoryBackend(maxsize=config.RESPONSE_CACHE_SIZE)
+# Set by init_cache when Redis is unavailable and CACHE_FALLBACK is "sqlite"
+_shared_file: Optional[SQLiteBackend] = None
+
+
+def _shared() -> Any:
+    """
+    The store shared between worker processes, if any.
+    """
+    return redis if redis is not None else _shared_file
+
+
+def _backend() -> Any:
+    return _shared() or _memory
+
+
+def _use_fallback() -> None:
+    global _shared_file
+    if config.CACHE_FALLBACK == "sqlite":
+        _shared_file = SQLiteBackend(config.CACHE_SQLITE_PATH, maxsize=config.RESPONSE_CACHE_SIZE)
+        logger.info(f"Using the SQLite cache at {config.CACHE_SQLITE_PATH}.")
+
+
+async def init_cache(redis_url: str = config.REDIS_URL, client: Any = None) -> Any:
+    """
+    Connect to Redis, or use ``client`` if given. If Redis is unavailable the
+    CACHE_FALLBACK store is used and a warning is logged.
+    """
     global redis
-    redis = await aioredis.create_redis_pool(redis_url)
+    if client is None:
+        if aioredis is None:
+            logger.warning(f"redis package not installed; using the {config.CACHE_FALLBACK} cache.")
+            _use_fallback()
+            return None
+        client = aioredis.from_url(redis_url, decode_responses=True)
+    try:
+        await client.ping()
+    except Exception as e:
+        logger.warning(f"Redis unavailable at {redis_url}; using the {config.CACHE_FALLBACK} cache. ({e})")
+        _use_fallback()
+        return None
+    redis = client
+    logger.info("Redis cache connected.")
     return redis
 
+
 async def close_cache() -> None:
-    global redis
-    if redis:
-        redis.close()
-        await redis.wait_closed()
+    global redis, _shared_file
+    _shared_file = None
+    if redis is not None:
+        close = getattr(redis, "aclose", None) or redis.close
+        await close()
+        redis = None
+
 
 async def get_cached_data(key: str) -> Optional[Dict]:
-    if not redis:
+    shared = _shared()
+    if shared is None:
         return None
-    data = await redis.get(key)
+    data = await shared.get(key)
     if data:
         return json.loads(data)
     return None
 
+
 async def set_cached_data(key: str, value: Dict, expire: int = 60) -> None:
-    if not redis:
+    shared = _shared()
+    if shared is None:
         return
-    await redis.set(key, json.dumps(value), expire=expire)
+    await shared.set(key, json.dumps(value), ex=expire)
+
+
+def _tag_key(tag: str) -> str:
+    return f"cache-tag:{tag}"
+
+
+async def invalidate_tags(*tags: str) -> None:
+    """
+    Invalidate every cached response carrying one of ``tags``. Failures are
+    logged, not raised: writes must not fail because the cache is down.
+    """
+    try:
+        backend = _backend()
+        for tag in tags:
+            await backend.incr(_tag_key(tag))
+    except Exception as e:
+        logger.warning(f"Cache invalidation of {tags} failed: {e}")
+
+
+def make_etag(body: str) -> str:
+    return '"' + hashlib.sha1(body.encode("utf-8")).hexdigest() + '"'
+
+
+async def _wait_for(backend: Any, key: str, timeout: float) -> Optional[str]:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+        value = await backend.get(key)
+        if value is not None:
+            return value
+    return None
+
+
+async def get_or_compute_response(
+    key: str,
+    tags: Iterable[str],
+    compute: Callable[[], Awaitable[Any]],
+    ttl: int = 60,
+) -> Dict[str, str]:
+    """
+    Return ``{"body": json_text, "etag": etag}`` for ``key``, computing and caching
+    it on a miss. The entry is keyed on the current versions of ``tags``, so
+    bumping a tag makes it unreachable. Concurrent misses take a lock: one caller
+    computes while the others wait briefly for its result.
+    """
+    tags = sorted(tags)
+    try:
+        backend = _backend()
+        versions = await backend.mget([_tag_key(tag) for tag in tags])
+        full_key = f"response:{key}|" + ".".join(str(version or 0) for version in versions)
+        cached = await backend.get(full_key)
+        lock_key = f"lock:{full_key}"
+        locked = cached is None and await backend.set(lock_key, "1", ex=config.CACHE_LOCK_TIMEOUT, nx=True)
+    except Exception as e:
+        logger.warning(f"Response cache read failed: {e}")
+        _stats["errors"] += 1
+        backend, full_key, cached = None, None, None
+    if cached is not None:
+        _stats["hits"] += 1
+        return json.loads(cached)
+    if backend is None:
+        _stats["misses"] += 1
+        body = json.dumps(await compute())
+        return {"body": body, "etag": make_etag(body)}
+
+    if not locked:
+        cached = await _wait_for(backend, full_key, config.CACHE_LOCK_TIMEOUT)
+        if cached is not None:
+            _stats["waited"] += 1
+            return json.loads(cached)
+    _stats["misses"] += 1
+    try:
+        body = json.dumps(await compute())
+        entry = {"body": body, "etag": make_etag(body)}
+        try:
+            await backend.set(full_key, json.dumps(entry), ex=ttl)
+        except Exception as e:
+            logger.warning(f"Response cache write failed: {e}")
+        return entry
+    finally:
+        if locked:
+            await backend.delete(lock_key)
+
+
+def cache_stats() -> Dict[str, Any]:
+    """
+    Response cache hits, misses and hit ratio, and the backend in use.
+    """
+    served = _stats["hits"] + _stats["waited"]
+    lookups = served + _stats["misses"]
+    return {
+        **_stats,
+        "hit_ratio": round(served / lookups, 4) if lookups else 0.0,
+        "backend": "redis" if redis is not None else "sqlite" if _shared_file is not None else "memory",
+    }
@@ -0,0 +1,95 @@
+"""
+Administrative commands, run from the repository root:
+
+    python -m app.cli init-db
+    python -m app.cli backfill-stats
+    python -m app.cli rebuild-search
+    python -m app.cli migrate-structured
+    python -m app.cli archive --days 365
+"""
+import argparse
+import asyncio
+import logging
+
+from app.services.db_async_sqlalchemy import dispose_engines, init_db, migrate_structured_columns, rebuild_sentiment_rollups
+from app.services.retention import RetentionMover
+from app.services.search import rebuild_search_index
+from config import config
+
+
+async def _init_db() -> None:
+    await init_db()
+    await dispose_engines()
+
+
+async def _backfill_stats(batch_size: int) -> None:
+    await init_db()
+    try:
+        await rebuild_sentiment_rollups(batch_size=batch_size)
+    finally:
+        await dispose_engines()
+
+
+async def _rebuild_search(batch_size: int) -> None:
+    await init_db()
+    try:
+        await rebuild_search_index(batch_size=batch_size)
+    finally:
+        await dispose_engines()
+
+
+async def _migrate_structured(batch_size: int) -> None:
+    # init_db adds the new columns and indexes; the backfill converts existing rows
+    await init_db()
+    try:
+        await migrate_structured_columns(batch_size=batch_size)
+    finally:
+        await dispose_engines()
+
+
+async def _archive(days: int, batch_size: int, archive_dir: str) -> None:
+    await init_db()
+    try:
+        await RetentionMover(days=days, batch_size=batch_size, archive_dir=archive_dir).run_once()
+    finally:
+        await dispose_engines()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Feedback platform administration.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("init-db", help="Create the tables and indexes, and apply pending schema upgrades.")
+
+    backfill = commands.add_parser("backfill-stats", help="Rebuild the sentiment rollup table from all feedback.")
+    backfill.add_argument("--batch-size", type=int, default=5000)
+
+    rebuild = commands.add_parser("rebuild-search", help="Rebuild the full-text index and key-phrase table.")
+    rebuild.add_argument("--batch-size", type=int, default=5000)
+
+    migrate = commands.add_parser(
+        "migrate-structured", help="Add the score/key-phrase columns and convert existing rows in batches."
+    )
+    migrate.add_argument("--batch-size", type=int, default=1000)
+
+    archive = commands.add_parser("archive", help="Move feedback older than the retention window to the archive table.")
+    archive.add_argument("--days", type=int, default=config.RETENTION_DAYS or 365)
+    archive.add_argument("--batch-size", type=int, default=config.RETENTION_BATCH_SIZE)
+    archive.add_argument("--archive-dir", default=config.ARCHIVE_DIR, help="Also append rows to monthly .jsonl.gz files.")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "init-db":
+        asyncio.run(_init_db())
+    elif args.command == "backfill-stats":
+        asyncio.run(_backfill_stats(args.batch_size))
+    elif args.command == "rebuild-search":
+        asyncio.run(_rebuild_search(args.batch_size))
+    elif args.command == "migrate-structured":
+        asyncio.run(_migrate_structured(args.batch_size))
+    elif args.command == "archive":
+        asyncio.run(_archive(args.days, args.batch_size, args.archive_dir))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+# app/gunicorn_conf.py
+"""
+Gunicorn settings used by ``python -m app.serve`` (``--config python:app.gunicorn_conf``).
+"""
+import os
+
+
+def child_exit(server, worker):
+    # Drop the live-worker gauges of a worker that exited, even if it crashed
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -1,18 +1,32 @@
+# Imported first: starts the clock for the worker's import time
+from app import startup
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.responses import JSONResponse
 import logging
 
-from app import views
-from app.services.db_async_sqlalchemy import init_db, async_engine
+from app import metrics, views
+from app.api import endpoints
+from app.services import cognitive, dedup, events
+from app.services.executor import shutdown_executor
+from app.services.ingestion import start_ingestion, stop_ingestion
+from app.services.retention import start_retention, stop_retention
+from app.services.storage import close_storage, start_storage_init
+from app.services.db_async_sqlalchemy import dispose_engines, init_db
 from app.cache import init_cache, close_cache
+from app import cache
+from config import config
 
 # Set up logging configuration
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 app = FastAPI(title="AI-Powered Feedback Analysis Platform")
+# Per-route latency histograms, served with the other metrics on /metrics
+metrics.install(app)
+# Logs how long the worker took to import, start and serve its first request
+startup.install(app)
 
 # Mount static files directory
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -22,12 +36,14 @@ templates = Jinja2Templates(directory="app/templates")
 
 # Include routes from views.py
 app.include_router(views.router)
+# Include the JSON API routes (/api/...) used by the dashboard
+app.include_router(endpoints.router)
 
 # Global exception handler for HTTPExceptions
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     logger.error(f"HTTPException on {request.url.path}: {exc.detail}")
-    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
+    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail}, headers=exc.headers)
 
 # Global exception handler for unhandled exceptions
 @app.exception_handler(Exception)
@@ -35,19 +51,49 @@ async def unhandled_exception_handler(request: Request, exc: Exception):
     logger.error(f"Unhandled exception on {request.url.path}: {exc}")
     return JSONResponse(status_code=500, content={"detail": "Internal server error"})
 
+startup.timer.imports_done()
+
 @app.on_event("startup")
 async def startup_event():
-    # Initialize the database and create tables if they don't exist
-    await init_db()
-    # Initialize the cache (using Redis in this example)
-    await init_cache("redis://localhost")
-    logger.info("Startup complete: Database and cache initialized.")
+    # Nothing here waits on Azure: clients are built on first use and the database
+    # is only contacted once a request (or /ready) needs it
+    with startup.timer.startup():
+        # Create tables here only when asked to; normally `python -m app.cli init-db`
+        if config.AUTO_CREATE_SCHEMA:
+            await init_db()
+        # Create the shared storage client and check the container in the background
+        start_storage_init()
+        # Start background enrichment workers (queue ingestion mode only)
+        await start_ingestion()
+        # Move feedback past the retention window to the archive table (when configured)
+        start_retention()
+        # Load or build the near-duplicate index in the background
+        dedup.start_dedup()
+        # Initialize the cache (using Redis in this example)
+        await init_cache(config.REDIS_URL)
+        # Relay live dashboard events between workers through Redis pub/sub, if connected
+        await events.hub.start_relay(cache.redis)
+        # Share this worker's stats with the others' /metrics (multi-worker mode only)
+        metrics.start_publisher()
+    logger.info("Startup complete: cache initialized; database and analysis clients connect on first use.")
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    # Writes the near-duplicate index snapshot for the next start
+    await dedup.stop_dedup()
+    await stop_retention()
+    # Stop enrichment workers; unprocessed rows stay pending for the next startup
+    await stop_ingestion()
+    # Flush any micro-batched analysis requests still waiting to be sent
+    await cognitive.drain()
+    cognitive.close()
+    await events.hub.stop_relay()
+    await metrics.stop_publisher()
     # Close the cache and dispose of the async engine to properly close all connections
     await close_cache()
-    await async_engine.dispose()
+    await dispose_engines()
+    close_storage()
+    shutdown_executor()
     logger.info("Shutdown complete: Cache closed and database engine disposed.")
 
 if __name__ == "__main__":
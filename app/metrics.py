@@ -0,0 +1,248 @@
+# app/metrics.py
+"""
+Prometheus metrics, served on ``/metrics``.
+
+``MetricsMiddleware`` records a latency histogram per route template; ``stage()``
+times steps of the submit flow; ``InstrumentedQueuePool`` records how long DB
+connection checkouts wait. Counters the services already keep (caches, analysis
+calls, queues, pool usage) are read only when ``/metrics`` is scraped, through
+sources added with ``register_stats``, so they cost nothing on the hot path.
+
+With several worker processes (``python -m app.serve``), PROMETHEUS_MULTIPROC_DIR
+is set and prometheus_client's multiprocess mode is used: every worker writes
+its histograms to files there, and a scrape answered by any worker aggregates
+them. The ``register_stats`` values are then published by each worker every
+METRICS_PUBLISH_INTERVAL seconds as gauges labelled with its ``pid``.
+
+Requires ``prometheus_client``; without it, or with ``METRICS_ENABLED=false``,
+every hook here is a no-op.
+"""
+import asyncio
+import logging
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from config import config
+
+try:
+    from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Gauge, Histogram, generate_latest, multiprocess
+    from prometheus_client.core import GaugeMetricFamily
+except ImportError:  # pragma: no cover - metrics are optional
+    CollectorRegistry = None
+
+logger = logging.getLogger(__name__)
+
+enabled = config.METRICS_ENABLED and CollectorRegistry is not None
+if config.METRICS_ENABLED and not enabled:
+    logger.warning("prometheus_client is not installed; metrics are disabled.")
+
+# prometheus_client reads the variable when it is imported, as it was above
+multiprocess_mode = enabled and bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+_NAMESPACE = "feedback"
+# (name, callable returning a dict of numbers) read on every scrape
+_stats_sources: List[Tuple[str, Callable[[], Dict[str, Any]]]] = []
+
+
+def register_stats(name: str, source: Callable[[], Dict[str, Any]]) -> None:
+    """
+    Export the numeric values of ``source()`` as gauges named
+    ``feedback_<name>_<key>`` (nested dicts are flattened with ``_``).
+    """
+    _stats_sources.append((name, source))
+
+
+def _flatten(prefix: str, values: Dict[str, Any]) -> Iterator[Tuple[str, float]]:
+    for key, value in values.items():
+        name = f"{prefix}_{key}"
+        if isinstance(value, dict):
+            yield from _flatten(name, value)
+        elif isinstance(value, bool):
+            yield name, float(value)
+        elif isinstance(value, (int, float)):
+            yield name, value
+
+
+def _stats_values() -> Iterator[Tuple[str, str, float]]:
+    for name, source in _stats_sources:
+        try:
+            values = source()
+        except Exception as e:
+            logger.warning(f"Metrics source {name} failed: {e}")
+            continue
+        for metric, value in _flatten(f"{_NAMESPACE}_{name}", values):
+            yield name, metric, value
+
+
+class _StatsCollector:
+    def collect(self):
+        for name, metric, value in _stats_values():
+            yield GaugeMetricFamily(metric, f"{name} statistic", value=value)
+
+
+# Multiprocess mode: gauges written to PROMETHEUS_MULTIPROC_DIR, one series per live worker
+_published: Dict[str, Any] = {}
+_publisher: Optional[asyncio.Task] = None
+
+
+def publish_stats() -> None:
+    """
+    Write this worker's ``register_stats`` values to the multiprocess gauges.
+    """
+    for name, metric, value in _stats_values():
+        gauge = _published.get(metric)
+        if gauge is None:
+            gauge = _published[metric] = Gauge(metric, f"{name} statistic", registry=None, multiprocess_mode="liveall")
+        gauge.set(value)
+
+
+async def _publish_loop() -> None:
+    while True:
+        publish_stats()
+        await asyncio.sleep(config.METRICS_PUBLISH_INTERVAL)
+
+
+def start_publisher() -> None:
+    """
+    Publish the stats gauges periodically (multiprocess mode only).
+    """
+    global _publisher
+    if multiprocess_mode and _publisher is None:
+        _publisher = asyncio.create_task(_publish_loop())
+
+
+async def stop_publisher() -> None:
+    """
+    Stop publishing and drop this worker's gauge series from the shared files.
+    """
+    global _publisher
+    if _publisher is None:
+        return
+    _publisher.cancel()
+    await asyncio.gather(_publisher, return_exceptions=True)
+    _publisher = None
+    multiprocess.mark_process_dead(os.getpid())
+
+
+if enabled:
+    registry = CollectorRegistry()
+    if not multiprocess_mode:
+        registry.register(_StatsCollector())
+    REQUEST_LATENCY = Histogram(
+        "http_request_duration_seconds",
+        "HTTP request latency by route template.",
+        ["method", "route", "status"],
+        registry=registry,
+    )
+    STAGE_LATENCY = Histogram(
+        f"{_NAMESPACE}_stage_duration_seconds",
+        "Duration of submit pipeline stages (analysis, upload, db_commit).",
+        ["stage"],
+        registry=registry,
+    )
+    POOL_CHECKOUT_WAIT = Histogram(
+        f"{_NAMESPACE}_db_pool_checkout_wait_seconds",
+        "Time spent waiting for a database connection from the pool.",
+        buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+        registry=registry,
+    )
+else:
+    registry = None
+
+
+@contextmanager
+def _timed_stage(name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        STAGE_LATENCY.labels(name).observe(time.perf_counter() - started)
+
+
+def stage(name: str):
+    """
+    Context manager timing one stage of a request (e.g. ``with stage("analysis"):``).
+    """
+    return _timed_stage(name) if enabled else nullcontext()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    The async engine's default pool, recording the checkout wait (including opening
+    a new connection when the pool grows).
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+
+def pool_stats(pool: Any) -> Dict[str, Any]:
+    """
+    Size and usage of a SQLAlchemy connection pool.
+    """
+    if not hasattr(pool, "checkedout"):
+        return {}
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(0, pool.overflow()),
+    }
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware observing the latency of every HTTP request, labelled with the
+    matched route template (``/api/feedbacks/{feedback_id}``) rather than the raw
+    path to keep the number of series bounded. Unmatched paths share one label.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = [500]
+
+        async def send_with_status(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            # Requests to mounted sub-applications (/static) are labelled with the mount path
+            label = getattr(route, "path", None) or scope.get("root_path") or "other"
+            REQUEST_LATENCY.labels(scope["method"], label, str(status[0])).observe(time.perf_counter() - started)
+
+
+def install(app: Any) -> None:
+    """
+    Add the metrics middleware to a FastAPI app when metrics are enabled.
+    """
+    if enabled:
+        app.add_middleware(MetricsMiddleware)
+
+
+def render() -> Tuple[bytes, str]:
+    """
+    The current metrics in the Prometheus text format, and its content type. In
+    multiprocess mode, those of all workers.
+    """
+    if multiprocess_mode:
+        publish_stats()
+        merged = CollectorRegistry()
+        multiprocess.MultiProcessCollector(merged)
+        return generate_latest(merged), CONTENT_TYPE_LATEST
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text, Index
+from .feedback import Base
+from .types import KeyPhraseList
+
+class FeedbackArchive(Base):
+    """
+    Feedback records moved out of ``feedbacks`` by the retention job. Rows keep
+    their original id and columns, so listings and search can merge them back in.
+    """
+    __tablename__ = "feedbacks_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    name = Column(String(100), nullable=False)
+    email = Column(String(100), nullable=False)
+    feedback_text = Column(Text, nullable=False)
+    sentiment = Column(String(20))
+    score_positive = Column(Float)
+    score_neutral = Column(Float)
+    score_negative = Column(Float)
+    key_phrases = Column(KeyPhraseList)  # JSON array of phrases
+    attachment_url = Column(String(255), nullable=True)
+    status = Column(String(20), nullable=False)
+    duplicate_of = Column(Integer, nullable=True)
+    created_at = Column(DateTime)
+    archived_at = Column(DateTime, nullable=False)
+
+    # Same keyset-pagination indexes as the live table
+    __table_args__ = (
+        Index("ix_feedbacks_archive_created_at_id", "created_at", "id"),
+        Index("ix_feedbacks_archive_sentiment_created_at_id", "sentiment", "created_at", "id"),
+        Index("ix_feedbacks_archive_email_created_at_id", "email", "created_at", "id"),
+    )
+
+    def __repr__(self):
+        return f"<FeedbackArchive(id={self.id}, created_at={self.created_at})>"
+
+
+# Columns copied from feedbacks when a row is archived
+ARCHIVED_COLUMNS = tuple(column.key for column in FeedbackArchive.__table__.columns if column.key != "archived_at")
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, DateTime, BigInteger, func
+from .feedback import Base
+
+class Attachment(Base):
+    """
+    Index of stored attachment contents, keyed by SHA-256, used to skip re-uploads.
+    """
+    __tablename__ = "attachments"
+
+    sha256 = Column(String(64), primary_key=True)
+    url = Column(String(255), nullable=False)
+    size = Column(BigInteger, nullable=False)
+    created_at = Column(DateTime, server_default=func.now())
+
+    def __repr__(self):
+        return f"<Attachment(sha256={self.sha256}, size={self.size})>"
@@ -1,8 +1,14 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, func
+from sqlalchemy import Column, Integer, String, DateTime, Float, Text, Index, ForeignKey, func
 from sqlalchemy.orm import declarative_base
+from .types import KeyPhraseList
 
 Base = declarative_base()
 
+# Enrichment status of a feedback row
+STATUS_PENDING = "pending"
+STATUS_COMPLETE = "complete"
+STATUS_FAILED = "failed"
+
 class Feedback(Base):
     __tablename__ = "feedbacks"
 
@@ -11,10 +17,44 @@ class Feedback(Base):
     email = Column(String(100), nullable=False)
     feedback_text = Column(Text, nullable=False)
     sentiment = Column(String(20))
-    confidence_scores = Column(Text)  # Stored as JSON text
-    key_phrases = Column(Text)
+    # Legacy Python-repr scores, superseded by the score_* columns; read only by the backfill
+    confidence_scores = Column(Text)
+    score_positive = Column(Float, index=True)
+    score_neutral = Column(Float)
+    score_negative = Column(Float, index=True)
+    key_phrases = Column(KeyPhraseList)  # JSON array of phrases
     attachment_url = Column(String(255), nullable=True)
+    status = Column(String(20), nullable=False, default=STATUS_COMPLETE, server_default=STATUS_COMPLETE, index=True)
+    # Earlier feedback this one was found to be a near-duplicate of (see services/dedup.py)
+    duplicate_of = Column(Integer, nullable=True, index=True)
+    # Until when an ingestion worker holds this pending row (work queue lease)
+    claimed_until = Column(DateTime, nullable=True)
     created_at = Column(DateTime, server_default=func.now())
 
+    # Composite indexes backing keyset pagination on (created_at, id), with or without filters
+    __table_args__ = (
+        Index("ix_feedbacks_created_at_id", "created_at", "id"),
+        Index("ix_feedbacks_sentiment_created_at_id", "sentiment", "created_at", "id"),
+        Index("ix_feedbacks_email_created_at_id", "email", "created_at", "id"),
+    )
+
     def __repr__(self):
         return f"<Feedback(id={self.id}, name={self.name}, sentiment={self.sentiment})>"
+
+
+class FeedbackKeyPhrase(Base):
+    """
+    One key phrase of a feedback record, normalized to lower case for indexed lookups.
+    """
+    __tablename__ = "feedback_key_phrases"
+
+    id = Column(Integer, primary_key=True)
+    feedback_id = Column(Integer, ForeignKey("feedbacks.id", ondelete="CASCADE"), nullable=False, index=True)
+    phrase = Column(String(255), nullable=False)
+
+    __table_args__ = (
+        Index("ix_feedback_key_phrases_phrase_feedback_id", "phrase", "feedback_id"),
+    )
+
+    def __repr__(self):
+        return f"<FeedbackKeyPhrase(feedback_id={self.feedback_id}, phrase={self.phrase})>"
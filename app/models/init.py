@@ -1 +1,4 @@
-from .feedback import Base, Feedback
+from .feedback import Base, Feedback, FeedbackKeyPhrase, STATUS_PENDING, STATUS_COMPLETE, STATUS_FAILED
+from .rollup import SentimentRollup
+from .attachment import Attachment
+from .archive import FeedbackArchive
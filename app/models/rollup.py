@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, UniqueConstraint
+from .feedback import Base
+
+class SentimentRollup(Base):
+    """
+    Precomputed feedback counts and confidence-score sums per sentiment and time bucket.
+    """
+    __tablename__ = "sentiment_rollups"
+
+    id = Column(Integer, primary_key=True)
+    granularity = Column(String(10), nullable=False)  # "hour", "day" or "total"
+    bucket_start = Column(DateTime, nullable=False)
+    sentiment = Column(String(20), nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+    sum_positive = Column(Float, nullable=False, default=0.0)
+    sum_neutral = Column(Float, nullable=False, default=0.0)
+    sum_negative = Column(Float, nullable=False, default=0.0)
+
+    __table_args__ = (
+        UniqueConstraint("granularity", "bucket_start", "sentiment", name="uq_sentiment_rollups_bucket"),
+    )
+
+    def __repr__(self):
+        return f"<SentimentRollup({self.granularity} {self.bucket_start}, {self.sentiment}={self.count})>"
@@ -0,0 +1,46 @@
+import json
+from typing import Any, List
+from sqlalchemy import Text
+from sqlalchemy.types import TypeDecorator
+
+
+def split_key_phrases(value: Any) -> List[str]:
+    """
+    Read key phrases stored as a list, a JSON array or comma-separated text.
+    """
+    if value is None:
+        return []
+    if isinstance(value, str):
+        stripped = value.strip()
+        if stripped.startswith("["):
+            try:
+                value = json.loads(stripped)
+            except ValueError:
+                value = stripped.strip("[]").split(",")
+        else:
+            value = stripped.split(",")
+    return [str(phrase).strip() for phrase in value if str(phrase).strip()]
+
+
+class KeyPhraseList(TypeDecorator):
+    """
+    A list of key phrases stored as a JSON array in a text column.
+
+    Rows written before the column held JSON (comma-separated text) still load
+    as lists. Comparisons such as LIKE bind plain text, not JSON.
+    """
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect: Any) -> Any:
+        if value is None:
+            return None
+        return json.dumps(split_key_phrases(value))
+
+    def process_result_value(self, value: Any, dialect: Any) -> Any:
+        if value is None:
+            return None
+        return split_key_phrases(value)
+
+    def coerce_compared_value(self, op: Any, value: Any) -> Any:
+        return Text()
@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Mapping, Optional
+from pydantic import BaseModel, EmailStr
+
+
+class FeedbackCreate(BaseModel):
+    name: str
+    email: EmailStr
+    feedback_text: str
+
+
+class FeedbackImport(FeedbackCreate):
+    """A row of a bulk import; created_at defaults to the import time."""
+    created_at: Optional[datetime] = None
+
+
+class ConfidenceScores(BaseModel):
+    positive: Optional[float] = None
+    neutral: Optional[float] = None
+    negative: Optional[float] = None
+
+
+class FeedbackResponse(FeedbackCreate):
+    id: int
+    sentiment: Optional[str] = None
+    confidence_scores: Optional[ConfidenceScores] = None
+    key_phrases: List[str] = []
+    attachment_url: Optional[str] = None
+    status: str = "complete"
+    duplicate_of: Optional[int] = None
+    created_at: str
+
+
+def serialize_feedback(row: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a feedback row (ORM mapping or projected columns) into a JSON-ready dict,
+    with the score columns nested under ``confidence_scores``.
+    """
+    data = dict(row)
+    scores = {key: data.pop(f"score_{key}", None) for key in ("positive", "neutral", "negative")}
+    data["confidence_scores"] = scores if any(value is not None for value in scores.values()) else None
+    if "key_phrases" in data:
+        data["key_phrases"] = data["key_phrases"] or []
+    if data.get("created_at") is not None:
+        data["created_at"] = data["created_at"].isoformat()
+    return data
+
+
+def as_utc_naive(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    Convert an aware datetime to naive UTC, the form created_at is stored in.
+    """
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
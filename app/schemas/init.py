@@ -1 +1 @@
-from .feedback import FeedbackCreate, FeedbackResponse
+from .feedback import ConfidenceScores, FeedbackCreate, FeedbackImport, FeedbackResponse, serialize_feedback
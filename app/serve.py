@@ -0,0 +1,116 @@
+"""
+Production launcher: several worker processes serving ``app.main:app``.
+
+    python -m app.serve --workers 4 --port 8000
+
+Uses gunicorn with uvicorn workers when gunicorn is installed (it restarts
+workers that die), else uvicorn's own process manager. The worker count
+defaults to WEB_WORKERS, or one per CPU. The schema is created once here, before
+the workers start, when ``--init-db`` or AUTO_CREATE_SCHEMA is set.
+
+Workers share nothing in memory. Cross-worker state goes through the database
+(the ingestion work queue, claimed per record), Redis when REDIS_URL is
+reachable (response and analysis caches, live events) or, without Redis, the
+SQLite cache file; analysis rate limits are split evenly between the workers.
+Prometheus metrics are merged across workers through PROMETHEUS_MULTIPROC_DIR.
+"""
+import argparse
+import asyncio
+import importlib.util
+import logging
+import os
+import shutil
+import sys
+from typing import List
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+APP = "app.main:app"
+
+
+def _worker_count(requested: int) -> int:
+    return requested or config.WEB_WORKERS or os.cpu_count() or 1
+
+
+def _worker_environment(workers: int, schema_ready: bool) -> None:
+    # Read by config in every worker process
+    os.environ["WEB_WORKERS"] = str(workers)
+    if workers > 1:
+        os.environ.setdefault("CACHE_FALLBACK", "sqlite")
+    if schema_ready:
+        os.environ["AUTO_CREATE_SCHEMA"] = "false"
+    if workers > 1 and config.METRICS_ENABLED and not os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        # Emptied on every launch: files left by earlier workers would be counted again
+        metrics_dir = os.path.join(config.DATA_DIR, "prometheus")
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+        os.makedirs(metrics_dir)
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = metrics_dir
+
+
+async def _init_db() -> None:
+    from app.services.db_async_sqlalchemy import dispose_engines, init_db
+
+    await init_db()
+    await dispose_engines()
+
+
+def _gunicorn_worker_class() -> str:
+    if importlib.util.find_spec("uvicorn_worker") is not None:
+        return "uvicorn_worker.UvicornWorker"
+    return "uvicorn.workers.UvicornWorker"
+
+
+def _gunicorn_command(args: argparse.Namespace, workers: int) -> List[str]:
+    return [
+        sys.executable, "-m", "gunicorn", APP,
+        "--workers", str(workers),
+        "--worker-class", _gunicorn_worker_class(),
+        "--config", "python:app.gunicorn_conf",
+        "--bind", f"{args.host}:{args.port}",
+        "--log-level", args.log_level,
+        "--graceful-timeout", str(args.graceful_timeout),
+    ]
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.serve", description="Run the API with several worker processes.")
+    parser.add_argument("--workers", type=int, default=0, help="Worker processes (default: WEB_WORKERS or one per CPU).")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--server", choices=["auto", "gunicorn", "uvicorn"], default="auto")
+    parser.add_argument("--init-db", action="store_true", help="Create or upgrade the schema before starting.")
+    parser.add_argument("--log-level", default="info")
+    parser.add_argument("--graceful-timeout", type=int, default=30, help="Seconds workers get to finish on shutdown.")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=args.log_level.upper())
+
+    workers = _worker_count(args.workers)
+    schema_ready = args.init_db or config.AUTO_CREATE_SCHEMA
+    if schema_ready:
+        asyncio.run(_init_db())
+    _worker_environment(workers, schema_ready)
+
+    server = args.server
+    if server == "auto":
+        server = "gunicorn" if importlib.util.find_spec("gunicorn") is not None else "uvicorn"
+    logger.info(f"Starting {workers} {server} workers on {args.host}:{args.port}.")
+    if server == "gunicorn":
+        command = _gunicorn_command(args, workers)
+        os.execv(command[0], command)
+
+    import uvicorn
+
+    uvicorn.run(
+        APP,
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        log_level=args.log_level,
+        timeout_graceful_shutdown=args.graceful_timeout,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import asyncio
+import hashlib
+import logging
+import re
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from app.cache import get_cached_data, set_cached_data
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_EDGE_PUNCTUATION = " \t\n.,;:!?\"'()[]{}-"
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize feedback text so trivially different submissions share a cache entry:
+    Unicode NFKC, case-folded, whitespace collapsed, surrounding punctuation dropped.
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return _WHITESPACE_RE.sub(" ", text).strip(_EDGE_PUNCTUATION)
+
+
+def text_key(text: str) -> str:
+    """
+    Content address of a text: SHA-256 of its normalized form.
+    """
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """
+    In-process LRU cache bounded by entry count and per-entry time-to-live.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 3600.0, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (self._clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class AnalysisCache:
+    """
+    Two-tier cache of analysis results keyed on the normalized-text hash.
+
+    Lookups go to the in-process LRU first, then Redis (through ``app.cache``).
+    Concurrent misses for the same key share a single upstream call.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 3600.0, redis_ttl: int = 86400, namespace: str = "analysis"):
+        self.local = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.redis_ttl = redis_ttl
+        self.namespace = namespace
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.redis_hits = 0
+        self.redis_errors = 0
+        self.coalesced = 0
+        self.upstream_calls = 0
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def _get_remote(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.redis_ttl <= 0:
+            return None
+        try:
+            return await get_cached_data(self._redis_key(key))
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"Analysis cache read from Redis failed: {e}")
+            return None
+
+    async def _set_remote(self, key: str, value: Dict[str, Any]) -> None:
+        if self.redis_ttl <= 0:
+            return
+        try:
+            await set_cached_data(self._redis_key(key), value, expire=self.redis_ttl)
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning(f"Analysis cache write to Redis failed: {e}")
+
+    async def _load(self, key: str, compute: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        value = await self._get_remote(key)
+        if value is not None:
+            self.redis_hits += 1
+        else:
+            self.upstream_calls += 1
+            value = await compute()
+            await self._set_remote(key, value)
+        self.local.set(key, value)
+        return value
+
+    async def get_or_compute(self, text: str, compute: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """
+        Return the cached analysis of ``text``, calling ``compute`` on a miss.
+        """
+        key = text_key(text)
+        value = self.local.get(key)
+        if value is None:
+            task = self._inflight.get(key)
+            if task is not None:
+                self.coalesced += 1
+            else:
+                task = asyncio.ensure_future(self._load(key, compute))
+                self._inflight[key] = task
+                task.add_done_callback(lambda _: self._inflight.pop(key, None))
+            # Shielded so one cancelled caller does not cancel the shared call.
+            value = await asyncio.shield(task)
+        return {**value, "key_phrases": list(value.get("key_phrases", []))}
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.local.hits + self.local.misses
+        return {
+            "entries": len(self.local),
+            "hits": self.local.hits,
+            "misses": self.local.misses,
+            "hit_ratio": round(self.local.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.local.evictions,
+            "expirations": self.local.expirations,
+            "redis_hits": self.redis_hits,
+            "redis_errors": self.redis_errors,
+            "coalesced": self.coalesced,
+            "upstream_calls": self.upstream_calls,
+        }
@@ -0,0 +1,55 @@
+import hashlib
+import logging
+import os
+import re
+from typing import BinaryIO, Tuple
+from app.services import storage
+from app.services.db_async_sqlalchemy import get_attachment_url, save_attachment
+from app.services.executor import run_blocking
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+_EXTENSION_RE = re.compile(r"^\.[a-z0-9]{1,10}$")
+
+
+def hash_stream(stream: BinaryIO) -> Tuple[str, int]:
+    """
+    SHA-256 and size of a seekable stream, read in chunks; rewinds it afterwards.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+        digest.update(chunk)
+        size += len(chunk)
+    stream.seek(0)
+    return digest.hexdigest(), size
+
+
+def content_name(sha256: str, file_name: str) -> str:
+    """
+    Content-addressed storage name, keeping a sanitized extension of the original
+    file name so the stored file is still served with a sensible type.
+    """
+    extension = os.path.splitext(file_name or "")[1].lower()
+    if not _EXTENSION_RE.match(extension):
+        extension = ""
+    return f"{sha256[:2]}/{sha256}{extension}"
+
+
+async def store_attachment(stream: BinaryIO, file_name: str) -> str:
+    """
+    Store an attachment under its content hash and return its URL.
+
+    Content that is already stored is not uploaded again; different files that
+    share a name no longer overwrite each other.
+    """
+    sha256, size = await run_blocking(hash_stream, stream)
+    url = await get_attachment_url(sha256)
+    if url is not None:
+        logger.info(f"Attachment {sha256} already stored; skipping upload.")
+        return url
+    url = await storage.upload_file_to_blob_async(stream, content_name(sha256, file_name), size)
+    # A concurrent upload of the same content may have won the race; both wrote the same bytes.
+    return await save_attachment(sha256, url, size)
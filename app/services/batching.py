@@ -0,0 +1,133 @@
+import asyncio
+import inspect
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.services.documents import to_analysis_result
+from app.services.executor import run_blocking
+from app.services.resilience import ResilientCaller
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatchAnalyzer:
+    """
+    Coalesce concurrent single-text analysis requests into batched service calls.
+
+    Callers ``await analyze(text)``. Texts submitted within ``max_delay`` seconds of
+    the first queued text are sent together (at most ``max_batch_size`` per call),
+    sentiment and key-phrase extraction run concurrently for each batch, and each
+    caller receives the result for its own document. With a ``caller``, every
+    service call goes through its concurrency limit, rate limiter, retries and
+    circuit breaker.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        max_batch_size: int = 10,
+        max_delay: float = 0.02,
+        max_concurrent_batches: int = 8,
+        caller: Optional[ResilientCaller] = None,
+    ):
+        self.client = client
+        self.caller = caller
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.max_concurrent_batches = max_concurrent_batches
+        self.batches = 0
+        self.documents = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._buffer: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: set = set()
+
+    def _bind_loop(self) -> asyncio.AbstractEventLoop:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # State from a previous (closed) event loop cannot be reused.
+            self._loop = loop
+            self._buffer = []
+            self._timer = None
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_batches)
+            self._tasks = set()
+        return loop
+
+    async def analyze(self, text: str) -> Dict[str, Any]:
+        """
+        Analyze a single text as part of the next batch.
+        """
+        loop = self._bind_loop()
+        future = loop.create_future()
+        self._buffer.append((text, future))
+        if len(self._buffer) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._buffer:
+            batch = self._buffer[:self.max_batch_size]
+            self._buffer = self._buffer[self.max_batch_size:]
+            task = self._loop.create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    @property
+    def buffered(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def batches_in_flight(self) -> int:
+        return len(self._tasks)
+
+    async def _invoke(self, method: Callable, texts: List[str]) -> List[Any]:
+        if inspect.iscoroutinefunction(method):
+            return await method(texts)
+        return await run_blocking(method, texts)
+
+    async def _call_both(self, texts: List[str]) -> List[List[Any]]:
+        methods = (self.client.analyze_sentiment, self.client.extract_key_phrases)
+        if self.caller is None:
+            return await asyncio.gather(*(self._invoke(method, texts) for method in methods))
+        # One admission for both requests: a half-open circuit's single trial
+        # slot would otherwise go to one of them and reject the other
+        return await self.caller.call_all([lambda method=method: self._invoke(method, texts) for method in methods])
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        texts = [text for text, _ in batch]
+        try:
+            async with self._semaphore:
+                sentiment_docs, key_phrase_docs = await self._call_both(texts)
+        except Exception as e:
+            logger.error(f"Batch analysis of {len(texts)} documents failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.documents += len(texts)
+        for (_, future), sentiment_doc, key_phrase_doc in zip(batch, sentiment_docs, key_phrase_docs):
+            if future.done():
+                # The caller went away (e.g. the request was cancelled).
+                continue
+            try:
+                future.set_result(to_analysis_result(sentiment_doc, key_phrase_doc))
+            except Exception as e:
+                future.set_exception(e)
+
+    async def drain(self) -> None:
+        """
+        Send any buffered texts immediately and wait for in-flight batches.
+        """
+        if self._loop is not asyncio.get_running_loop():
+            return
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -0,0 +1,178 @@
+import asyncio
+import csv
+import datetime
+import json
+import logging
+from typing import Any, BinaryIO, Dict, Iterator, List, Tuple
+from pydantic import ValidationError
+from config import config
+from app.models.feedback import STATUS_COMPLETE
+from app.schemas.feedback import FeedbackImport, as_utc_naive
+from app.services import cognitive
+from app.services.db_async_sqlalchemy import save_feedbacks_bulk
+from app.services.documents import to_feedback_columns
+from app.services.executor import run_blocking
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("jsonl", "csv")
+# Per-row errors beyond this many are counted but not listed in the report
+MAX_REPORTED_ERRORS = 1000
+
+ParsedRow = Tuple[int, Any]
+
+
+class _DecodedLines:
+    """
+    Iterate the lines of a binary upload as text, one line at a time, so that a
+    byte sequence that is not UTF-8 spoils only its own line. Such lines are
+    decoded with replacement characters and counted in ``bad_lines``.
+    """
+
+    def __init__(self, stream: BinaryIO):
+        self._lines = iter(stream.readline, b"")
+        self.bad_lines = 0
+
+    def __iter__(self) -> "_DecodedLines":
+        return self
+
+    def __next__(self) -> str:
+        line = next(self._lines)
+        try:
+            return line.decode("utf-8")
+        except UnicodeDecodeError:
+            self.bad_lines += 1
+            return line.decode("utf-8", errors="replace")
+
+
+def _iter_csv(lines: _DecodedLines) -> Iterator[ParsedRow]:
+    reader = csv.DictReader(lines)
+    number = 0
+    while True:
+        bad_before = lines.bad_lines
+        try:
+            record = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            # The reader starts afresh on the next line
+            number += 1
+            yield number, f"Invalid CSV: {e}"
+            continue
+        number += 1
+        if lines.bad_lines != bad_before:
+            yield number, "Invalid UTF-8 text."
+        elif None in record:
+            yield number, f"Expected {len(reader.fieldnames)} fields, got {len(reader.fieldnames) + len(record[None])}."
+        else:
+            yield number, record
+
+
+def _iter_rows(stream: BinaryIO, fmt: str) -> Iterator[ParsedRow]:
+    """
+    Lazily parse a JSONL or CSV upload, yielding (row number, dict or error message).
+    Undecodable text and malformed lines become row errors.
+    """
+    lines = _DecodedLines(stream)
+    if fmt == "csv":
+        yield from _iter_csv(lines)
+        return
+    bad_lines = 0
+    for number, line in enumerate(lines, start=1):
+        if lines.bad_lines != bad_lines:
+            bad_lines = lines.bad_lines
+            yield number, "Invalid UTF-8 text."
+            continue
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield number, f"Invalid JSON: {e}"
+            continue
+        yield number, record if isinstance(record, dict) else "Expected a JSON object."
+
+
+def _next_chunk(rows: Iterator[ParsedRow], size: int) -> List[ParsedRow]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            break
+    return chunk
+
+
+class ImportReport:
+    def __init__(self):
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+
+    def error(self, row: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "error": message})
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"imported": self.imported, "failed": self.failed, "errors": self.errors}
+
+
+async def _import_chunk(chunk: List[ParsedRow], report: ImportReport) -> None:
+    valid: List[Tuple[int, FeedbackImport]] = []
+    for number, record in chunk:
+        if isinstance(record, str):
+            report.error(number, record)
+            continue
+        try:
+            valid.append((number, FeedbackImport(**record)))
+        except ValidationError as e:
+            report.error(number, "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()))
+
+    # Analysis requests are micro-batched and cached by the cognitive service layer.
+    analyses = await asyncio.gather(
+        *(cognitive.analyze_feedback_async(item.feedback_text) for _, item in valid),
+        return_exceptions=True,
+    )
+    imported_at = datetime.datetime.utcnow()
+    numbers, feedback_rows = [], []
+    for (number, item), analysis in zip(valid, analyses):
+        if isinstance(analysis, Exception):
+            report.error(number, f"Cognitive analysis error: {analysis}")
+            continue
+        numbers.append(number)
+        feedback_rows.append({
+            "name": item.name,
+            "email": item.email,
+            "feedback_text": item.feedback_text,
+            **to_feedback_columns(analysis),
+            "attachment_url": None,
+            "status": STATUS_COMPLETE,
+            "created_at": as_utc_naive(item.created_at) or imported_at,
+        })
+    try:
+        report.imported += await save_feedbacks_bulk(feedback_rows)
+    except Exception as e:
+        logger.error(f"Bulk insert of {len(feedback_rows)} rows failed: {e}")
+        for number in numbers:
+            report.error(number, "Database error.")
+
+
+async def import_feedbacks(stream: BinaryIO, fmt: str = "jsonl", batch_size: int = 0) -> Dict[str, Any]:
+    """
+    Import feedback from a JSONL or CSV file object, one batch at a time.
+
+    Each batch is validated with ``FeedbackImport``, analyzed, and inserted in a
+    single multi-row transaction. Returns counts and per-row errors; a failed
+    batch insert is reported against each of its rows and the import continues.
+    """
+    batch_size = batch_size or config.IMPORT_BATCH_SIZE
+    report = ImportReport()
+    rows = _iter_rows(stream, fmt)
+    while True:
+        # Reading the upload spool is blocking file I/O.
+        chunk = await run_blocking(_next_chunk, rows, batch_size)
+        if not chunk:
+            break
+        await _import_chunk(chunk, report)
+    logger.info(f"Bulk import finished: {report.imported} imported, {report.failed} failed.")
+    return report.to_dict()
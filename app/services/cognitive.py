@@ -1,23 +1,173 @@
 import logging
-from azure.ai.textanalytics import TextAnalyticsClient
-from azure.core.credentials import AzureKeyCredential
-from config.config import config
+import threading
+from typing import Any, Dict, Optional
+from config import config
+from app.services.analysis_cache import AnalysisCache
+from app.services.batching import MicroBatchAnalyzer
+from app.services.fakes import FakeTextAnalyticsClient
+from app.services.local_analyzer import LocalTextAnalyticsClient
+from app.services.resilience import CircuitBreaker, ResilientCaller
 
 logger = logging.getLogger(__name__)
-_client = TextAnalyticsClient(endpoint=config.AZURE_ENDPOINT, credential=AzureKeyCredential(config.AZURE_KEY))
 
-def analyze_feedback(text: str) -> dict:
+
+def _build_client() -> Any:
+    """
+    Build the text analytics client selected by ``Config.TEXT_ANALYTICS_BACKEND``.
+
+    Any client with the SDK's ``analyze_sentiment``/``extract_key_phrases`` methods,
+    returning the result types in ``documents.py``, can be plugged in here.
+    The Azure SDK is only imported when it is the selected backend.
+    """
+    if config.TEXT_ANALYTICS_BACKEND == "fake":
+        return FakeTextAnalyticsClient(latency=config.FAKE_ANALYTICS_LATENCY_MS / 1000)
+    if config.TEXT_ANALYTICS_BACKEND == "local":
+        return LocalTextAnalyticsClient(
+            workers=config.LOCAL_ANALYZER_WORKERS, max_phrases=config.LOCAL_ANALYZER_MAX_PHRASES
+        )
+    from azure.ai.textanalytics import TextAnalyticsClient
+    from azure.core.credentials import AzureKeyCredential
+
+    options = {}
+    if config.AZURE_TEXT_ANALYTICS_API_VERSION:
+        options["api_version"] = config.AZURE_TEXT_ANALYTICS_API_VERSION
+    return TextAnalyticsClient(
+        endpoint=config.AZURE_ENDPOINT,
+        credential=AzureKeyCredential(config.AZURE_KEY),
+        # Retries, backoff and Retry-After are handled by the ResilientCaller
+        retry_total=config.AZURE_SDK_RETRIES,
+        connection_timeout=config.ANALYSIS_TIMEOUT,
+        read_timeout=config.ANALYSIS_TIMEOUT,
+        **options,
+    )
+
+
+def _build_batcher(client: Any) -> MicroBatchAnalyzer:
+    return MicroBatchAnalyzer(
+        client,
+        max_batch_size=config.ANALYSIS_MAX_BATCH_SIZE,
+        max_delay=config.ANALYSIS_MAX_BATCH_DELAY_MS / 1000,
+        caller=_caller,
+    )
+
+
+# Shared by every batch, so the limits apply to the process as a whole; with
+# several web workers each process gets an equal share of them
+_workers = max(1, config.WEB_WORKERS)
+_caller = ResilientCaller(
+    max_concurrency=max(1, config.ANALYSIS_MAX_CONCURRENCY // _workers),
+    rate=config.ANALYSIS_RATE_LIMIT / _workers,
+    burst=max(1.0, config.ANALYSIS_RATE_BURST / _workers),
+    retries=config.ANALYSIS_RETRIES,
+    backoff_base=config.ANALYSIS_BACKOFF_BASE,
+    backoff_cap=config.ANALYSIS_BACKOFF_MAX,
+    timeout=config.ANALYSIS_TIMEOUT,
+    breaker=CircuitBreaker(config.CIRCUIT_FAILURE_THRESHOLD, config.CIRCUIT_RESET_TIMEOUT),
+)
+# Built on first use (see get_client), so importing this module never touches the service
+_client: Optional[Any] = None
+_batcher: Optional[MicroBatchAnalyzer] = None
+_client_lock = threading.Lock()
+_cache = AnalysisCache(
+    maxsize=config.ANALYSIS_CACHE_SIZE,
+    ttl=config.ANALYSIS_CACHE_TTL,
+    redis_ttl=config.ANALYSIS_CACHE_REDIS_TTL,
+    namespace=f"analysis:{config.TEXT_ANALYTICS_BACKEND}",
+)
+
+
+def get_client() -> Any:
     """
-    Analyze sentiment and extract key phrases using Azure Cognitive Services.
+    Return the shared text analytics client, building it on first use.
+    """
+    global _client, _batcher
+    if _client is None:
+        # Sync callers run on the thread pool, so two threads may get here at once
+        with _client_lock:
+            if _client is None:
+                client = _build_client()
+                _batcher = _build_batcher(client)
+                _client = client
+                logger.info(f"Text analytics client created ({config.TEXT_ANALYTICS_BACKEND}).")
+    return _client
+
+
+def _get_batcher() -> MicroBatchAnalyzer:
+    get_client()
+    return _batcher
+
+
+def set_client(client: Any) -> None:
+    """
+    Replace the text analytics client (e.g. with a fake for offline benchmarks).
+    """
+    global _client, _batcher
+    _client = client
+    _batcher = _build_batcher(client)
+    _cache.local.clear()
+
+
+async def analyze_feedback_async(text: str) -> dict:
+    """
+    Analyze a single text, micro-batched together with concurrent submissions.
+
+    Results are cached by normalized text, so duplicate submissions skip the service.
     """
     try:
-        sentiment_response = _client.analyze_sentiment([text])[0]
-        key_phrase_response = _client.extract_key_phrases([text])[0]
-        return {
-            "sentiment": sentiment_response.sentiment,
-            "confidence_scores": sentiment_response.confidence_scores._asdict(),
-            "key_phrases": key_phrase_response.key_phrases
-        }
+        return await _cache.get_or_compute(text, lambda: _get_batcher().analyze(text))
     except Exception as e:
         logger.error(f"Error during cognitive analysis: {e}")
         raise
+
+
+def circuit_open() -> bool:
+    """
+    Whether the analysis service is currently being bypassed after repeated failures.
+    """
+    return _caller.breaker.state == CircuitBreaker.OPEN
+
+
+def circuit_retry_in() -> float:
+    """
+    Seconds until the circuit breaker lets a trial call through.
+    """
+    return _caller.breaker.retry_in
+
+
+def resilience_stats() -> Dict[str, Any]:
+    """
+    In-flight and waiting service calls, circuit state, retry/throttle counters and
+    the micro-batcher's queue depth.
+    """
+    return {
+        **_caller.stats(),
+        "buffered_documents": _batcher.buffered if _batcher is not None else 0,
+        "batches_in_flight": _batcher.batches_in_flight if _batcher is not None else 0,
+    }
+
+
+def cache_stats() -> Dict[str, Any]:
+    """
+    Hit/miss/eviction counters of the analysis cache.
+    """
+    return _cache.stats()
+
+
+async def drain() -> None:
+    """
+    Flush pending micro-batches; call on shutdown.
+    """
+    if _batcher is not None:
+        await _batcher.drain()
+
+
+def close() -> None:
+    """
+    Release the client's resources (e.g. the local analyzer's worker processes).
+    The next call builds a new client.
+    """
+    global _client, _batcher
+    if hasattr(_client, "close"):
+        _client.close()
+    _client = None
+    _batcher = None
@@ -1,36 +1,141 @@
 import logging
-from typing import Any, Dict, List
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.future import select
-from sqlalchemy import update as sqlalchemy_update, delete as sqlalchemy_delete
-from config.config import config
-from models.feedback import Feedback, Base
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.engine import make_url
+from sqlalchemy import event, func, inspect, text, and_, or_, union_all, insert as sqlalchemy_insert, update as sqlalchemy_update, delete as sqlalchemy_delete
+from config import config
+from app import metrics
+from app.cache import FEEDBACKS_TAG, STATS_TAG, invalidate_tags
+from app.models.feedback import Feedback, Base, STATUS_PENDING
+from app.models.rollup import SentimentRollup
+from app.models.attachment import Attachment
+from app.models.archive import ARCHIVED_COLUMNS, FeedbackArchive
+from app.schemas.feedback import serialize_feedback
+from app.services import events
+from app.services.search_index import add_key_phrases, create_search_schema, delete_key_phrases
+from app.services.rollups import RollupDelta, apply_delta, bucket_start, rollup_to_dict, scores_from_columns
+from app.services.migrations import backfill_structured_batch, upgrade_schema
 
 logger = logging.getLogger(__name__)
 
-async_engine = create_async_engine(config.AZURE_SQL_CONN_STR, echo=True)
+def _set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    # WAL lets readers run alongside the single writer; NORMAL sync is durable in WAL mode
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={config.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={config.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+def _use_explicit_transactions(dbapi_connection: Any, connection_record: Any) -> None:
+    # Stop the sqlite3 driver from issuing its own deferred BEGIN
+    dbapi_connection.isolation_level = None
+
+def _begin_immediate(conn: Any) -> None:
+    # Take the write lock up front: a deferred transaction that later starts writing
+    # fails at once, without waiting, if another process wrote in the meantime
+    conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+def is_file_sqlite(url: str = config.AZURE_SQL_CONN_STR) -> bool:
+    url = make_url(url)
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+def create_engine(url: str = config.AZURE_SQL_CONN_STR, immediate: bool = False, **overrides: Any) -> AsyncEngine:
+    """
+    Create an async engine with the pool, echo and statement-cache settings from
+    ``Config``. SQLite connections are switched to WAL mode with tuned pragmas;
+    with ``immediate`` every SQLite transaction starts with BEGIN IMMEDIATE.
+    """
+    url = make_url(url)
+    options: Dict[str, Any] = {
+        "echo": config.DB_ECHO,
+        "query_cache_size": config.DB_QUERY_CACHE_SIZE,
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+    }
+    is_sqlite = url.get_backend_name() == "sqlite"
+    if not (is_sqlite and url.database in (None, "", ":memory:")):
+        options.update(
+            pool_size=config.DB_POOL_SIZE,
+            max_overflow=config.DB_MAX_OVERFLOW,
+            pool_recycle=config.DB_POOL_RECYCLE,
+        )
+        if metrics.enabled:
+            options["poolclass"] = metrics.InstrumentedQueuePool
+    if is_sqlite:
+        options["connect_args"] = {"cached_statements": config.DB_STATEMENT_CACHE_SIZE}
+    options.update(overrides)
+    engine = create_async_engine(url, **options)
+    if is_sqlite:
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+        if immediate:
+            event.listen(engine.sync_engine, "connect", _use_explicit_transactions)
+            event.listen(engine.sync_engine, "begin", _begin_immediate)
+    return engine
+
+async_engine = create_engine()
 async_session_maker = sessionmaker(
     async_engine, expire_on_commit=False, class_=AsyncSession
 )
+# SQLite has a single writer. Write transactions get their own one-connection
+# engine: writers in this process queue for that connection instead of contending
+# for the lock, and BEGIN IMMEDIATE makes writers in other processes wait up to
+# SQLITE_BUSY_TIMEOUT_MS rather than fail. Reads keep the pool and run alongside.
+if config.SQLITE_SERIALIZE_WRITES and is_file_sqlite():
+    write_engine = create_engine(immediate=True, pool_size=1, max_overflow=0, pool_timeout=config.DB_WRITE_TIMEOUT)
+else:
+    write_engine = async_engine
+write_session_maker = sessionmaker(
+    write_engine, expire_on_commit=False, class_=AsyncSession
+)
+
+async def dispose_engines() -> None:
+    """
+    Close all pooled connections of the read and write engines.
+    """
+    await async_engine.dispose()
+    if write_engine is not async_engine:
+        await write_engine.dispose()
 
 async def init_db() -> None:
     """
     Create all tables asynchronously.
     """
-    async with async_engine.begin() as conn:
+    async with write_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(upgrade_schema)
+        await conn.run_sync(create_search_schema)
     logger.info("Async DB tables created.")
 
+async def check_database() -> Dict[str, Any]:
+    """
+    Readiness probe: the database answers and the schema has been created.
+    """
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+        has_schema = await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table(Feedback.__tablename__))
+    return {"ok": has_schema, "schema": has_schema}
+
 async def save_feedback(feedback_data: Dict[str, Any]) -> int:
     """
-    Save a feedback record asynchronously.
+    Save a feedback record asynchronously and count it in the sentiment rollups.
     """
-    async with async_session_maker() as session:
+    async with write_session_maker() as session:
         async with session.begin():
             feedback = Feedback(**feedback_data)
             session.add(feedback)
+            await session.flush()
+            await add_key_phrases(session, [(feedback.id, feedback.key_phrases)])
+            delta = RollupDelta()
+            delta.add(feedback.created_at, feedback.sentiment, scores_from_columns(feedback_data))
+            await apply_delta(session, delta)
         await session.commit()
+        await invalidate_tags(FEEDBACKS_TAG, STATS_TAG)
+        await _publish_changes(delta, rows=[{**feedback_data, "id": feedback.id}])
         logger.info(f"Feedback saved with id: {feedback.id}")
         return feedback.id
 
@@ -44,39 +149,497 @@ async def get_all_feedbacks() -> List[Feedback]:
         logger.info(f"Retrieved {len(feedbacks)} feedback records.")
         return feedbacks
 
-async def update_feedback(feedback_id: int, update_data: Dict[str, Any]) -> int:
+# Columns returned by listings; feedback_text is only included on request
+LIST_COLUMNS = (
+    Feedback.id,
+    Feedback.name,
+    Feedback.email,
+    Feedback.sentiment,
+    Feedback.score_positive,
+    Feedback.score_neutral,
+    Feedback.score_negative,
+    Feedback.key_phrases,
+    Feedback.attachment_url,
+    Feedback.status,
+    Feedback.duplicate_of,
+    Feedback.created_at,
+)
+
+def feedback_filter_clauses(
+    sentiment: Optional[str] = None,
+    email: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    min_positive: Optional[float] = None,
+    min_negative: Optional[float] = None,
+    model: Any = Feedback,
+) -> List[Any]:
+    """
+    Build WHERE clauses for the listing filters; ``since`` is inclusive, ``until``
+    exclusive. ``min_positive``/``min_negative`` are inclusive score thresholds.
+    ``model`` is Feedback or FeedbackArchive.
+    """
+    clauses = []
+    if sentiment:
+        clauses.append(model.sentiment == sentiment.lower())
+    if email:
+        clauses.append(model.email == email)
+    if since:
+        clauses.append(model.created_at >= since)
+    if until:
+        clauses.append(model.created_at < until)
+    if min_positive is not None:
+        clauses.append(model.score_positive >= min_positive)
+    if min_negative is not None:
+        clauses.append(model.score_negative >= min_negative)
+    return clauses
+
+def listing_columns(include_text: bool = False, model: Any = Feedback) -> List[Any]:
+    columns = [getattr(model, column.key) for column in LIST_COLUMNS]
+    if include_text:
+        columns.insert(3, model.feedback_text)
+    return columns
+
+async def archive_horizon(session: AsyncSession) -> Optional[datetime]:
+    """
+    The newest created_at in the archive table (None when it is empty); no
+    archived row is newer, so queries that stay above it skip the archive.
+    """
+    result = await session.execute(select(func.max(FeedbackArchive.created_at)))
+    return result.scalar()
+
+def archive_in_range(horizon: Optional[datetime], since: Optional[datetime] = None, **filters: Any) -> bool:
+    """
+    Whether a query with these filters can match archived rows.
+    """
+    return horizon is not None and (since is None or since <= horizon)
+
+def _page_statement(model: Any, limit: int, after: Optional[Tuple[datetime, int]], include_text: bool, filters: Dict[str, Any]):
+    stmt = select(*listing_columns(include_text, model)).where(*feedback_filter_clauses(model=model, **filters))
+    if after is not None:
+        created_at, feedback_id = after
+        stmt = stmt.where(or_(
+            model.created_at < created_at,
+            and_(model.created_at == created_at, model.id < feedback_id),
+        ))
+    return stmt.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+def _newest_first(row: Dict[str, Any]) -> Tuple[datetime, int]:
+    return (row["created_at"] or datetime.min, row["id"])
+
+async def get_feedbacks_page(
+    limit: int = 50,
+    after: Optional[Tuple[datetime, int]] = None,
+    include_text: bool = False,
+    **filters: Any,
+) -> Tuple[List[Dict[str, Any]], Optional[Tuple[datetime, int]]]:
+    """
+    Retrieve one page of feedback records, newest first, using keyset pagination.
+
+    ``after`` is the (created_at, id) of the last row of the previous page. Returns
+    the rows as dicts and the position to continue from, or None on the last page.
+    The archive table is only read when the page reaches back past its newest row.
+    """
+    async with async_session_maker() as session:
+        result = await session.execute(_page_statement(Feedback, limit, after, include_text, filters))
+        rows = [dict(row) for row in result.mappings()]
+        horizon = await archive_horizon(session)
+        page_is_newer = len(rows) > limit and horizon is not None and rows[-1]["created_at"] > horizon
+        if archive_in_range(horizon, **filters) and not page_is_newer:
+            result = await session.execute(_page_statement(FeedbackArchive, limit, after, include_text, filters))
+            rows = sorted(rows + [dict(row) for row in result.mappings()], key=_newest_first, reverse=True)[:limit + 1]
+    next_position = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_position = (rows[-1]["created_at"], rows[-1]["id"])
+    return rows, next_position
+
+async def stream_feedbacks(
+    include_text: bool = True,
+    batch_size: int = 1000,
+    **filters: Any,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Stream matching feedback records, newest first, in batches of ``batch_size``.
+
+    Rows are read through a server-side cursor, so memory use does not depend on
+    the number of matching records. When the range reaches into the archive, live
+    rows newer than the archive come first, then older live and archived rows
+    merged by the database.
+    """
+    hot_columns = listing_columns(include_text)
+    hot_clauses = feedback_filter_clauses(**filters)
+    async with async_session_maker() as session:
+        horizon = await archive_horizon(session)
+        if archive_in_range(horizon, **filters):
+            statements = [
+                select(*hot_columns).where(*hot_clauses, Feedback.created_at > horizon)
+                .order_by(Feedback.created_at.desc(), Feedback.id.desc()),
+            ]
+            older = union_all(
+                select(*hot_columns).where(*hot_clauses, or_(Feedback.created_at <= horizon, Feedback.created_at.is_(None))),
+                select(*listing_columns(include_text, FeedbackArchive)).where(
+                    *feedback_filter_clauses(model=FeedbackArchive, **filters)
+                ),
+            ).subquery()
+            statements.append(select(older).order_by(older.c.created_at.desc(), older.c.id.desc()))
+        else:
+            statements = [select(*hot_columns).where(*hot_clauses).order_by(Feedback.created_at.desc(), Feedback.id.desc())]
+        for stmt in statements:
+            result = await session.stream(stmt.execution_options(yield_per=batch_size))
+            async for partition in result.mappings().partitions(batch_size):
+                yield [dict(row) for row in partition]
+
+async def get_feedbacks_by_ids(feedback_ids: Iterable[int], include_text: bool = False) -> List[Dict[str, Any]]:
+    """
+    Listing rows for the given ids, live or archived, in no particular order.
+    """
+    feedback_ids = list(feedback_ids)
+    rows = []
+    async with async_session_maker() as session:
+        for model in (Feedback, FeedbackArchive):
+            result = await session.execute(
+                select(*listing_columns(include_text, model)).where(model.id.in_(feedback_ids))
+            )
+            rows += [dict(row) for row in result.mappings()]
+    return rows
+
+async def stream_feedback_texts(
+    after_id: int = 0, batch_size: int = 5000, originals_only: bool = False
+) -> AsyncIterator[List[Tuple[int, str]]]:
+    """
+    Yield (id, feedback_text) batches of live and archived feedback with ids above
+    ``after_id``, in id order; with ``originals_only``, skip near-duplicates.
+    """
+    selects = []
+    for model in (Feedback, FeedbackArchive):
+        stmt = select(model.id, model.feedback_text).where(model.id > after_id)
+        if originals_only:
+            stmt = stmt.where(model.duplicate_of.is_(None))
+        selects.append(stmt)
+    both = union_all(*selects).subquery()
+    stmt = select(both).order_by(both.c.id).execution_options(yield_per=batch_size)
+    async with async_session_maker() as session:
+        result = await session.stream(stmt)
+        async for partition in result.partitions(batch_size):
+            yield [(row.id, row.feedback_text) for row in partition]
+
+async def get_feedback(feedback_id: int) -> Optional[Feedback]:
+    """
+    Retrieve a single feedback record by id, falling back to the archive table.
+    """
+    async with async_session_maker() as session:
+        return await session.get(Feedback, feedback_id) or await session.get(FeedbackArchive, feedback_id)
+
+async def get_pending_feedback_ids() -> List[int]:
     """
-    Update a feedback record asynchronously.
+    Retrieve the ids of feedback records still awaiting enrichment and not claimed
+    by a worker (or whose claim has expired), oldest first.
     """
+    now = datetime.utcnow()
     async with async_session_maker() as session:
+        result = await session.execute(
+            select(Feedback.id)
+            .where(Feedback.status == STATUS_PENDING, or_(Feedback.claimed_until.is_(None), Feedback.claimed_until < now))
+            .order_by(Feedback.id)
+        )
+        feedback_ids = result.scalars().all()
+        logger.debug(f"Found {len(feedback_ids)} pending feedback records.")
+        return feedback_ids
+
+async def claim_feedback(feedback_id: int, lease_seconds: float) -> bool:
+    """
+    Claim a pending record for enrichment for ``lease_seconds``. Exactly one
+    caller, in any worker process, gets True until the claim expires or is released.
+    """
+    now = datetime.utcnow()
+    async with write_session_maker() as session:
         async with session.begin():
+            result = await session.execute(
+                sqlalchemy_update(Feedback)
+                .where(
+                    Feedback.id == feedback_id,
+                    Feedback.status == STATUS_PENDING,
+                    or_(Feedback.claimed_until.is_(None), Feedback.claimed_until < now),
+                )
+                .values(claimed_until=now + timedelta(seconds=lease_seconds))
+            )
+    return result.rowcount == 1
+
+async def release_feedback(feedback_id: int) -> None:
+    """
+    Give up a claim so any worker can pick the record up again.
+    """
+    async with write_session_maker() as session:
+        async with session.begin():
+            await session.execute(
+                sqlalchemy_update(Feedback).where(Feedback.id == feedback_id).values(claimed_until=None)
+            )
+
+async def _publish_changes(
+    delta: RollupDelta,
+    rows: List[Dict[str, Any]] = (),
+    deleted_ids: List[int] = (),
+) -> None:
+    """
+    Push saved or updated rows, deletions and sentiment count changes to live dashboards.
+    """
+    if not events.hub.active:
+        return
+    columns = [column.key for column in listing_columns(True)]
+    for row in rows:
+        await events.hub.publish("feedback", serialize_feedback({key: row.get(key) for key in columns}))
+    for feedback_id in deleted_ids:
+        await events.hub.publish("deleted", {"id": feedback_id})
+    changes = delta.count_changes()
+    if changes:
+        await events.hub.publish("stats", {"counts": changes})
+
+# Feedback columns that contribute to the sentiment rollups
+_ROLLUP_FIELDS = ("created_at", "sentiment", "score_positive", "score_neutral", "score_negative")
+
+async def _rollup_fields(session: AsyncSession, feedback_id: int, model: Any = Feedback) -> Optional[Dict[str, Any]]:
+    result = await session.execute(
+        select(*[getattr(model, field) for field in _ROLLUP_FIELDS]).where(model.id == feedback_id)
+    )
+    row = result.mappings().first()
+    return dict(row) if row else None
+
+async def update_feedback(feedback_id: int, update_data: Dict[str, Any]) -> int:
+    """
+    Update a feedback record asynchronously, adjusting the sentiment rollups.
+    """
+    delta = RollupDelta()
+    changed_rows = []
+    async with write_session_maker() as session:
+        async with session.begin():
+            before = await _rollup_fields(session, feedback_id)
             stmt = sqlalchemy_update(Feedback).where(Feedback.id == feedback_id).values(**update_data)
             result = await session.execute(stmt)
+            if before is not None and "key_phrases" in update_data:
+                await delete_key_phrases(session, [feedback_id])
+                await add_key_phrases(session, [(feedback_id, update_data["key_phrases"])])
+            if before is not None and any(field in update_data for field in _ROLLUP_FIELDS):
+                after = {**before, **{k: v for k, v in update_data.items() if k in _ROLLUP_FIELDS}}
+                delta.add(before["created_at"], before["sentiment"], scores_from_columns(before), sign=-1)
+                delta.add(after["created_at"], after["sentiment"], scores_from_columns(after))
+                await apply_delta(session, delta)
+            if before is not None and events.hub.active:
+                changed = await session.execute(select(*listing_columns(True)).where(Feedback.id == feedback_id))
+                changed_rows = [dict(row) for row in changed.mappings()]
         await session.commit()
+        await invalidate_tags(FEEDBACKS_TAG, STATS_TAG)
+        await _publish_changes(delta, rows=changed_rows)
         rows_affected = result.rowcount or 0
         logger.info(f"Feedback with id {feedback_id} updated; rows affected: {rows_affected}")
         return rows_affected
 
 async def delete_feedback(feedback_id: int) -> int:
     """
-    Delete a feedback record asynchronously.
+    Delete a feedback record asynchronously, adjusting the sentiment rollups.
+    Archived records are deleted from the archive table.
     """
-    async with async_session_maker() as session:
+    delta = RollupDelta()
+    async with write_session_maker() as session:
         async with session.begin():
-            stmt = sqlalchemy_delete(Feedback).where(Feedback.id == feedback_id)
+            model = Feedback
+            before = await _rollup_fields(session, feedback_id)
+            if before is None:
+                model = FeedbackArchive
+                before = await _rollup_fields(session, feedback_id, model)
+            await delete_key_phrases(session, [feedback_id])
+            stmt = sqlalchemy_delete(model).where(model.id == feedback_id)
             result = await session.execute(stmt)
+            if before is not None:
+                delta.add(before["created_at"], before["sentiment"], scores_from_columns(before), sign=-1)
+                await apply_delta(session, delta)
         await session.commit()
+        await invalidate_tags(FEEDBACKS_TAG, STATS_TAG)
+        if before is not None:
+            await _publish_changes(delta, deleted_ids=[feedback_id])
         rows_affected = result.rowcount or 0
         logger.info(f"Feedback with id {feedback_id} deleted; rows affected: {rows_affected}")
         return rows_affected
 
+async def get_attachment_url(sha256: str) -> Optional[str]:
+    """
+    Return the URL of already-stored attachment content, if any.
+    """
+    async with async_session_maker() as session:
+        result = await session.execute(select(Attachment.url).where(Attachment.sha256 == sha256))
+        return result.scalar_one_or_none()
+
+async def save_attachment(sha256: str, url: str, size: int) -> str:
+    """
+    Record stored attachment content; returns the URL on record for the hash.
+    """
+    try:
+        async with write_session_maker() as session:
+            async with session.begin():
+                session.add(Attachment(sha256=sha256, url=url, size=size))
+        logger.info(f"Attachment {sha256} recorded ({size} bytes).")
+        return url
+    except IntegrityError:
+        return await get_attachment_url(sha256) or url
+
 async def run_in_transaction(statements: List[Any]) -> None:
     """
     Execute multiple statements in a single transaction.
+
+    Each item may be a statement, a ``(statement, parameter_list)`` pair executed as
+    an executemany, or an async callable that receives the session.
     """
-    async with async_session_maker() as session:
+    async with write_session_maker() as session:
         async with session.begin():
             for stmt in statements:
-                await session.execute(stmt)
+                if isinstance(stmt, tuple):
+                    await session.execute(*stmt)
+                elif callable(stmt):
+                    await stmt(session)
+                else:
+                    await session.execute(stmt)
         await session.commit()
     logger.info("Transaction executed successfully.")
+
+async def save_feedbacks_bulk(feedback_rows: List[Dict[str, Any]]) -> int:
+    """
+    Insert many feedback records with one multi-row insert, index their key phrases
+    and count them in the sentiment rollups, all in one transaction. Returns the
+    number of rows inserted.
+    """
+    if not feedback_rows:
+        return 0
+    delta = RollupDelta()
+    for row in feedback_rows:
+        delta.add(row.get("created_at"), row.get("sentiment"), scores_from_columns(row))
+
+    async def _insert(session: AsyncSession) -> None:
+        result = await session.execute(
+            sqlalchemy_insert(Feedback).returning(Feedback.id, sort_by_parameter_order=True), feedback_rows
+        )
+        feedback_ids = result.scalars().all()
+        await add_key_phrases(session, zip(feedback_ids, (row.get("key_phrases") for row in feedback_rows)))
+        await apply_delta(session, delta)
+
+    await run_in_transaction([_insert])
+    await invalidate_tags(FEEDBACKS_TAG, STATS_TAG)
+    # Rows are not pushed one by one; dashboards pick them up from the count changes
+    await _publish_changes(delta)
+    return len(feedback_rows)
+
+async def archive_feedback_batch(cutoff: datetime, batch_size: int = 500) -> List[Dict[str, Any]]:
+    """
+    Move up to ``batch_size`` of the oldest analyzed feedback records created
+    before ``cutoff`` into the archive table, in one transaction. Returns the
+    moved rows; an empty list means nothing is left to archive.
+
+    Rollups are left alone, so sentiment stats keep counting archived records.
+    The newest record is never moved, so SQLite cannot hand out an archived id
+    again.
+    """
+    columns = [getattr(Feedback, key) for key in ARCHIVED_COLUMNS]
+    archived_at = datetime.utcnow()
+    async with write_session_maker() as session:
+        async with session.begin():
+            newest_id = select(func.max(Feedback.id)).scalar_subquery()
+            result = await session.execute(
+                select(*columns)
+                .where(Feedback.created_at < cutoff, Feedback.status != STATUS_PENDING, Feedback.id < newest_id)
+                .order_by(Feedback.created_at, Feedback.id)
+                .limit(batch_size)
+            )
+            rows = [dict(row) for row in result.mappings()]
+            if rows:
+                feedback_ids = [row["id"] for row in rows]
+                await session.execute(
+                    sqlalchemy_insert(FeedbackArchive), [{**row, "archived_at": archived_at} for row in rows]
+                )
+                await delete_key_phrases(session, feedback_ids)
+                await session.execute(sqlalchemy_delete(Feedback).where(Feedback.id.in_(feedback_ids)))
+    if rows:
+        await invalidate_tags(FEEDBACKS_TAG)
+        logger.info(f"Archived {len(rows)} feedback records created before {cutoff.isoformat()}.")
+    return rows
+
+async def rebuild_sentiment_rollups(batch_size: int = 5000) -> int:
+    """
+    Recompute the sentiment rollup table from the live and archived feedback
+    tables. Returns the number of feedback records counted.
+    """
+    delta = RollupDelta()
+    counted = 0
+    both = union_all(
+        select(*[getattr(Feedback, field) for field in _ROLLUP_FIELDS]),
+        select(*[getattr(FeedbackArchive, field) for field in _ROLLUP_FIELDS]),
+    ).subquery()
+    stmt = select(both).execution_options(yield_per=batch_size)
+    async with write_session_maker() as session:
+        async with session.begin():
+            await session.execute(sqlalchemy_delete(SentimentRollup))
+            result = await session.stream(stmt)
+            async for partition in result.mappings().partitions(batch_size):
+                for row in partition:
+                    delta.add(row["created_at"], row["sentiment"], scores_from_columns(row))
+                    counted += 1 if row["sentiment"] else 0
+            await apply_delta(session, delta)
+    await invalidate_tags(STATS_TAG)
+    logger.info(f"Sentiment rollups rebuilt from {counted} feedback records.")
+    return counted
+
+async def migrate_structured_columns(batch_size: int = 1000) -> int:
+    """
+    Convert legacy score and key-phrase text into the structured columns, one
+    transaction per batch so an interrupted run can simply be restarted.
+    Returns the number of feedback records converted.
+    """
+    converted = 0
+    after_id = 0
+    while True:
+        async with write_session_maker() as session:
+            async with session.begin():
+                count, after_id = await backfill_structured_batch(session, after_id, batch_size)
+        if after_id is None:
+            break
+        converted += count
+        await invalidate_tags(FEEDBACKS_TAG)
+        logger.info(f"Structured columns backfilled for {converted} feedback records.")
+    logger.info(f"Structured column backfill finished; {converted} feedback records converted.")
+    return converted
+
+async def get_sentiment_stats(series: Optional[str] = None, points: int = 24) -> Dict[str, Any]:
+    """
+    Read sentiment totals, plus the last ``points`` hourly or daily buckets when
+    ``series`` is "hour" or "day", from the rollup table.
+    """
+    async with async_session_maker() as session:
+        # Totals are sharded over several rows (see rollups.py)
+        result = await session.execute(
+            select(
+                SentimentRollup.sentiment,
+                func.sum(SentimentRollup.count).label("count"),
+                func.sum(SentimentRollup.sum_positive).label("sum_positive"),
+                func.sum(SentimentRollup.sum_neutral).label("sum_neutral"),
+                func.sum(SentimentRollup.sum_negative).label("sum_negative"),
+            )
+            .where(SentimentRollup.granularity == "total")
+            .group_by(SentimentRollup.sentiment)
+        )
+        stats: Dict[str, Any] = {
+            "totals": {rollup.sentiment: rollup_to_dict(rollup) for rollup in result}
+        }
+        if series in ("hour", "day"):
+            step = timedelta(hours=1) if series == "hour" else timedelta(days=1)
+            start = bucket_start(datetime.utcnow(), series) - step * (points - 1)
+            result = await session.execute(
+                select(SentimentRollup)
+                .where(SentimentRollup.granularity == series, SentimentRollup.bucket_start >= start)
+                .order_by(SentimentRollup.bucket_start)
+            )
+            buckets: Dict[datetime, Dict[str, Any]] = {}
+            for rollup in result.scalars():
+                buckets.setdefault(rollup.bucket_start, {})[rollup.sentiment] = rollup_to_dict(rollup)
+            stats["series"] = [
+                {"bucket_start": start.isoformat(), "sentiments": sentiments}
+                for start, sentiments in buckets.items()
+            ]
+    return stats
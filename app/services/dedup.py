@@ -0,0 +1,430 @@
+"""
+Near-duplicate detection over feedback text with MinHash LSH.
+
+Texts are normalized and cut into character shingles hashed with CRC-32, which
+is stable across processes, so a snapshot written by one run is valid for the
+next. Signatures use one-permutation MinHash: each shingle hash falls into one of
+``num_perm`` bins by its low bits and every bin keeps its minimum (empty bins
+borrow from the next non-empty one). The signature is cut into ``bands``; each
+band hashes to a 32-bit key, stored with the feedback id as one 64-bit entry of
+a sorted array, so an index costs ``8 * bands`` bytes per document.
+
+Candidates sharing a band are checked against their stored text with the exact
+shingle Jaccard similarity, so hash collisions and deleted rows never surface.
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from config import config
+from app.services.db_async_sqlalchemy import get_feedbacks_by_ids, stream_feedback_texts
+from app.services.executor import run_blocking
+
+logger = logging.getLogger(__name__)
+
+_WORD_SEPARATORS = re.compile(r"[\W_]+", re.UNICODE)
+_SNAPSHOT_VERSION = 1
+_ID_BITS = 32
+_ID_MASK = (1 << _ID_BITS) - 1
+
+
+def normalize(text: str) -> str:
+    return _WORD_SEPARATORS.sub(" ", text.lower()).strip()
+
+
+def shingle_hashes(text: str, size: int = 5) -> Set[int]:
+    """
+    CRC-32 hashes of the ``size``-byte shingles of the normalized text.
+    """
+    data = normalize(text).encode("utf-8")
+    if len(data) <= size:
+        return {zlib.crc32(data)} if data else set()
+    return {zlib.crc32(data[i:i + size]) for i in range(len(data) - size + 1)}
+
+
+def jaccard(a: Set[int], b: Set[int]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def signature(hashes: Iterable[int], num_perm: int = 64) -> Optional[List[int]]:
+    """
+    One-permutation MinHash signature of a shingle set (None if it is empty).
+    ``num_perm`` must be a power of two.
+    """
+    shift = num_perm.bit_length() - 1
+    mask = num_perm - 1
+    empty = 1 << 32
+    bins = [empty] * num_perm
+    for value in hashes:
+        slot = value & mask
+        value >>= shift
+        if value < bins[slot]:
+            bins[slot] = value
+    if bins.count(empty) == num_perm:
+        return None
+    # Rotation densification: an empty bin takes the next non-empty bin's value,
+    # offset by the distance so that borrowed values differ from the originals
+    for slot in range(num_perm):
+        if bins[slot] == empty:
+            distance = 1
+            while bins[(slot + distance) % num_perm] == empty:
+                distance += 1
+            bins[slot] = bins[(slot + distance) % num_perm] + (distance << 32)
+    return bins
+
+
+def band_keys(sig: List[int], bands: int = 8) -> List[int]:
+    rows = len(sig) // bands
+    return [
+        zlib.crc32(struct.pack(f"<H{rows}Q", band, *sig[band * rows:(band + 1) * rows]))
+        for band in range(bands)
+    ]
+
+
+class LSHIndex:
+    """
+    Band keys of indexed documents as a sorted ``array('Q')`` of ``key << 32 | id``
+    entries. New entries collect in a small dict and are merged into the array
+    once ``merge_threshold`` have accumulated. Ids must fit in 32 bits.
+    """
+
+    def __init__(self, num_perm: int = 64, bands: int = 8, shingle_size: int = 5, merge_threshold: int = 50000):
+        if num_perm & (num_perm - 1) or num_perm % bands:
+            raise ValueError("num_perm must be a power of two and a multiple of bands.")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self.merge_threshold = merge_threshold
+        self._entries = array("Q")
+        self._pending: Dict[int, List[int]] = {}
+        self._pending_count = 0
+        self.documents = 0
+
+    def keys_for(self, text: str) -> Optional[List[int]]:
+        sig = signature(shingle_hashes(text, self.shingle_size), self.num_perm)
+        return band_keys(sig, self.bands) if sig is not None else None
+
+    def add(self, feedback_id: int, keys: Optional[List[int]]) -> None:
+        if keys is None:
+            return
+        for key in keys:
+            self._pending.setdefault(key, []).append(feedback_id)
+        self._pending_count += len(keys)
+        self.documents += 1
+        if self._pending_count >= self.merge_threshold:
+            self.merge()
+
+    def merge(self) -> None:
+        """
+        Fold pending entries into the sorted array, copying it in slices.
+        """
+        if not self._pending:
+            return
+        additions = sorted(key << _ID_BITS | feedback_id for key, ids in self._pending.items() for feedback_id in ids)
+        merged = array("Q")
+        position = 0
+        for entry in additions:
+            end = bisect_right(self._entries, entry, position)
+            merged.extend(self._entries[position:end])
+            merged.append(entry)
+            position = end
+        merged.extend(self._entries[position:])
+        self._entries = merged
+        self._pending = {}
+        self._pending_count = 0
+
+    def candidates(self, keys: Optional[List[int]], limit: int = 0) -> Set[int]:
+        """
+        Ids sharing at least one band key. With ``limit``, at most that many ids
+        are read per band (the oldest) and returned (those sharing most bands),
+        so a crowded bucket costs no more than a normal one.
+        """
+        if not limit:
+            found: Set[int] = set()
+            for key in keys or ():
+                start = bisect_left(self._entries, key << _ID_BITS)
+                end = bisect_left(self._entries, (key + 1) << _ID_BITS, start)
+                found.update(entry & _ID_MASK for entry in self._entries[start:end])
+                found.update(self._pending.get(key, ()))
+            return found
+        shared: Counter = Counter()
+        for key in keys or ():
+            start = bisect_left(self._entries, key << _ID_BITS)
+            end = min(bisect_left(self._entries, (key + 1) << _ID_BITS, start), start + limit)
+            shared.update(entry & _ID_MASK for entry in self._entries[start:end])
+            shared.update(self._pending.get(key, ())[:limit])
+        if len(shared) <= limit:
+            return set(shared)
+        return {feedback_id for feedback_id, _ in sorted(shared.items(), key=lambda item: (-item[1], item[0]))[:limit]}
+
+    @property
+    def nbytes(self) -> int:
+        return self._entries.buffer_info()[1] * self._entries.itemsize + self._pending_count * 8
+
+    def save(self, path: str, scanned_id: int, source: str = "") -> None:
+        """
+        Write the index to ``path`` atomically: a JSON header line, then the entries.
+        ``source`` identifies the database it was built from.
+        """
+        self.merge()
+        header = {
+            "version": _SNAPSHOT_VERSION,
+            "num_perm": self.num_perm,
+            "bands": self.bands,
+            "shingle_size": self.shingle_size,
+            "byteorder": sys.byteorder,
+            "documents": self.documents,
+            "scanned_id": scanned_id,
+            "source": source,
+        }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        with open(tmp_path, "wb") as snapshot:
+            snapshot.write(json.dumps(header).encode("utf-8") + b"\n")
+            self._entries.tofile(snapshot)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str, source: str = "") -> Optional[int]:
+        """
+        Read a snapshot written with the same parameters from the same ``source``;
+        returns the id up to which it covers the feedback table, or None if it
+        cannot be used.
+        """
+        with open(path, "rb") as snapshot:
+            header = json.loads(snapshot.readline())
+            expected = (_SNAPSHOT_VERSION, self.num_perm, self.bands, self.shingle_size, sys.byteorder, source)
+            keys = ("version", "num_perm", "bands", "shingle_size", "byteorder", "source")
+            if tuple(header.get(key) for key in keys) != expected:
+                logger.info(f"Ignoring dedup snapshot {path}: built with different settings or database.")
+                return None
+            entries = array("Q")
+            entries.frombytes(snapshot.read())
+        self._entries = entries
+        self._pending = {}
+        self._pending_count = 0
+        self.documents = header["documents"]
+        return header["scanned_id"]
+
+
+class DuplicateDetector:
+    """
+    The process-wide LSH index over stored feedback.
+
+    ``start()`` loads the snapshot (if any) and indexes rows added since, in the
+    background; until that finishes, lookups find nothing. Saved submissions are
+    added as they come in; rows written by other paths (bulk imports, other
+    workers) are picked up by ``catch_up()``, every ``refresh_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.85,
+        min_chars: int = 30,
+        snapshot_path: str = "",
+        refresh_interval: float = 30.0,
+        max_candidates: int = 50,
+        num_perm: int = 64,
+        bands: int = 8,
+        shingle_size: int = 5,
+    ):
+        self.threshold = threshold
+        self.min_chars = min_chars
+        self.snapshot_path = snapshot_path
+        self.refresh_interval = refresh_interval
+        self.max_candidates = max_candidates
+        # Ties the snapshot to the database it indexes, without storing credentials
+        self.source = format(zlib.crc32(config.AZURE_SQL_CONN_STR.encode("utf-8")), "08x")
+        self.index = LSHIndex(num_perm=num_perm, bands=bands, shingle_size=shingle_size)
+        self.ready = False
+        self._scanned_id = 0
+        self._added_since_scan: Set[int] = set()
+        self._build_task: Optional[asyncio.Task] = None
+        self._scan_lock = asyncio.Lock()
+        self._lookups = 0
+        self._duplicates = 0
+
+    def _keys_for_rows(self, rows: List[Tuple[int, str]]) -> List[Tuple[int, Optional[List[int]]]]:
+        return [(feedback_id, self.index.keys_for(text)) for feedback_id, text in rows]
+
+    async def catch_up(self, batch_size: int = 5000) -> int:
+        """
+        Index stored feedback newer than the last scan, except rows already flagged
+        as duplicates: they would only crowd their original's buckets. Returns the
+        number of rows read.
+        """
+        scanned = 0
+        async with self._scan_lock:
+            async for rows in stream_feedback_texts(
+                after_id=self._scanned_id, batch_size=batch_size, originals_only=True
+            ):
+                # Shingling a batch is CPU-bound; keep it off the event loop
+                keyed = await run_blocking(self._keys_for_rows, rows)
+                # No await from here on: add() cannot interleave with moving the
+                # scan position and forgetting the ids the scan now covers
+                for feedback_id, keys in keyed:
+                    if feedback_id not in self._added_since_scan:
+                        self.index.add(feedback_id, keys)
+                self._scanned_id = rows[-1][0]
+                self._added_since_scan = {i for i in self._added_since_scan if i > self._scanned_id}
+                scanned += len(rows)
+        return scanned
+
+    async def _build(self) -> None:
+        if self.snapshot_path and os.path.exists(self.snapshot_path):
+            try:
+                scanned_id = await run_blocking(self.index.load, self.snapshot_path, self.source)
+                if scanned_id is not None:
+                    self._scanned_id = scanned_id
+                    logger.info(f"Dedup index loaded from {self.snapshot_path} ({self.index.documents} documents).")
+            except Exception as e:
+                logger.warning(f"Could not read dedup snapshot {self.snapshot_path}; rebuilding. ({e})")
+        attempt = 0
+        while True:
+            try:
+                scanned = await self.catch_up()
+                break
+            except Exception as e:
+                # e.g. the schema has not been created yet
+                attempt += 1
+                logger.warning(f"Dedup index build failed; retrying. ({e})")
+                await asyncio.sleep(min(60.0, 2.0 ** attempt))
+        self.ready = True
+        logger.info(f"Dedup index ready: {self.index.documents} documents ({scanned} indexed at startup).")
+        if scanned:
+            await self.save_snapshot()
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.catch_up()
+            except Exception as e:
+                logger.warning(f"Dedup index refresh failed: {e}")
+
+    def start(self) -> None:
+        if self._build_task is None:
+            self._build_task = asyncio.create_task(self._build())
+
+    async def stop(self) -> None:
+        if self._build_task is None:
+            return
+        self._build_task.cancel()
+        await asyncio.gather(self._build_task, return_exceptions=True)
+        if self.ready and self.snapshot_path:
+            try:
+                await self.catch_up()
+            except Exception as e:
+                logger.warning(f"Dedup index catch-up failed before saving: {e}")
+            await self.save_snapshot()
+        self._build_task = None
+
+    async def save_snapshot(self) -> None:
+        if not self.snapshot_path:
+            return
+        try:
+            await run_blocking(self.index.save, self.snapshot_path, self._scanned_id, self.source)
+            logger.info(f"Dedup snapshot written to {self.snapshot_path}.")
+        except Exception as e:
+            logger.warning(f"Could not write dedup snapshot {self.snapshot_path}: {e}")
+
+    def add(self, feedback_id: int, text: str) -> None:
+        """
+        Index a feedback record just saved by this worker, unless a scan has
+        already picked it up.
+        """
+        if feedback_id <= self._scanned_id or feedback_id in self._added_since_scan:
+            return
+        self.index.add(feedback_id, self.index.keys_for(text))
+        self._added_since_scan.add(feedback_id)
+
+    def _candidates(self, text: str) -> Set[int]:
+        return self.index.candidates(self.index.keys_for(text), limit=self.max_candidates)
+
+    def _similarities(self, text: str, others: List[str]) -> List[float]:
+        shingles = shingle_hashes(text, self.index.shingle_size)
+        return [jaccard(shingles, shingle_hashes(other, self.index.shingle_size)) for other in others]
+
+    async def similar(
+        self,
+        text: str,
+        min_similarity: float,
+        limit: int = 10,
+        exclude_id: Optional[int] = None,
+        include_text: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Stored feedback whose text has a shingle Jaccard similarity of at least
+        ``min_similarity`` with ``text``, most similar first, each with a
+        ``similarity``. LSH finds pairs above roughly 0.7 reliably; lower ones
+        only by chance.
+        """
+        candidates = await run_blocking(self._candidates, text)
+        candidates.discard(exclude_id)
+        if not candidates:
+            return []
+        rows = await get_feedbacks_by_ids(candidates, include_text=True)
+        similarities = await run_blocking(self._similarities, text, [row["feedback_text"] for row in rows])
+        matches = []
+        for row, similarity in zip(rows, similarities):
+            if similarity >= min_similarity:
+                if not include_text:
+                    row.pop("feedback_text")
+                matches.append({**row, "similarity": round(similarity, 4)})
+        matches.sort(key=lambda row: (-row["similarity"], row["id"]))
+        return matches[:limit]
+
+    async def find_duplicate(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        The most similar stored feedback at or above ``threshold`` (with its text),
+        if any. Short texts are never treated as duplicates.
+        """
+        if not self.ready or len(normalize(text)) < self.min_chars:
+            return None
+        self._lookups += 1
+        matches = await self.similar(text, self.threshold, limit=1, include_text=True)
+        if not matches:
+            return None
+        self._duplicates += 1
+        return matches[0]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "documents": self.index.documents,
+            "index_bytes": self.index.nbytes,
+            "lookups": self._lookups,
+            "duplicates": self._duplicates,
+        }
+
+
+detector = DuplicateDetector(
+    threshold=config.DEDUP_THRESHOLD,
+    min_chars=config.DEDUP_MIN_CHARS,
+    snapshot_path=config.DEDUP_SNAPSHOT_PATH,
+    refresh_interval=config.DEDUP_REFRESH_INTERVAL,
+    max_candidates=config.DEDUP_MAX_CANDIDATES,
+    num_perm=config.DEDUP_NUM_PERM,
+    bands=config.DEDUP_BANDS,
+)
+
+
+def start_dedup() -> None:
+    """
+    Build the index in the background unless ``Config.DEDUP_MODE`` is "off".
+    """
+    if config.DEDUP_MODE != "off":
+        detector.start()
+
+
+async def stop_dedup() -> None:
+    await detector.stop()
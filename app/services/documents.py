@@ -0,0 +1,70 @@
+"""
+Result types mirroring the Text Analytics SDK document results.
+
+Alternative clients (fakes, local engines) return these so that code consuming
+``analyze_sentiment`` / ``extract_key_phrases`` results works unchanged.
+"""
+from typing import Any, Dict, List, NamedTuple
+
+
+class AnalysisError(Exception):
+    """Raised when the service reports an error for an individual document."""
+
+
+class SentimentConfidenceScores(NamedTuple):
+    positive: float
+    neutral: float
+    negative: float
+
+
+class AnalyzeSentimentResult(NamedTuple):
+    id: str
+    sentiment: str
+    confidence_scores: SentimentConfidenceScores
+    is_error: bool = False
+
+
+class ExtractKeyPhrasesResult(NamedTuple):
+    id: str
+    key_phrases: List[str]
+    is_error: bool = False
+
+
+class DocumentError(NamedTuple):
+    id: str
+    error: str
+    is_error: bool = True
+
+
+def to_analysis_result(sentiment_doc: Any, key_phrase_doc: Any) -> Dict[str, Any]:
+    """
+    Combine a sentiment and a key-phrase document result into the dict shape
+    returned by ``analyze_feedback_async``.
+    """
+    for doc in (sentiment_doc, key_phrase_doc):
+        if doc.is_error:
+            raise AnalysisError(f"Document {doc.id} could not be analyzed: {doc.error}")
+    scores = sentiment_doc.confidence_scores
+    return {
+        "sentiment": sentiment_doc.sentiment,
+        "confidence_scores": {
+            "positive": scores.positive,
+            "neutral": scores.neutral,
+            "negative": scores.negative,
+        },
+        "key_phrases": list(key_phrase_doc.key_phrases),
+    }
+
+
+def to_feedback_columns(analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map an analysis result onto the ``Feedback`` columns that store it.
+    """
+    scores = analysis.get("confidence_scores") or {}
+    return {
+        "sentiment": analysis.get("sentiment"),
+        "score_positive": scores.get("positive"),
+        "score_neutral": scores.get("neutral"),
+        "score_negative": scores.get("negative"),
+        "key_phrases": list(analysis.get("key_phrases") or []),
+    }
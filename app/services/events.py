@@ -0,0 +1,153 @@
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Set
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+class TooManySubscribersError(Exception):
+    """Raised when the hub already has its maximum number of subscribers."""
+
+
+def sse_frame(event: str, data: Any) -> str:
+    """
+    Encode one Server-Sent Events message.
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+class EventHub:
+    """
+    In-process pub/sub for dashboard events.
+
+    Events are encoded once as SSE frames and copied into a bounded queue per
+    subscriber; a subscriber that falls behind loses its oldest frames rather
+    than slowing publishers. With a Redis relay, publishes go through a Redis
+    channel so that subscribers connected to every worker receive them.
+    """
+
+    def __init__(self, queue_size: int = 100, max_subscribers: int = 5000, channel: str = "feedback-events"):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.channel = channel
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._redis = None
+        self._relay_task: Optional[asyncio.Task] = None
+        self.published = 0
+        self.dropped = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def active(self) -> bool:
+        """
+        Whether published events can reach anyone (a local subscriber or the relay).
+        """
+        return bool(self._subscribers) or self._relay_task is not None
+
+    def subscribe(self) -> asyncio.Queue:
+        """
+        Register a subscriber; returns its queue of SSE frames.
+        """
+        if len(self._subscribers) >= self.max_subscribers:
+            raise TooManySubscribersError(f"Event hub is full ({self.max_subscribers} subscribers).")
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    @asynccontextmanager
+    async def subscription(self) -> AsyncIterator[asyncio.Queue]:
+        queue = self.subscribe()
+        try:
+            yield queue
+        finally:
+            self.unsubscribe(queue)
+
+    def _deliver(self, frame: str) -> None:
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(frame)
+
+    async def publish(self, event: str, data: Any) -> None:
+        """
+        Send an event to all subscribers. Never raises: a failed relay publish
+        falls back to local delivery.
+        """
+        if not self.active:
+            return
+        frame = sse_frame(event, data)
+        self.published += 1
+        if self._relay_task is not None:
+            try:
+                await self._redis.publish(self.channel, frame)
+                return
+            except Exception as e:
+                logger.warning(f"Event relay publish failed; delivering locally. ({e})")
+        self._deliver(frame)
+
+    async def _relay(self, pubsub: Any) -> None:
+        while True:
+            try:
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    frame = message["data"]
+                    self._deliver(frame.decode("utf-8") if isinstance(frame, bytes) else frame)
+                logger.warning("Event relay subscription ended; resubscribing.")
+            except asyncio.CancelledError:
+                close = getattr(pubsub, "aclose", None) or pubsub.close
+                await close()
+                raise
+            except Exception as e:
+                logger.warning(f"Event relay connection lost; resubscribing. ({e})")
+            await asyncio.sleep(1)
+            try:
+                pubsub = self._redis.pubsub()
+                await pubsub.subscribe(self.channel)
+            except Exception as e:
+                logger.warning(f"Event relay resubscribe failed: {e}")
+
+    async def start_relay(self, redis_client: Any) -> None:
+        """
+        Route events through Redis pub/sub so they reach subscribers on all workers.
+        """
+        if self._relay_task is not None or redis_client is None:
+            return
+        pubsub = redis_client.pubsub()
+        await pubsub.subscribe(self.channel)
+        self._redis = redis_client
+        self._relay_task = asyncio.create_task(self._relay(pubsub))
+        logger.info(f"Event relay subscribed to Redis channel '{self.channel}'.")
+
+    async def stop_relay(self) -> None:
+        if self._relay_task is None:
+            return
+        self._relay_task.cancel()
+        await asyncio.gather(self._relay_task, return_exceptions=True)
+        self._relay_task = None
+        self._redis = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": self.subscriber_count,
+            "published": self.published,
+            "dropped": self.dropped,
+            "relay": self._relay_task is not None,
+        }
+
+
+hub = EventHub(
+    queue_size=config.EVENTS_QUEUE_SIZE,
+    max_subscribers=config.EVENTS_MAX_SUBSCRIBERS,
+    channel=config.EVENTS_REDIS_CHANNEL,
+)
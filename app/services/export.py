@@ -0,0 +1,48 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator
+from app.schemas.feedback import serialize_feedback
+from app.services.db_async_sqlalchemy import listing_columns, stream_feedbacks
+
+# Supported export formats and their media types
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _csv_value(value: Any) -> Any:
+    # CSV keeps the score columns flat; key phrases become one "; "-separated cell
+    if isinstance(value, list):
+        return "; ".join(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def export_feedbacks(
+    fmt: str = "ndjson",
+    include_text: bool = True,
+    batch_size: int = 1000,
+    **filters: Any,
+) -> AsyncIterator[str]:
+    """
+    Yield an NDJSON or CSV export of matching feedback, one chunk per database batch.
+    """
+    if fmt == "csv":
+        columns = [column.key for column in listing_columns(include_text)]
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        yield buffer.getvalue()
+        async for rows in stream_feedbacks(include_text=include_text, batch_size=batch_size, **filters):
+            buffer.seek(0)
+            buffer.truncate()
+            for row in rows:
+                writer.writerow([_csv_value(row[column]) for column in columns])
+            yield buffer.getvalue()
+    else:
+        async for rows in stream_feedbacks(include_text=include_text, batch_size=batch_size, **filters):
+            yield "".join(json.dumps(serialize_feedback(row)) + "\n" for row in rows)
@@ -0,0 +1,151 @@
+"""
+In-process fakes for external services, used for offline runs and benchmarks.
+"""
+import random
+import re
+import threading
+import time
+from typing import Any, List, Optional
+
+from app.services.documents import (
+    AnalyzeSentimentResult,
+    ExtractKeyPhrasesResult,
+    SentimentConfidenceScores,
+)
+
+_POSITIVE_WORDS = {"good", "great", "love", "excellent", "awesome", "nice", "happy", "fast", "helpful", "amazing"}
+_NEGATIVE_WORDS = {"bad", "slow", "hate", "broken", "terrible", "awful", "crash", "crashes", "bug", "worst", "doesn't"}
+_WORD_RE = re.compile(r"[\w']+")
+
+
+class FakeServiceError(Exception):
+    """
+    Injected service failure; carries ``status_code`` and ``retry_after`` like the
+    SDK's HttpResponseError does.
+    """
+
+    def __init__(self, status_code: int, retry_after: Optional[float] = None):
+        super().__init__(f"Simulated service error {status_code}.")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def _document_text(document: Any) -> str:
+    if isinstance(document, dict):
+        return document.get("text", "")
+    return str(document)
+
+
+class FakeTextAnalyticsClient:
+    """
+    Stand-in for ``TextAnalyticsClient`` with a configurable simulated round-trip.
+
+    Every call sleeps for ``latency`` plus ``per_document_latency`` for each document
+    and, like the real service, rejects calls with more than ``max_batch_size``
+    documents. ``calls`` and ``documents`` count the traffic it has received.
+
+    Failures can be injected: a fraction ``error_rate`` of calls fail with a 503
+    and ``throttle_rate`` with a 429 carrying ``retry_after``.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        per_document_latency: float = 0.0,
+        max_batch_size: int = 10,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: float = 1.0,
+    ):
+        self.latency = latency
+        self.per_document_latency = per_document_latency
+        self.max_batch_size = max_batch_size
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.calls = 0
+        self.documents = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def _round_trip(self, documents: List[Any]) -> None:
+        if len(documents) > self.max_batch_size:
+            raise ValueError(f"Batch of {len(documents)} documents exceeds the limit of {self.max_batch_size}.")
+        with self._lock:
+            self.calls += 1
+            self.documents += len(documents)
+        time.sleep(self.latency + self.per_document_latency * len(documents))
+        roll = random.random()
+        if roll < self.throttle_rate:
+            error = FakeServiceError(429, self.retry_after)
+        elif roll < self.throttle_rate + self.error_rate:
+            error = FakeServiceError(503)
+        else:
+            return
+        with self._lock:
+            self.errors += 1
+        raise error
+
+    def analyze_sentiment(self, documents: List[Any], **kwargs) -> List[AnalyzeSentimentResult]:
+        self._round_trip(documents)
+        results = []
+        for index, document in enumerate(documents):
+            words = _WORD_RE.findall(_document_text(document).lower())
+            positive = sum(word in _POSITIVE_WORDS for word in words)
+            negative = sum(word in _NEGATIVE_WORDS for word in words)
+            total = positive + negative + 1
+            scores = SentimentConfidenceScores(
+                positive=round(positive / total, 2),
+                neutral=round(1 / total, 2),
+                negative=round(negative / total, 2),
+            )
+            if positive > negative:
+                sentiment = "positive"
+            elif negative > positive:
+                sentiment = "negative"
+            else:
+                sentiment = "neutral"
+            results.append(AnalyzeSentimentResult(id=str(index), sentiment=sentiment, confidence_scores=scores))
+        return results
+
+    def extract_key_phrases(self, documents: List[Any], **kwargs) -> List[ExtractKeyPhrasesResult]:
+        self._round_trip(documents)
+        results = []
+        for index, document in enumerate(documents):
+            phrases = []
+            for word in _WORD_RE.findall(_document_text(document).lower()):
+                if len(word) > 4 and word not in phrases:
+                    phrases.append(word)
+            results.append(ExtractKeyPhrasesResult(id=str(index), key_phrases=phrases[:5]))
+        return results
+
+
+class FakeBlobStorage:
+    """
+    Stand-in for the Blob Storage backend: reads the upload and sleeps for
+    ``latency`` plus ``per_mb_latency`` per MiB, keeping nothing.
+    """
+
+    def __init__(self, latency: float = 0.03, per_mb_latency: float = 0.0, base_url: str = "https://example.invalid/feedback-uploads"):
+        self.latency = latency
+        self.per_mb_latency = per_mb_latency
+        self.base_url = base_url
+        self.uploads = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+
+    def ensure_container(self) -> None:
+        pass
+
+    def upload(self, file_stream: Any, file_name: str, length: Optional[int] = None) -> str:
+        size = 0
+        for chunk in iter(lambda: file_stream.read(1024 * 1024), b""):
+            size += len(chunk)
+        with self._lock:
+            self.uploads += 1
+            self.bytes += size
+        time.sleep(self.latency + self.per_mb_latency * size / (1024 * 1024))
+        return f"{self.base_url}/{file_name}"
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,173 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Optional, Set
+from config import config
+from app.models.feedback import STATUS_COMPLETE, STATUS_FAILED, STATUS_PENDING
+from app.services import cognitive
+from app.services.db_async_sqlalchemy import (
+    claim_feedback, get_feedback, get_pending_feedback_ids, release_feedback, update_feedback,
+)
+from app.services.documents import to_feedback_columns
+from app.services.resilience import AnalysisUnavailableError
+from app.services.retry import async_retry, backoff_delay
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """Raised when the ingestion queue cannot accept more submissions."""
+
+
+@async_retry(retries=config.INGESTION_MAX_ATTEMPTS, delay=config.INGESTION_RETRY_DELAY)
+async def enrich_feedback(feedback_id: int) -> None:
+    """
+    Analyze a pending feedback record and store the results.
+
+    Safe to run more than once for the same record: rows that are no longer
+    pending are skipped.
+    """
+    feedback = await get_feedback(feedback_id)
+    if feedback is None or feedback.status != STATUS_PENDING:
+        return
+    analysis = await cognitive.analyze_feedback_async(feedback.feedback_text)
+    update_data = to_feedback_columns(analysis)
+    update_data["status"] = STATUS_COMPLETE
+    await update_feedback(feedback_id, update_data)
+
+
+class IngestionQueue:
+    """
+    Bounded queue of feedback ids awaiting enrichment, drained by a pool of workers.
+
+    Submissions reserve a slot with ``slot()`` before persisting, so the queue
+    depth (queued plus in-progress reservations) never exceeds ``maxsize``. Ids
+    recovered from the database bypass the bound since they are already persisted.
+
+    The database is the shared work queue: a worker claims a record (a lease on
+    the row) before enriching it, so with several worker processes each record is
+    processed once. Every process periodically re-queues unclaimed pending
+    records, which also picks up the work of a process that died.
+    """
+
+    def __init__(self, maxsize: int = 1000, workers: int = 4):
+        self.maxsize = maxsize
+        self.workers = workers
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._reserved = 0
+        self._queued: Set[int] = set()
+        self.recovered = False
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    @property
+    def depth(self) -> int:
+        queued = self._queue.qsize() if self._queue is not None else 0
+        return queued + self._reserved
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        Reserve room for one submission; raise QueueFullError if there is none.
+        """
+        if not self.running:
+            raise RuntimeError("Ingestion queue is not running.")
+        if self.depth >= self.maxsize:
+            raise QueueFullError(f"Ingestion queue is full ({self.maxsize} items).")
+        self._reserved += 1
+        try:
+            yield
+        finally:
+            self._reserved -= 1
+
+    def put(self, feedback_id: int) -> None:
+        self._queue.put_nowait(feedback_id)
+        self._queued.add(feedback_id)
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            feedback_id = await self._queue.get()
+            self._queued.discard(feedback_id)
+            try:
+                if not await claim_feedback(feedback_id, config.INGESTION_LEASE_SECONDS):
+                    # Done already, or being enriched by another worker
+                    continue
+                await enrich_feedback(feedback_id)
+            except AnalysisUnavailableError as e:
+                # Not the record's fault: wait for the circuit to let calls through again
+                delay = max(cognitive.circuit_retry_in(), config.INGESTION_RETRY_DELAY)
+                logger.warning(f"Analysis unavailable; feedback {feedback_id} re-queued in {delay:.0f}s: {e}")
+                await asyncio.sleep(delay)
+                await release_feedback(feedback_id)
+                self.put(feedback_id)
+            except Exception as e:
+                logger.error(f"Enrichment of feedback {feedback_id} failed: {e}")
+                try:
+                    await update_feedback(feedback_id, {"status": STATUS_FAILED})
+                except Exception as mark_error:
+                    # Left pending; it is re-queued once the claim expires.
+                    logger.error(f"Could not mark feedback {feedback_id} as failed: {mark_error}")
+            finally:
+                self._queue.task_done()
+
+    async def _requeue_pending(self) -> None:
+        # Runs in the background, so startup does not wait for (or fail on) the database
+        attempt = 0
+        while True:
+            try:
+                feedback_ids = [i for i in await get_pending_feedback_ids() if i not in self._queued]
+            except Exception as e:
+                attempt += 1
+                delay = backoff_delay(attempt, base=config.INGESTION_RETRY_DELAY)
+                logger.warning(f"Could not load pending feedback; retrying in {delay:.1f}s. ({e})")
+                await asyncio.sleep(delay)
+                continue
+            attempt = 0
+            for feedback_id in feedback_ids:
+                self.put(feedback_id)
+            self.recovered = True
+            if feedback_ids:
+                logger.info(f"{len(feedback_ids)} pending records re-queued.")
+            await asyncio.sleep(config.INGESTION_RECOVERY_INTERVAL)
+
+    async def start(self) -> None:
+        """
+        Start the worker pool and re-queue records left pending by a previous run.
+        """
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        self._tasks.append(asyncio.create_task(self._requeue_pending()))
+        logger.info(f"Ingestion started with {self.workers} workers.")
+
+    async def stop(self) -> None:
+        """
+        Stop the workers. Unprocessed records stay pending in the database.
+        """
+        if not self.running:
+            return
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        logger.info("Ingestion workers stopped.")
+
+
+queue = IngestionQueue(maxsize=config.INGESTION_QUEUE_SIZE, workers=config.INGESTION_WORKERS)
+
+
+async def start_ingestion() -> None:
+    """
+    Start background enrichment when ``Config.INGESTION_MODE`` is "queue", or when
+    degraded mode may defer submissions to it.
+    """
+    if config.INGESTION_MODE == "queue" or config.ANALYSIS_DEGRADED_MODE:
+        await queue.start()
+
+
+async def stop_ingestion() -> None:
+    await queue.stop()
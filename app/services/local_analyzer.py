@@ -0,0 +1,227 @@
+"""
+In-process CPU analyzer: a lexicon sentiment scorer and RAKE key-phrase extraction.
+
+``LocalTextAnalyticsClient`` has the ``analyze_sentiment``/``extract_key_phrases``
+interface of the Text Analytics client and returns the same document result
+types, so it drops in behind ``cognitive.analyze_feedback_async``. Batches are scored
+in a process pool so analysis does not compete with the event loop for the GIL.
+"""
+import logging
+import multiprocessing
+import re
+import threading
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.documents import (
+    AnalyzeSentimentResult,
+    ExtractKeyPhrasesResult,
+    SentimentConfidenceScores,
+)
+
+logger = logging.getLogger(__name__)
+
+# Word polarities on a -3..3 scale
+_LEXICON: Dict[str, float] = {
+    # positive
+    "good": 1.9, "great": 3.1, "love": 3.2, "loved": 2.9, "loving": 2.9, "excellent": 3.2, "awesome": 3.1,
+    "nice": 1.8, "happy": 2.7, "fast": 1.5, "quick": 1.4, "quickly": 1.4, "helpful": 2.2, "amazing": 2.8,
+    "easy": 1.9, "intuitive": 1.9, "smooth": 1.6, "perfect": 2.7, "fantastic": 2.9, "wonderful": 2.7,
+    "like": 1.3, "liked": 1.5, "enjoy": 2.2, "enjoyed": 2.2, "friendly": 2.0, "clean": 1.5, "reliable": 1.9,
+    "useful": 1.9, "recommend": 2.0, "thanks": 1.9, "thank": 1.5, "best": 3.0, "better": 1.9, "improved": 1.9,
+    "impressive": 2.3, "responsive": 1.6, "pleased": 2.3, "satisfied": 2.0, "fixed": 1.2, "works": 1.0,
+    "convenient": 1.8, "beautiful": 2.9, "polished": 1.7, "simple": 1.0, "glad": 2.0, "superb": 3.1,
+    # negative
+    "bad": -2.5, "slow": -1.8, "hate": -2.7, "hated": -2.7, "broken": -2.3, "terrible": -3.1, "awful": -3.0,
+    "crash": -2.2, "crashes": -2.3, "crashed": -2.3, "crashing": -2.3, "bug": -1.8, "bugs": -1.9,
+    "buggy": -2.1, "worst": -3.1, "worse": -2.1, "poor": -2.1, "confusing": -1.9, "annoying": -2.2,
+    "frustrating": -2.3, "frustrated": -2.2, "useless": -2.5, "disappointed": -2.4, "disappointing": -2.4,
+    "fail": -2.1, "fails": -2.1, "failed": -2.1, "failure": -2.3, "error": -1.6, "errors": -1.7,
+    "problem": -1.7, "problems": -1.8, "issue": -1.3, "issues": -1.4, "freeze": -1.9, "freezes": -2.0,
+    "lag": -1.6, "laggy": -1.9, "expensive": -1.5, "difficult": -1.6, "hard": -0.9, "missing": -1.3,
+    "unusable": -2.8, "horrible": -3.0, "angry": -2.4, "refund": -1.2, "cancel": -1.1, "wrong": -1.9,
+    "ugly": -2.2, "unhappy": -2.4, "waste": -2.2, "wasted": -2.2, "stuck": -1.6, "lost": -1.5,
+    "unresponsive": -2.0, "unreliable": -2.2, "complicated": -1.6, "rude": -2.4, "overpriced": -2.0,
+}
+_NEGATIONS = {"not", "no", "never", "none", "nothing", "neither", "nor", "cannot", "without", "hardly", "barely"}
+_INTENSIFIERS = {
+    "very": 1.3, "really": 1.3, "extremely": 1.5, "so": 1.2, "super": 1.3, "incredibly": 1.5,
+    "totally": 1.3, "absolutely": 1.4, "quite": 1.1, "too": 1.2, "slightly": 0.6, "somewhat": 0.7, "bit": 0.7,
+}
+# Words after a contrastive conjunction carry more weight ("nice UI, but it crashes")
+_CONTRAST = {"but", "however", "although", "though"}
+_NEGATION_SCOPE = 3
+_CONTRAST_WEIGHT = 1.5
+# Evidence an unscored text starts with towards neutral
+_NEUTRAL_WEIGHT = 1.5
+_MIXED_THRESHOLD = 0.3
+
+_STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being below between
+both but by can could did do does doing down during each few for from further had has have having he her
+here hers herself him himself his how i if in into is it its itself just me more most my myself no nor not
+now of off on once only or other our ours ourselves out over own same she should so some such than that the
+their theirs them themselves then there these they this those through to too under until up very was we
+were what when where which while who whom why will with would you your yours yourself yourselves also get
+got really please still even much many lot lots thing things it's i'm i've don't doesn't didn't can't won't
+isn't wasn't aren't let us one like would could every always never new use using used make makes made
+""".split())
+_TOKEN_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9'\-]*")
+_SPLIT_RE = re.compile(r"[.,;:!?()\[\]{}\"\n\r\t/|]+")
+_MAX_PHRASE_WORDS = 4
+
+
+def _text(document: Any) -> str:
+    if isinstance(document, dict):
+        return document.get("text", "")
+    return str(document)
+
+
+def _normalize_token(token: str) -> str:
+    token = token.lower()
+    return "not" if token.endswith("n't") else token
+
+
+def score_sentiment(text: str) -> Tuple[str, Tuple[float, float, float]]:
+    """
+    Score one text; returns the label and (positive, neutral, negative) confidences.
+    """
+    tokens = [_normalize_token(token) for token in _TOKEN_RE.findall(text)]
+    positive = negative = 0.0
+    negate_left = 0
+    boost = 1.0
+    for token in tokens:
+        if token in _CONTRAST:
+            # Evidence before the contrast counts less than evidence after it
+            positive, negative = positive / _CONTRAST_WEIGHT, negative / _CONTRAST_WEIGHT
+            negate_left, boost = 0, 1.0
+            continue
+        if token in _NEGATIONS:
+            negate_left = _NEGATION_SCOPE
+            continue
+        if token in _INTENSIFIERS:
+            boost *= _INTENSIFIERS[token]
+            continue
+        polarity = _LEXICON.get(token)
+        if polarity is not None:
+            polarity *= boost
+            if negate_left:
+                polarity = -polarity * 0.75
+            if polarity > 0:
+                positive += polarity
+            else:
+                negative -= polarity
+            boost = 1.0
+        if negate_left:
+            negate_left -= 1
+    total = positive + negative + _NEUTRAL_WEIGHT
+    scores = (round(positive / total, 2), round(_NEUTRAL_WEIGHT / total, 2), round(negative / total, 2))
+    if scores[0] >= _MIXED_THRESHOLD and scores[2] >= _MIXED_THRESHOLD:
+        label = "mixed"
+    elif scores[0] > max(scores[1], scores[2]) or (scores[0] > scores[2] and scores[0] >= 0.4):
+        label = "positive"
+    elif scores[2] > max(scores[0], scores[1]) or (scores[2] > scores[0] and scores[2] >= 0.4):
+        label = "negative"
+    else:
+        label = "neutral"
+    return label, scores
+
+
+def extract_phrases(text: str, max_phrases: int = 10) -> List[str]:
+    """
+    RAKE: candidate phrases are runs of non-stopwords between stopwords and
+    punctuation; words score degree/frequency and phrases the sum of their words.
+    """
+    candidates: List[List[str]] = []
+    for fragment in _SPLIT_RE.split(text):
+        phrase: List[str] = []
+        for token in _TOKEN_RE.findall(fragment):
+            if token.lower() in _STOPWORDS or token.isdigit():
+                if phrase:
+                    candidates.append(phrase)
+                phrase = []
+            else:
+                phrase.append(token)
+        if phrase:
+            candidates.append(phrase)
+    candidates = [phrase[:_MAX_PHRASE_WORDS] for phrase in candidates if len("".join(phrase)) > 2]
+
+    frequency: Dict[str, int] = defaultdict(int)
+    degree: Dict[str, int] = defaultdict(int)
+    for phrase in candidates:
+        for word in phrase:
+            word = word.lower()
+            frequency[word] += 1
+            degree[word] += len(phrase)
+    scored: Dict[str, Tuple[float, int, str]] = {}
+    for position, phrase in enumerate(candidates):
+        key = " ".join(word.lower() for word in phrase)
+        if key in scored:
+            continue
+        score = sum(degree[word.lower()] / frequency[word.lower()] for word in phrase)
+        scored[key] = (score, position, " ".join(phrase))
+    ranked = sorted(scored.values(), key=lambda item: (-item[0], item[1]))
+    return [text for _, _, text in ranked[:max_phrases]]
+
+
+def analyze_sentiments(texts: List[str]) -> List[Tuple[str, Tuple[float, float, float]]]:
+    return [score_sentiment(text) for text in texts]
+
+
+def extract_key_phrases_batch(texts: List[str], max_phrases: int = 10) -> List[List[str]]:
+    return [extract_phrases(text, max_phrases) for text in texts]
+
+
+class LocalTextAnalyticsClient:
+    """
+    Text analytics client that scores documents on local CPUs.
+
+    Batches run in a pool of ``workers`` processes (created on first use; 0 runs
+    them in the calling thread). Methods block, like the SDK client's, and are
+    called through the blocking-I/O pool by the micro-batcher.
+    """
+
+    def __init__(self, workers: int = 0, max_phrases: int = 10):
+        self.workers = workers
+        self.max_phrases = max_phrases
+        self.calls = 0
+        self.documents = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Sentiment and key phrases of a batch are requested from two threads at once
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                # spawn: forking a process that already runs threads and an event loop is unsafe
+                self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+                logger.info(f"Local analyzer started {self.workers} worker processes.")
+            return self._pool
+
+    def _run(self, func: Any, *args: Any) -> Any:
+        if self.workers <= 0:
+            return func(*args)
+        return self._get_pool().submit(func, *args).result()
+
+    def analyze_sentiment(self, documents: List[Any], **kwargs) -> List[AnalyzeSentimentResult]:
+        texts = [_text(document) for document in documents]
+        self.calls += 1
+        self.documents += len(texts)
+        return [
+            AnalyzeSentimentResult(id=str(index), sentiment=label, confidence_scores=SentimentConfidenceScores(*scores))
+            for index, (label, scores) in enumerate(self._run(analyze_sentiments, texts))
+        ]
+
+    def extract_key_phrases(self, documents: List[Any], **kwargs) -> List[ExtractKeyPhrasesResult]:
+        texts = [_text(document) for document in documents]
+        return [
+            ExtractKeyPhrasesResult(id=str(index), key_phrases=phrases)
+            for index, phrases in enumerate(self._run(extract_key_phrases_batch, texts, self.max_phrases))
+        ]
+
+    def close(self) -> None:
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,85 @@
+"""
+In-place schema upgrades for existing databases.
+
+``create_all`` only creates missing tables, so columns and indexes added to the
+models later are added here. Data conversions run in batches through the
+backfill helpers, driven by ``python -m app.cli`` commands.
+"""
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import and_, inspect, not_, or_, select, text, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.feedback import Base, Feedback
+from app.services.rollups import SCORE_KEYS, parse_scores
+
+logger = logging.getLogger(__name__)
+
+
+def _column_ddl(column: Any, conn: Connection) -> str:
+    ddl = f"{conn.dialect.identifier_preparer.quote(column.name)} {column.type.compile(dialect=conn.dialect)}"
+    default = getattr(column.server_default, "arg", None)
+    if isinstance(default, str):
+        ddl += f" DEFAULT '{default}'"
+        if not column.nullable:
+            ddl += " NOT NULL"
+    return ddl
+
+
+def upgrade_schema(conn: Connection) -> None:
+    """
+    Add model columns and indexes missing from existing tables. Run after
+    ``create_all``; added columns are nullable unless they have a text default.
+    """
+    inspector = inspect(conn)
+    add = "ADD" if conn.dialect.name == "mssql" else "ADD COLUMN"
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing_columns:
+                conn.execute(text(f"ALTER TABLE {table.name} {add} {_column_ddl(column, conn)}"))
+                logger.info(f"Added column {table.name}.{column.name}.")
+        existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                index.create(conn)
+                logger.info(f"Created index {index.name}.")
+
+
+def _needs_structured_backfill() -> Any:
+    legacy_scores = and_(Feedback.score_positive.is_(None), Feedback.confidence_scores.isnot(None))
+    legacy_phrases = and_(Feedback.key_phrases.isnot(None), not_(Feedback.key_phrases.startswith("[")))
+    return or_(legacy_scores, legacy_phrases)
+
+
+async def backfill_structured_batch(
+    session: AsyncSession, after_id: int, batch_size: int = 1000
+) -> Tuple[int, Optional[int]]:
+    """
+    Convert the next batch of rows (by id, after ``after_id``) still holding
+    repr-encoded scores or comma-separated key phrases.
+
+    Returns the number of rows converted and the id to continue after, or None
+    when no rows are left.
+    """
+    result = await session.execute(
+        select(Feedback.id, Feedback.confidence_scores, Feedback.score_positive, Feedback.key_phrases)
+        .where(Feedback.id > after_id, _needs_structured_backfill())
+        .order_by(Feedback.id)
+        .limit(batch_size)
+    )
+    rows = result.all()
+    if not rows:
+        return 0, None
+    updates: List[Dict[str, Any]] = []
+    for row in rows:
+        values: Dict[str, Any] = {"id": row.id, "key_phrases": row.key_phrases}
+        if row.score_positive is None and row.confidence_scores:
+            scores = parse_scores(row.confidence_scores)
+            values.update({f"score_{key}": scores[key] for key in SCORE_KEYS})
+        updates.append(values)
+    # Bulk UPDATE by primary key; key phrases are re-written as JSON by the column type
+    await session.execute(update(Feedback), updates)
+    return len(updates), rows[-1].id
@@ -0,0 +1,23 @@
+import base64
+from datetime import datetime
+from typing import Tuple
+
+
+def encode_cursor(created_at: datetime, feedback_id: int) -> str:
+    """
+    Encode a keyset position (the last row of a page) as an opaque cursor.
+    """
+    raw = f"{created_at.isoformat()}|{feedback_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by ``encode_cursor``; raises ValueError if malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, feedback_id = base64.urlsafe_b64decode(padded).decode("utf-8").split("|")
+        return datetime.fromisoformat(created_at), int(feedback_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
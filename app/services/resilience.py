@@ -0,0 +1,298 @@
+"""
+Protection for calls to the text analytics service: a concurrency limit, a token
+bucket that honours Retry-After, retries with exponential backoff and jitter, and
+a circuit breaker that fails fast while the service is unhealthy.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, TypeVar
+from app.services.retry import backoff_delay, retry_after_of
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# HTTP statuses worth retrying: throttling and transient server errors
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class AnalysisUnavailableError(Exception):
+    """Raised when the analysis service cannot be used right now (circuit open or retries exhausted)."""
+    # Retrying immediately would not help; callers should degrade instead.
+    retryable = False
+
+
+class CircuitOpenError(AnalysisUnavailableError):
+    """Raised without calling the service while the circuit breaker is open."""
+
+
+def is_transient(error: BaseException) -> bool:
+    """
+    Whether an error is worth retrying: throttling, 5xx responses, timeouts and
+    connection failures.
+    """
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    if isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return True
+    # azure-core transport errors (ServiceRequestError, ServiceResponseError)
+    return type(error).__name__ in ("ServiceRequestError", "ServiceResponseError")
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter: ``rate`` calls per second on average, bursts up to
+    ``capacity``. ``pause()`` holds all callers back, e.g. for a Retry-After.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def pause(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            now = self._clock()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class CircuitBreaker:
+    """
+    Opens after ``failure_threshold`` consecutive failed calls and rejects calls
+    for ``reset_timeout`` seconds; then lets one trial call through (half-open),
+    closing again if it succeeds.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+        self._trials = 0
+        self.opened = 0
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    @property
+    def retry_in(self) -> float:
+        """
+        Seconds until the next trial call is allowed (0 when closed or half-open).
+        """
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+
+    def check(self) -> Optional[int]:
+        """
+        Raise CircuitOpenError unless a call may go ahead. When half-open, the call
+        becomes the trial: the returned trial number must be settled by recording
+        its result or with ``release_trial``. Returns None otherwise.
+        """
+        state = self.state
+        if state == self.OPEN or (state == self.HALF_OPEN and self._trial_running):
+            raise CircuitOpenError(f"Analysis service circuit is open; retry in {self.retry_in:.0f}s.")
+        if state == self.HALF_OPEN:
+            self._trial_running = True
+            self._trials += 1
+            return self._trials
+        return None
+
+    def release_trial(self, trial: int) -> None:
+        """
+        Free the trial slot of a trial call that ended without a result (e.g. it
+        was cancelled), so the next call can try. A no-op once a result is recorded.
+        """
+        if self._trial_running and trial == self._trials:
+            self._trial_running = False
+
+    def record_success(self) -> None:
+        if self._opened_at is not None:
+            logger.info("Analysis service recovered; circuit closed.")
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._trial_running or self._failures >= self.failure_threshold:
+            if self._opened_at is None or self._trial_running:
+                self.opened += 1
+                logger.warning(f"Analysis service failing; circuit open for {self.reset_timeout}s.")
+            self._opened_at = self._clock()
+        self._trial_running = False
+
+
+class ResilientCaller:
+    """
+    Runs service calls under a concurrency limit, the rate limiter and the circuit
+    breaker, retrying transient failures with jittered exponential backoff.
+
+    ``timeout`` bounds each attempt; a call stuck in a worker thread keeps that
+    thread busy, so the SDK's own transport timeouts should be set as well.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        rate: float = 0.0,
+        burst: float = 10.0,
+        retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_cap: float = 10.0,
+        timeout: Optional[float] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.max_concurrency = max_concurrency
+        self.bucket = TokenBucket(rate, burst)
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.timeout = timeout
+        self.breaker = breaker or CircuitBreaker()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.in_flight = 0
+        self.waiting = 0
+        self.calls = 0
+        self.failures = 0
+        self.retried = 0
+        self.throttled = 0
+        self.rejected = 0
+
+    def _bind_loop(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def call(self, operation: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``operation`` (a zero-argument coroutine function) with protection.
+        Raises CircuitOpenError without calling while the circuit is open, and
+        AnalysisUnavailableError once transient failures exhaust the retries.
+        """
+        return await self._admitted(lambda: self._attempts(operation))
+
+    async def call_all(self, operations: Sequence[Callable[[], Awaitable[T]]]) -> List[T]:
+        """
+        Run operations that belong together (e.g. the requests for one batch)
+        concurrently, each protected like ``call`` but admitted by the circuit
+        breaker once: while it is half-open, the group as a whole is the trial.
+        """
+        return await self._admitted(lambda: asyncio.gather(*(self._attempts(operation) for operation in operations)))
+
+    async def _admitted(self, run: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            trial = self.breaker.check()
+        except CircuitOpenError:
+            self.rejected += 1
+            raise
+        try:
+            return await run()
+        except BaseException:
+            # Cancelled or failed: a trial call that recorded no result must not
+            # hold the half-open circuit's only slot forever
+            if trial is not None:
+                self.breaker.release_trial(trial)
+            raise
+
+    async def _attempts(self, operation: Callable[[], Awaitable[T]]) -> T:
+        semaphore = self._bind_loop()
+        self.waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        try:
+            attempt = 0
+            while True:
+                attempt += 1
+                await self.bucket.acquire()
+                self.calls += 1
+                try:
+                    if self.timeout:
+                        result = await asyncio.wait_for(operation(), self.timeout)
+                    else:
+                        result = await operation()
+                except Exception as e:
+                    self.failures += 1
+                    if not is_transient(e):
+                        # The service answered; a bad request is not an outage
+                        self.breaker.record_success()
+                        raise
+                    retry_after = retry_after_of(e)
+                    if retry_after is not None:
+                        self.throttled += 1
+                        self.bucket.pause(retry_after)
+                    if attempt > self.retries:
+                        self.breaker.record_failure()
+                        raise AnalysisUnavailableError(f"Analysis failed after {attempt} attempts: {e}") from e
+                    if self.breaker.state == CircuitBreaker.OPEN:
+                        # Other calls already gave up on the service; stop retrying too
+                        raise CircuitOpenError(f"Analysis service circuit opened while retrying: {e}") from e
+                    self.retried += 1
+                    wait = retry_after if retry_after is not None else backoff_delay(attempt, self.backoff_base, self.backoff_cap)
+                    logger.warning(f"Transient analysis error ({e}); retry {attempt}/{self.retries} in {wait:.2f}s.")
+                    await asyncio.sleep(wait)
+                else:
+                    self.breaker.record_success()
+                    return result
+        finally:
+            self.in_flight -= 1
+            semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "max_concurrency": self.max_concurrency,
+            "rate_limit_tokens": round(self.bucket.tokens, 2) if self.bucket.rate > 0 else None,
+            "circuit": self.breaker.state,
+            "circuit_retry_in": round(self.breaker.retry_in, 1),
+            "circuit_opened": self.breaker.opened,
+            "calls": self.calls,
+            "failures": self.failures,
+            "retried": self.retried,
+            "throttled": self.throttled,
+            "rejected": self.rejected,
+        }
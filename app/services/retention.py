@@ -0,0 +1,191 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+from config import config
+from app.services.db_async_sqlalchemy import archive_feedback_batch
+from app.services.executor import run_blocking
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def write_archive_files(directory: str, rows: List[Dict[str, Any]]) -> List[str]:
+    """
+    Append rows to monthly ``feedbacks-YYYY-MM.jsonl.gz`` files (by created_at),
+    one JSON object per line. Returns the paths written.
+    """
+    by_month = defaultdict(list)
+    for row in rows:
+        created_at = row.get("created_at")
+        by_month[created_at.strftime("%Y-%m") if created_at else "undated"].append(row)
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for month, month_rows in sorted(by_month.items()):
+        path = os.path.join(directory, f"feedbacks-{month}.jsonl.gz")
+        # Appending adds a gzip member; readers decompress concatenated members as one stream
+        with gzip.open(path, "at", encoding="utf-8") as archive_file:
+            for row in month_rows:
+                archive_file.write(json.dumps(row, default=_json_default) + "\n")
+        paths.append(path)
+    return paths
+
+
+class RetentionMover:
+    """
+    Moves feedback older than the retention window into the archive table, in
+    small batches so the live table is never locked for long.
+
+    Each batch is its own transaction; a short pause between batches leaves room
+    for submissions on a single-writer database such as SQLite. With several
+    worker processes on one host, only the one holding ``lock_path`` runs the
+    scheduled moves; another takes over at its next interval if that one exits.
+    """
+
+    def __init__(
+        self,
+        days: int = 0,
+        batch_size: int = 500,
+        interval: float = 3600.0,
+        batch_pause: float = 0.05,
+        archive_dir: str = "",
+        lock_path: str = "",
+    ):
+        self.days = days
+        self.batch_size = batch_size
+        self.interval = interval
+        self.batch_pause = batch_pause
+        self.archive_dir = archive_dir
+        self.lock_path = lock_path
+        self._lock_file: Optional[Any] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self._archived = 0
+        self._runs = 0
+        self._last_run: Optional[datetime] = None
+        self._last_moved = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    async def run_once(self, days: Optional[int] = None) -> int:
+        """
+        Archive everything older than ``days`` (default: the configured window).
+        Returns the number of records moved.
+        """
+        days = self.days if days is None else days
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        moved = 0
+        async with self._lock:
+            while True:
+                rows = await archive_feedback_batch(cutoff, self.batch_size)
+                if not rows:
+                    break
+                if self.archive_dir:
+                    await run_blocking(write_archive_files, self.archive_dir, rows)
+                moved += len(rows)
+                self._archived += len(rows)
+                await asyncio.sleep(self.batch_pause)
+            self._runs += 1
+            self._last_run = datetime.utcnow()
+            self._last_moved = moved
+        logger.info(f"Retention run archived {moved} feedback records older than {days} days.")
+        return moved
+
+    def _lead(self) -> bool:
+        """
+        Take (or keep) the host-wide retention lock without waiting.
+        """
+        if not self.lock_path or fcntl is None or self._lock_file is not None:
+            return True
+        directory = os.path.dirname(self.lock_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        lock_file = open(self.lock_path, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        logger.info(f"Worker {os.getpid()} runs retention.")
+        return True
+
+    def _resign(self) -> None:
+        if self._lock_file is not None:
+            # Closing the file releases the lock
+            self._lock_file.close()
+            self._lock_file = None
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                if self._lead():
+                    await self.run_once()
+            except Exception as e:
+                # Batches already moved stay moved; the rest is picked up next time
+                logger.error(f"Retention run failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._loop())
+        logger.info(f"Retention started: archiving feedback older than {self.days} days every {self.interval:.0f}s.")
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        self._resign()
+        logger.info("Retention stopped.")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.running,
+            "leader": self.running and (self._lock_file is not None or not self.lock_path or fcntl is None),
+            "days": self.days,
+            "archived": self._archived,
+            "runs": self._runs,
+            "last_moved": self._last_moved,
+            "last_run": self._last_run.isoformat() if self._last_run else None,
+        }
+
+
+mover = RetentionMover(
+    days=config.RETENTION_DAYS,
+    batch_size=config.RETENTION_BATCH_SIZE,
+    interval=config.RETENTION_INTERVAL,
+    batch_pause=config.RETENTION_BATCH_PAUSE,
+    archive_dir=config.ARCHIVE_DIR,
+    lock_path=config.RETENTION_LOCK_PATH,
+)
+
+
+def start_retention() -> None:
+    """
+    Start the periodic archival job when ``Config.RETENTION_DAYS`` is set.
+    """
+    if config.RETENTION_DAYS > 0:
+        mover.start()
+
+
+async def stop_retention() -> None:
+    await mover.stop()
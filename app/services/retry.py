@@ -0,0 +1,69 @@
+import asyncio
+import functools
+import logging
+import random
+from typing import Awaitable, Callable, Optional, TypeVar
+
+# Set up type variable for the retry decorator
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 30.0, jitter: bool = True) -> float:
+    """
+    Delay before retry number ``attempt`` (1-based): exponential, capped, and with
+    "full jitter" (uniform between 0 and the exponential delay) when ``jitter`` is set.
+    """
+    delay = min(cap, base * 2 ** (attempt - 1))
+    return random.uniform(0, delay) if jitter else delay
+
+
+def retry_after_of(error: BaseException) -> Optional[float]:
+    """
+    Seconds the service asked us to wait (a ``retry_after`` attribute, or the
+    Retry-After header of the error's HTTP response), if any.
+    """
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after is None:
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or {}
+        retry_after = headers.get("Retry-After") or headers.get("retry-after")
+    try:
+        return max(0.0, float(retry_after)) if retry_after is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def async_retry(
+    retries: int = 3,
+    delay: float = 1.0,
+    backoff: bool = False,
+    max_delay: float = 30.0,
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    A decorator to retry an async function if it raises an exception.
+
+    Waits ``delay`` seconds between attempts, or with ``backoff`` an exponentially
+    growing, jittered delay starting at ``delay``. A Retry-After hint on the error
+    takes precedence. Errors with ``retryable = False`` are raised immediately.
+    """
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs) -> T:
+            attempt = 0
+            while attempt < retries:
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    attempt += 1
+                    logger.error(f"Error in {func.__name__}, attempt {attempt}/{retries}: {e}")
+                    if attempt < retries and getattr(e, "retryable", True):
+                        wait = retry_after_of(e)
+                        if wait is None:
+                            wait = backoff_delay(attempt, delay, max_delay) if backoff else delay
+                        await asyncio.sleep(wait)
+                    else:
+                        raise
+        return wrapper
+    return decorator
@@ -0,0 +1,169 @@
+import ast
+import json
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+from sqlalchemy import insert, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.rollup import SentimentRollup
+
+GRANULARITIES = ("hour", "day", "total")
+# All-time totals per sentiment are split over TOTAL_SHARDS rows, one second
+# apart from TOTAL_BUCKET, so concurrent writers rarely update the same row;
+# readers add the shards up
+TOTAL_BUCKET = datetime(1970, 1, 1)
+TOTAL_SHARDS = 16
+SCORE_KEYS = ("positive", "neutral", "negative")
+
+BucketKey = Tuple[str, datetime, str]
+
+
+def bucket_start(created_at: datetime, granularity: str) -> datetime:
+    if granularity == "hour":
+        return created_at.replace(minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        return created_at.replace(hour=0, minute=0, second=0, microsecond=0)
+    return TOTAL_BUCKET
+
+
+def parse_scores(value: Any) -> Dict[str, float]:
+    """
+    Read confidence scores stored as a dict, JSON text or a Python dict repr.
+    """
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            try:
+                value = ast.literal_eval(value)
+            except (ValueError, SyntaxError):
+                value = None
+    if not isinstance(value, dict):
+        value = {}
+    return {key: float(value.get(key) or 0.0) for key in SCORE_KEYS}
+
+
+def scores_from_columns(row: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Confidence scores of a feedback row from its score_* columns.
+    """
+    return {key: row.get(f"score_{key}") for key in SCORE_KEYS}
+
+
+class RollupDelta:
+    """
+    Accumulates count and score changes per rollup bucket before they are written.
+    """
+
+    def __init__(self):
+        self.buckets: Dict[BucketKey, list] = defaultdict(lambda: [0, 0.0, 0.0, 0.0])
+
+    def add(self, created_at: Optional[datetime], sentiment: Optional[str], scores: Any, sign: int = 1) -> None:
+        """
+        Count (sign=1) or un-count (sign=-1) one feedback row. Rows without a
+        sentiment (e.g. still pending enrichment) are not counted.
+        """
+        if not sentiment:
+            return
+        created_at = created_at or datetime.utcnow()
+        parsed = parse_scores(scores)
+        for granularity in GRANULARITIES:
+            sums = self.buckets[(granularity, bucket_start(created_at, granularity), sentiment)]
+            sums[0] += sign
+            for i, key in enumerate(SCORE_KEYS, start=1):
+                sums[i] += sign * parsed[key]
+
+    def items(self) -> Iterable[Tuple[BucketKey, list]]:
+        return ((key, sums) for key, sums in self.buckets.items() if any(sums))
+
+    def count_changes(self) -> Dict[str, int]:
+        """
+        Net change of the all-time count per sentiment.
+        """
+        return {
+            sentiment: sums[0]
+            for (granularity, _, sentiment), sums in self.buckets.items()
+            if granularity == "total" and sums[0]
+        }
+
+
+def _rows(delta: RollupDelta) -> List[Dict[str, Any]]:
+    # One total shard per write; sorted so concurrent writers lock rows in the same order
+    total_bucket = TOTAL_BUCKET + timedelta(seconds=random.randrange(TOTAL_SHARDS))
+    return sorted(
+        (
+            {
+                "granularity": granularity,
+                "bucket_start": total_bucket if granularity == "total" else start,
+                "sentiment": sentiment,
+                "count": count,
+                "sum_positive": positive,
+                "sum_neutral": neutral,
+                "sum_negative": negative,
+            }
+            for (granularity, start, sentiment), (count, positive, neutral, negative) in delta.items()
+        ),
+        key=lambda row: (row["granularity"], row["bucket_start"], row["sentiment"]),
+    )
+
+
+_UPSERT_DIALECTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+_SUMS = ("count", "sum_positive", "sum_neutral", "sum_negative")
+
+
+async def _add_to_bucket(session: AsyncSession, row: Dict[str, Any]) -> bool:
+    result = await session.execute(
+        update(SentimentRollup)
+        .where(
+            SentimentRollup.granularity == row["granularity"],
+            SentimentRollup.bucket_start == row["bucket_start"],
+            SentimentRollup.sentiment == row["sentiment"],
+        )
+        .values({column: getattr(SentimentRollup, column) + row[column] for column in _SUMS})
+    )
+    return result.rowcount > 0
+
+
+async def apply_delta(session: AsyncSession, delta: RollupDelta) -> None:
+    """
+    Write accumulated changes to the rollup table inside the caller's transaction.
+
+    SQLite and PostgreSQL get one atomic ``INSERT ... ON CONFLICT DO UPDATE``.
+    Elsewhere a bucket is updated, or inserted in a savepoint when missing; if a
+    concurrent writer inserted it first, the update is retried.
+    """
+    rows = _rows(delta)
+    if not rows:
+        return
+    upsert = _UPSERT_DIALECTS.get(session.bind.dialect.name)
+    if upsert is not None:
+        statement = upsert(SentimentRollup).values(rows)
+        await session.execute(
+            statement.on_conflict_do_update(
+                index_elements=["granularity", "bucket_start", "sentiment"],
+                set_={column: getattr(SentimentRollup, column) + getattr(statement.excluded, column) for column in _SUMS},
+            )
+        )
+        return
+    for row in rows:
+        if await _add_to_bucket(session, row):
+            continue
+        try:
+            async with session.begin_nested():
+                await session.execute(insert(SentimentRollup).values(row))
+        except IntegrityError:
+            await _add_to_bucket(session, row)
+
+
+def rollup_to_dict(rollup: Any) -> Dict[str, Any]:
+    count = rollup.count or 0
+    return {
+        "count": count,
+        "avg_confidence_scores": {
+            key: round(getattr(rollup, f"sum_{key}") / count, 4) if count else 0.0
+            for key in SCORE_KEYS
+        },
+    }
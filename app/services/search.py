@@ -0,0 +1,146 @@
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import column, delete, func, literal_column, or_, select, table, text
+from app.cache import FEEDBACKS_TAG, invalidate_tags
+from app.models.archive import FeedbackArchive
+from app.models.feedback import Feedback, FeedbackKeyPhrase
+from app.services.db_async_sqlalchemy import (
+    archive_horizon, archive_in_range, async_engine, async_session_maker, feedback_filter_clauses, listing_columns,
+    write_session_maker,
+)
+from app.services.search_index import POSTGRES_TSVECTOR_SQL, SQLITE_FTS_TABLES, add_key_phrases, normalize_phrase
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+\*?", re.UNICODE)
+
+
+def fts5_query(query: str) -> str:
+    """
+    Turn free text into an FTS5 query matching all terms; a trailing ``*`` on a
+    term is kept as a prefix match. Terms are quoted so FTS5 syntax is never
+    interpreted from user input.
+    """
+    terms = []
+    for token in _TOKEN_RE.findall(query):
+        prefix = token.endswith("*")
+        term = token.rstrip("*")
+        terms.append(f'"{term}"*' if prefix else f'"{term}"')
+    return " ".join(terms)
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _search_statement(dialect: str, query: Optional[str], include_text: bool, model: Any = Feedback):
+    """
+    Build the ranked search SELECT over ``model``'s table for a dialect; returns
+    (statement, rank ascending).
+    """
+    columns = listing_columns(include_text, model)
+    if not query:
+        stmt = select(*columns, literal_column("NULL").label("rank"))
+        return stmt.order_by(model.created_at.desc(), model.id.desc()), False
+    if dialect == "sqlite":
+        fts_name = SQLITE_FTS_TABLES[model.__tablename__]
+        fts = table(fts_name, column("rowid"))
+        stmt = (
+            select(*columns, literal_column(f"bm25({fts_name}, 1.0, 2.0)").label("rank"))
+            .select_from(fts.join(model, model.id == fts.c.rowid))
+            .where(text(f"{fts_name} MATCH :match").bindparams(match=fts5_query(query)))
+        )
+        # bm25() is lower for better matches
+        return stmt.order_by(literal_column("rank"), model.id.desc()), True
+    if dialect == "postgresql":
+        vector = literal_column(POSTGRES_TSVECTOR_SQL)
+        tsquery = func.plainto_tsquery("english", query)
+        rank = func.ts_rank_cd(vector, tsquery).label("rank")
+        stmt = select(*columns, rank).where(vector.op("@@")(tsquery))
+        return stmt.order_by(rank.desc(), model.id.desc()), False
+    pattern = f"%{_escape_like(query)}%"
+    stmt = select(*columns, literal_column("NULL").label("rank")).where(
+        or_(model.feedback_text.ilike(pattern, escape="\\"), model.key_phrases.ilike(pattern, escape="\\"))
+    )
+    return stmt.order_by(model.created_at.desc(), model.id.desc()), False
+
+
+def _phrase_clause(model: Any, phrase: str):
+    if model is Feedback:
+        return Feedback.id.in_(
+            select(FeedbackKeyPhrase.feedback_id).where(FeedbackKeyPhrase.phrase == normalize_phrase(phrase))
+        )
+    # Archived rows have no key-phrase table entries; match the JSON array text instead
+    pattern = f"%{_escape_like(json.dumps(normalize_phrase(phrase)))}%"
+    return func.lower(model.key_phrases).like(pattern, escape="\\")
+
+
+def _filtered_search(dialect: str, query: Optional[str], phrase: Optional[str], include_text: bool, model: Any, filters: Dict[str, Any]):
+    stmt, rank_ascending = _search_statement(dialect, query, include_text, model)
+    stmt = stmt.where(*feedback_filter_clauses(model=model, **filters))
+    if phrase:
+        stmt = stmt.where(_phrase_clause(model, phrase))
+    return stmt, rank_ascending
+
+
+async def search_feedbacks(
+    query: Optional[str] = None,
+    phrase: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+    include_text: bool = False,
+    **filters: Any,
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Full-text search over feedback text and key phrases, best matches first.
+
+    ``phrase`` restricts results to feedback with that exact key phrase (via the
+    indexed key-phrase table). Returns the page of rows (each with a ``score``;
+    higher is better) and whether more results follow.
+
+    Archived feedback is searched only once the live matches run out, so it
+    follows all live results.
+    """
+    dialect = async_engine.dialect.name
+    stmt, rank_ascending = _filtered_search(dialect, query, phrase, include_text, Feedback, filters)
+    async with async_session_maker() as session:
+        result = await session.execute(stmt.limit(limit + 1).offset(offset))
+        rows = [dict(row) for row in result.mappings()]
+        if len(rows) <= limit and archive_in_range(await archive_horizon(session), **filters):
+            archive_stmt, _ = _filtered_search(dialect, query, phrase, include_text, FeedbackArchive, filters)
+            archive_offset = 0
+            if not rows and offset:
+                live_count = await session.execute(select(func.count()).select_from(stmt.order_by(None).subquery()))
+                archive_offset = max(offset - live_count.scalar(), 0)
+            result = await session.execute(archive_stmt.limit(limit + 1 - len(rows)).offset(archive_offset))
+            rows += [dict(row) for row in result.mappings()]
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    for row in rows:
+        rank = row.pop("rank")
+        row["score"] = None if rank is None else round(-rank if rank_ascending else rank, 6)
+    return rows, has_more
+
+
+async def rebuild_search_index(batch_size: int = 5000) -> int:
+    """
+    Rebuild the full-text indexes and the key-phrase table from the feedback
+    tables. Returns the number of live feedback records indexed.
+    """
+    indexed = 0
+    stmt = select(Feedback.id, Feedback.key_phrases).execution_options(yield_per=batch_size)
+    async with write_session_maker() as session:
+        async with session.begin():
+            if async_engine.dialect.name == "sqlite":
+                for fts in SQLITE_FTS_TABLES.values():
+                    await session.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+            await session.execute(delete(FeedbackKeyPhrase))
+            result = await session.stream(stmt)
+            async for partition in result.partitions(batch_size):
+                await add_key_phrases(session, [(row.id, row.key_phrases) for row in partition])
+                indexed += len(partition)
+    await invalidate_tags(FEEDBACKS_TAG)
+    logger.info(f"Search index rebuilt for {indexed} feedback records.")
+    return indexed
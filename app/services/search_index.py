@@ -0,0 +1,109 @@
+import logging
+from typing import Any, Dict, Iterable, List
+from sqlalchemy import delete, insert, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.feedback import FeedbackKeyPhrase
+from app.models.types import split_key_phrases
+
+logger = logging.getLogger(__name__)
+
+# SQLite: an external-content FTS5 table over feedbacks, kept in sync by triggers
+_SQLITE_FTS_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS feedbacks_fts USING fts5(
+        feedback_text, key_phrases, content='feedbacks', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS feedbacks_fts_ai AFTER INSERT ON feedbacks BEGIN
+        INSERT INTO feedbacks_fts(rowid, feedback_text, key_phrases)
+        VALUES (new.id, new.feedback_text, new.key_phrases);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS feedbacks_fts_ad AFTER DELETE ON feedbacks BEGIN
+        INSERT INTO feedbacks_fts(feedbacks_fts, rowid, feedback_text, key_phrases)
+        VALUES ('delete', old.id, old.feedback_text, old.key_phrases);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS feedbacks_fts_au AFTER UPDATE OF feedback_text, key_phrases ON feedbacks BEGIN
+        INSERT INTO feedbacks_fts(feedbacks_fts, rowid, feedback_text, key_phrases)
+        VALUES ('delete', old.id, old.feedback_text, old.key_phrases);
+        INSERT INTO feedbacks_fts(rowid, feedback_text, key_phrases)
+        VALUES (new.id, new.feedback_text, new.key_phrases);
+    END
+    """,
+    # Archived rows are only inserted and deleted, never updated
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS feedbacks_archive_fts USING fts5(
+        feedback_text, key_phrases, content='feedbacks_archive', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS feedbacks_archive_fts_ai AFTER INSERT ON feedbacks_archive BEGIN
+        INSERT INTO feedbacks_archive_fts(rowid, feedback_text, key_phrases)
+        VALUES (new.id, new.feedback_text, new.key_phrases);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS feedbacks_archive_fts_ad AFTER DELETE ON feedbacks_archive BEGIN
+        INSERT INTO feedbacks_archive_fts(feedbacks_archive_fts, rowid, feedback_text, key_phrases)
+        VALUES ('delete', old.id, old.feedback_text, old.key_phrases);
+    END
+    """,
+]
+
+# PostgreSQL: a GIN index on the same tsvector expression the search query uses
+POSTGRES_TSVECTOR_SQL = (
+    "to_tsvector('english', coalesce(feedback_text, '') || ' ' || coalesce(key_phrases, ''))"
+)
+_POSTGRES_FTS_DDL = [
+    f"CREATE INDEX IF NOT EXISTS ix_feedbacks_fts ON feedbacks USING GIN ({POSTGRES_TSVECTOR_SQL})",
+    f"CREATE INDEX IF NOT EXISTS ix_feedbacks_archive_fts ON feedbacks_archive USING GIN ({POSTGRES_TSVECTOR_SQL})",
+]
+# SQLite full-text table of each searchable table
+SQLITE_FTS_TABLES = {"feedbacks": "feedbacks_fts", "feedbacks_archive": "feedbacks_archive_fts"}
+
+
+def create_search_schema(conn: Connection) -> None:
+    """
+    Create the dialect-specific full-text index; other dialects fall back to LIKE scans.
+    """
+    ddl = {"sqlite": _SQLITE_FTS_DDL, "postgresql": _POSTGRES_FTS_DDL}.get(conn.dialect.name, [])
+    created = []
+    if conn.dialect.name == "sqlite":
+        created = [fts for fts in SQLITE_FTS_TABLES.values() if not conn.dialect.has_table(conn, fts)]
+    for statement in ddl:
+        conn.execute(text(statement))
+    for fts in created:
+        # An external-content index starts empty; index rows that predate it, or
+        # the update/delete triggers would corrupt it.
+        conn.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+    if ddl:
+        logger.info(f"Full-text search index ready ({conn.dialect.name}).")
+
+
+def normalize_phrase(phrase: str) -> str:
+    return phrase.strip().lower()[:255]
+
+
+def key_phrase_rows(feedback_id: int, key_phrases: Any) -> List[Dict[str, Any]]:
+    phrases = {normalize_phrase(phrase) for phrase in split_key_phrases(key_phrases)}
+    return [{"feedback_id": feedback_id, "phrase": phrase} for phrase in sorted(phrases)]
+
+
+async def add_key_phrases(session: AsyncSession, items: Iterable[tuple]) -> None:
+    """
+    Insert normalized key-phrase rows for each (feedback_id, key_phrases) item,
+    inside the caller's transaction.
+    """
+    rows = [row for feedback_id, key_phrases in items for row in key_phrase_rows(feedback_id, key_phrases)]
+    if rows:
+        await session.execute(insert(FeedbackKeyPhrase), rows)
+
+
+async def delete_key_phrases(session: AsyncSession, feedback_ids: List[int]) -> None:
+    if feedback_ids:
+        await session.execute(delete(FeedbackKeyPhrase).where(FeedbackKeyPhrase.feedback_id.in_(feedback_ids)))
@@ -1,27 +1,178 @@
+import asyncio
 import logging
-from azure.storage.blob import BlobServiceClient
-from config.config import config
+import os
+import shutil
+import tempfile
+import threading
+from typing import BinaryIO, Optional
+from config import config
+from app.services.executor import run_blocking
 
 logger = logging.getLogger(__name__)
 
-def upload_file_to_blob(file_stream, file_name: str) -> str:
+# Read size used when copying uploads to local storage
+CHUNK_SIZE = 1024 * 1024
+
+
+class AzureBlobStorage:
     """
-    Upload a file to Azure Blob Storage and return its URL.
+    Azure Blob Storage backend sharing one long-lived client (and its HTTP
+    connection pool) across uploads. The container check runs once.
+    """
+
+    def __init__(self, conn_string: str, container_name: str, max_concurrency: int = 4, block_size: int = 4 * 1024 * 1024):
+        # Imported here so workers using the local backend never load the SDK
+        from azure.storage.blob import BlobServiceClient
+
+        # Streams larger than one block are uploaded as blocks, in parallel.
+        self._service = BlobServiceClient.from_connection_string(
+            conn_string, max_block_size=block_size, max_single_put_size=block_size
+        )
+        self._container = self._service.get_container_client(container_name)
+        self.container_name = container_name
+        self.max_concurrency = max_concurrency
+        self._container_ready = False
+        self._lock = threading.Lock()
+
+    def ensure_container(self) -> None:
+        if self._container_ready:
+            return
+        with self._lock:
+            if self._container_ready:
+                return
+            try:
+                self._container.get_container_properties()
+            except Exception as e:
+                logger.info(f"Container '{self.container_name}' does not exist; creating container. ({e})")
+                self._container.create_container()
+            self._container_ready = True
+
+    def upload(self, file_stream: BinaryIO, file_name: str, length: Optional[int] = None) -> str:
+        self.ensure_container()
+        blob_client = self._container.get_blob_client(file_name)
+        try:
+            blob_client.upload_blob(file_stream, length=length, overwrite=True, max_concurrency=self.max_concurrency)
+        except Exception as e:
+            logger.error(f"Failed to upload blob: {e}")
+            raise
+        return blob_client.url
+
+    def close(self) -> None:
+        self._service.close()
+
+
+class LocalFileStorage:
+    """
+    Filesystem backend for development, offline runs and benchmarks. Files are
+    copied in chunks and published atomically; URLs are ``base_url/file_name``.
+    """
+
+    def __init__(self, root: str, base_url: str):
+        self.root = os.path.abspath(root)
+        self.base_url = base_url.rstrip("/")
+
+    def ensure_container(self) -> None:
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, file_name: str) -> str:
+        path = os.path.normpath(os.path.join(self.root, file_name))
+        if os.path.commonpath([self.root, path]) != self.root:
+            raise ValueError(f"Invalid file name: {file_name!r}")
+        return path
+
+    def upload(self, file_stream: BinaryIO, file_name: str, length: Optional[int] = None) -> str:
+        path = self._path(file_name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                shutil.copyfileobj(file_stream, out, CHUNK_SIZE)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+        return f"{self.base_url}/{file_name}"
+
+    def close(self) -> None:
+        pass
+
+
+_storage = None
+
+
+def get_storage():
+    """
+    Return the process-wide storage backend selected by ``Config.STORAGE_BACKEND``.
+    """
+    global _storage
+    if _storage is None:
+        if config.STORAGE_BACKEND == "local":
+            _storage = LocalFileStorage(config.LOCAL_STORAGE_DIR, config.LOCAL_STORAGE_URL)
+        else:
+            _storage = AzureBlobStorage(
+                config.BLOB_CONN_STRING,
+                config.BLOB_CONTAINER_NAME,
+                max_concurrency=config.BLOB_UPLOAD_CONCURRENCY,
+                block_size=config.BLOB_BLOCK_SIZE,
+            )
+    return _storage
+
+
+async def init_storage() -> None:
+    """
+    Create the storage client and check the container once at startup. A failed
+    check is logged and retried on the first upload.
     """
-    blob_service_client = BlobServiceClient.from_connection_string(config.BLOB_CONN_STRING)
-    container_name = "feedback-uploads"
-    container_client = blob_service_client.get_container_client(container_name)
-    try:
-        container_client.get_container_properties()
-    except Exception as e:
-        logger.info(f"Container '{container_name}' does not exist; creating container. ({e})")
-        container_client.create_container()
-    blob_client = container_client.get_blob_client(file_name)
     try:
-        blob_client.upload_blob(file_stream, overwrite=True)
+        await run_blocking(get_storage().ensure_container)
+        logger.info("Attachment storage ready.")
     except Exception as e:
-        logger.error(f"Failed to upload blob: {e}")
-        raise
-    blob_url = blob_client.url
+        logger.warning(f"Attachment storage check failed; will retry on first upload. ({e})")
+
+
+_init_task: Optional[asyncio.Task] = None
+
+
+def start_storage_init() -> None:
+    """
+    Run ``init_storage`` in the background so an unreachable storage account does
+    not hold up worker startup.
+    """
+    global _init_task
+    if _init_task is None:
+        _init_task = asyncio.create_task(init_storage())
+
+
+def set_storage(backend) -> None:
+    """
+    Replace the storage backend (e.g. with a fake for offline benchmarks).
+    """
+    global _storage
+    _storage = backend
+
+
+def close_storage() -> None:
+    global _storage, _init_task
+    if _init_task is not None:
+        _init_task.cancel()
+        _init_task = None
+    if _storage is not None:
+        _storage.close()
+        _storage = None
+
+
+def upload_file_to_blob(file_stream, file_name: str, length: Optional[int] = None) -> str:
+    """
+    Upload a file to Azure Blob Storage (or the configured backend) and return its URL.
+    """
+    blob_url = get_storage().upload(file_stream, file_name, length=length)
     logger.info(f"File uploaded to blob URL: {blob_url}")
     return blob_url
+
+
+async def upload_file_to_blob_async(file_stream, file_name: str, length: Optional[int] = None) -> str:
+    """
+    Upload a file to Azure Blob Storage without blocking the event loop.
+    """
+    return await run_blocking(upload_file_to_blob, file_stream, file_name, length)
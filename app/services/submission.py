@@ -0,0 +1,175 @@
+import asyncio
+import datetime
+import logging
+from typing import Any, Dict, Optional
+from fastapi import UploadFile
+from config import config
+from app import metrics
+from app.models.feedback import STATUS_COMPLETE, STATUS_PENDING
+from app.services import cognitive, dedup, ingestion
+from app.services.attachments import store_attachment
+from app.services.db_async_sqlalchemy import save_feedback
+from app.services.documents import to_feedback_columns
+from app.services.resilience import AnalysisUnavailableError
+
+logger = logging.getLogger(__name__)
+
+
+class SubmissionError(Exception):
+    """Raised when a stage of the submission pipeline fails."""
+
+
+async def _upload_attachment(attachment: Optional[UploadFile]) -> Optional[str]:
+    if not attachment or not attachment.filename:
+        return None
+    # Stream straight from the upload's spooled temp file rather than reading it into memory.
+    try:
+        with metrics.stage("upload"):
+            return await store_attachment(attachment.file, attachment.filename)
+    except Exception as e:
+        logger.error(f"Attachment upload failed: {e}")
+        raise SubmissionError("Attachment upload error.") from e
+
+
+async def _analyze(feedback_text: str) -> Dict[str, Any]:
+    try:
+        with metrics.stage("analysis"):
+            return await cognitive.analyze_feedback_async(feedback_text)
+    except AnalysisUnavailableError as e:
+        if config.ANALYSIS_DEGRADED_MODE:
+            # Handled by process_submission, which defers the analysis
+            raise
+        logger.error(f"Cognitive analysis failed: {e}")
+        raise SubmissionError("Cognitive analysis error.") from e
+    except Exception as e:
+        logger.error(f"Cognitive analysis failed: {e}")
+        raise SubmissionError("Cognitive analysis error.") from e
+
+
+async def _save(feedback_data: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        with metrics.stage("db_commit"):
+            feedback_data["id"] = await save_feedback(feedback_data)
+    except Exception as e:
+        logger.error(f"Error saving feedback: {e}")
+        raise SubmissionError("Error saving feedback.") from e
+    return feedback_data
+
+
+async def _find_duplicate(feedback_text: str) -> Optional[Dict[str, Any]]:
+    if config.DEDUP_MODE == "off":
+        return None
+    try:
+        with metrics.stage("dedup"):
+            return await dedup.detector.find_duplicate(feedback_text)
+    except Exception as e:
+        # The check only saves work; never fail a submission over it
+        logger.warning(f"Duplicate check failed: {e}")
+        return None
+
+
+async def _submit_duplicate(
+    name: str,
+    email: str,
+    feedback_text: str,
+    attachment: Optional[UploadFile],
+    original: Dict[str, Any],
+) -> Dict[str, Any]:
+    logger.info(f"Submission is a near-duplicate of feedback {original['id']} (similarity {original['similarity']}).")
+    # Collapsing would drop the upload, so a duplicate with an attachment is stored (flagged)
+    if config.DEDUP_MODE == "collapse" and not (attachment and attachment.filename):
+        original.pop("similarity")
+        return original
+    feedback_data = {
+        "name": name,
+        "email": email,
+        "feedback_text": feedback_text,
+        # The original's analysis, so the duplicate never reaches the service
+        **{key: original[key] for key in ("sentiment", "score_positive", "score_neutral", "score_negative", "key_phrases")},
+        "attachment_url": await _upload_attachment(attachment),
+        "status": STATUS_COMPLETE,
+        "duplicate_of": original["duplicate_of"] or original["id"],
+        "created_at": datetime.datetime.utcnow()
+    }
+    return await _save(feedback_data)
+
+
+async def _submit_for_enrichment(
+    name: str,
+    email: str,
+    feedback_text: str,
+    attachment: Optional[UploadFile],
+    attachment_url: Optional[str] = None,
+) -> Dict[str, Any]:
+    # Raises QueueFullError before anything is persisted when there is no room.
+    async with ingestion.queue.slot():
+        if attachment_url is None:
+            attachment_url = await _upload_attachment(attachment)
+        feedback_data = {
+            "name": name,
+            "email": email,
+            "feedback_text": feedback_text,
+            "attachment_url": attachment_url,
+            "status": STATUS_PENDING,
+            "created_at": datetime.datetime.utcnow()
+        }
+        await _save(feedback_data)
+        ingestion.queue.put(feedback_data["id"])
+    return feedback_data
+
+
+async def process_submission(
+    name: str,
+    email: str,
+    feedback_text: str,
+    attachment: Optional[UploadFile] = None,
+) -> Dict[str, Any]:
+    """
+    Analyze, upload and persist one feedback submission.
+
+    Cognitive analysis and the attachment upload run concurrently, and none of the
+    stages block the event loop. In "queue" ingestion mode the raw feedback is saved
+    as pending and analyzed by background workers instead; in degraded mode the
+    same happens when the analysis service is unavailable. Near-duplicates of
+    analyzed feedback are flagged or collapsed (``Config.DEDUP_MODE``) before any
+    analysis. Returns the saved record as a dict.
+    """
+    original = await _find_duplicate(feedback_text)
+    if original is not None and original["status"] == STATUS_COMPLETE:
+        return await _submit_duplicate(name, email, feedback_text, attachment, original)
+    feedback_data = await _process(name, email, feedback_text, attachment)
+    if config.DEDUP_MODE != "off":
+        dedup.detector.add(feedback_data["id"], feedback_text)
+    return feedback_data
+
+
+async def _process(
+    name: str,
+    email: str,
+    feedback_text: str,
+    attachment: Optional[UploadFile] = None,
+) -> Dict[str, Any]:
+    if config.INGESTION_MODE == "queue" or (config.ANALYSIS_DEGRADED_MODE and cognitive.circuit_open()):
+        return await _submit_for_enrichment(name, email, feedback_text, attachment)
+
+    analysis, attachment_url = await asyncio.gather(
+        _analyze(feedback_text), _upload_attachment(attachment), return_exceptions=True
+    )
+    if isinstance(attachment_url, BaseException):
+        raise attachment_url
+    if isinstance(analysis, AnalysisUnavailableError):
+        logger.warning(f"Analysis unavailable, saving feedback as pending: {analysis}")
+        return await _submit_for_enrichment(name, email, feedback_text, attachment, attachment_url)
+    if isinstance(analysis, BaseException):
+        raise analysis
+
+    feedback_data = {
+        "name": name,
+        "email": email,
+        "feedback_text": feedback_text,
+        **to_feedback_columns(analysis),
+        "attachment_url": attachment_url,
+        "status": STATUS_COMPLETE,
+        "created_at": datetime.datetime.utcnow()
+    }
+    return await _save(feedback_data)
@@ -0,0 +1,97 @@
+# app/startup.py
+"""
+Worker start-up timing.
+
+Import this module before anything else in ``app.main``: the import clock starts
+here. ``timer`` then records how long the remaining imports took, how long the
+startup hook ran and how long the worker's first request took, logs them once
+when that request finishes and serves them on ``/ready`` and ``/metrics``.
+"""
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+_IMPORT_STARTED = time.perf_counter()
+
+
+class StartupTimer:
+    def __init__(self, started: float):
+        self.started = started
+        self.import_seconds: Optional[float] = None
+        self.startup_seconds: Optional[float] = None
+        self.first_request_seconds: Optional[float] = None
+        # From the start of the imports to the end of the first response
+        self.time_to_first_response: Optional[float] = None
+
+    def imports_done(self) -> None:
+        if self.import_seconds is None:
+            self.import_seconds = time.perf_counter() - self.started
+
+    @contextmanager
+    def startup(self) -> Iterator[None]:
+        """
+        Time the startup hook (``with timer.startup(): ...``).
+        """
+        began = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.startup_seconds = time.perf_counter() - began
+            logger.info(
+                f"Worker {os.getpid()} started: imports {self.import_seconds or 0:.3f}s, "
+                f"startup {self.startup_seconds:.3f}s."
+            )
+
+    def first_request_done(self, began: float) -> None:
+        finished = time.perf_counter()
+        self.first_request_seconds = finished - began
+        self.time_to_first_response = finished - self.started
+        logger.info(
+            f"Worker {os.getpid()} served its first request in {self.first_request_seconds * 1000:.1f} ms "
+            f"({self.time_to_first_response:.3f}s after imports began)."
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "import_seconds": self.import_seconds,
+            "startup_seconds": self.startup_seconds,
+            "first_request_seconds": self.first_request_seconds,
+            "time_to_first_response": self.time_to_first_response,
+        }
+
+
+timer = StartupTimer(_IMPORT_STARTED)
+
+
+class FirstRequestMiddleware:
+    """
+    ASGI middleware timing the first HTTP request a worker serves; every later
+    request passes straight through.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+        self._seen = False
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        if self._seen or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        self._seen = True
+        began = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            timer.first_request_done(began)
+
+
+def install(app: Any) -> None:
+    """
+    Add the first-request timer to a FastAPI app.
+    """
+    app.add_middleware(FirstRequestMiddleware)
@@ -0,0 +1,103 @@
+"""
+Accuracy and throughput of the text analytics backends.
+
+Accuracy is measured on a labeled sample (``benchmarks/data/sentiment_sample.jsonl``
+by default; one ``{"text": ..., "sentiment": ...}`` object per line). Throughput
+runs sentiment plus key-phrase extraction over ``--documents`` texts in batches,
+with ``--concurrency`` batches in flight, as the micro-batcher does.
+
+The Azure backend is included with ``--azure`` (uses AZURE_ENDPOINT/AZURE_KEY).
+
+    python -m benchmarks.bench_analyzers --documents 20000 --workers 4
+"""
+import argparse
+import json
+import os
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.documents import to_analysis_result
+from app.services.fakes import FakeTextAnalyticsClient
+from app.services.local_analyzer import LocalTextAnalyticsClient
+from benchmarks.common import print_report
+
+DEFAULT_SAMPLE = os.path.join(os.path.dirname(__file__), "data", "sentiment_sample.jsonl")
+
+
+def _load_sample(path: str):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _analyze(client, texts):
+    return [
+        to_analysis_result(s, k)
+        for s, k in zip(client.analyze_sentiment(texts), client.extract_key_phrases(texts))
+    ]
+
+
+def _accuracy(client, sample, batch_size: int):
+    predictions = []
+    for start in range(0, len(sample), batch_size):
+        texts = [item["text"] for item in sample[start:start + batch_size]]
+        predictions.extend(result["sentiment"] for result in _analyze(client, texts))
+    labels = [item["sentiment"] for item in sample]
+    confusion = defaultdict(Counter)
+    for label, predicted in zip(labels, predictions):
+        confusion[label][predicted] += 1
+    correct = sum(label == predicted for label, predicted in zip(labels, predictions))
+    return {
+        "accuracy": round(correct / len(labels), 3),
+        "recall": {label: round(counts[label] / sum(counts.values()), 3) for label, counts in sorted(confusion.items())},
+        "confusion": {label: dict(counts) for label, counts in sorted(confusion.items())},
+    }
+
+
+def _throughput(client, texts, batch_size: int, concurrency: int):
+    batches = [texts[start:start + batch_size] for start in range(0, len(texts), batch_size)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        for _ in pool.map(lambda batch: _analyze(client, batch), batches):
+            pass
+    elapsed = time.perf_counter() - started
+    return {"documents": len(texts), "docs_per_second": round(len(texts) / elapsed, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sample", default=DEFAULT_SAMPLE)
+    parser.add_argument("--documents", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Local analyzer processes")
+    parser.add_argument("--azure", action="store_true", help="Also measure the Azure service")
+    args = parser.parse_args()
+
+    sample = _load_sample(args.sample)
+    texts = [sample[i % len(sample)]["text"] for i in range(args.documents)]
+    backends = {
+        "local (in-thread)": LocalTextAnalyticsClient(workers=0),
+        f"local ({args.workers} processes)": LocalTextAnalyticsClient(workers=args.workers),
+        "fake": FakeTextAnalyticsClient(latency=0),
+    }
+    if args.azure:
+        from azure.ai.textanalytics import TextAnalyticsClient
+        from azure.core.credentials import AzureKeyCredential
+        from config import config
+        backends["azure"] = TextAnalyticsClient(config.AZURE_ENDPOINT, AzureKeyCredential(config.AZURE_KEY))
+
+    reports = []
+    for name, client in backends.items():
+        # Azure rejects batches above 10 documents
+        batch_size = min(args.batch_size, 10) if name in ("azure", "fake") else args.batch_size
+        documents = texts if name != "azure" else texts[:min(len(texts), 500)]
+        report = {"backend": name, **_accuracy(client, sample, batch_size)}
+        report["throughput"] = _throughput(client, documents, batch_size, concurrency=max(args.workers, 1))
+        reports.append(report)
+        if hasattr(client, "close"):
+            client.close()
+    print_report(reports)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Offline benchmark for micro-batched cognitive analysis.
+
+Compares one-text-per-call analysis (two sequential round-trips per text) against
+``MicroBatchAnalyzer`` at several concurrency levels, using ``FakeTextAnalyticsClient``.
+
+    python -m benchmarks.bench_batching --requests 500 --concurrency 1 10 100
+"""
+import argparse
+import asyncio
+import time
+
+from app.services.batching import MicroBatchAnalyzer
+from app.services.fakes import FakeTextAnalyticsClient
+from benchmarks.common import print_report, summarize
+
+SAMPLE_TEXTS = [
+    "Great app, love the new dashboard",
+    "The upload is slow and it crashes on large files",
+    "Works as expected",
+    "Terrible support experience, nobody answered",
+    "Nice design but the search is broken",
+]
+
+
+async def _unbatched(client, text):
+    await asyncio.to_thread(client.analyze_sentiment, [text])
+    await asyncio.to_thread(client.extract_key_phrases, [text])
+
+
+async def _run(mode, client, requests, concurrency, max_delay):
+    batcher = MicroBatchAnalyzer(client, max_delay=max_delay)
+    gate = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i):
+        text = SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)]
+        async with gate:
+            started = time.perf_counter()
+            if mode == "batched":
+                await batcher.analyze(text)
+            else:
+                await _unbatched(client, text)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Simulated service round-trip")
+    parser.add_argument("--max-delay-ms", type=float, default=20.0, help="Batching deadline")
+    args = parser.parse_args()
+
+    report = []
+    for concurrency in args.concurrency:
+        for mode in ("unbatched", "batched"):
+            client = FakeTextAnalyticsClient(latency=args.latency_ms / 1000)
+            result = asyncio.run(_run(mode, client, args.requests, concurrency, args.max_delay_ms / 1000))
+            result.update({"mode": mode, "concurrency": concurrency, "service_calls": client.calls})
+            report.append(result)
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Insert and select throughput of the old and the unified database engine.
+
+"before" is the engine the app used to create: default pool, ``echo=True`` (log
+output goes to /dev/null, but is still formatted) and SQLite defaults (rollback
+journal, synchronous=FULL). "after" is ``create_engine()`` from the data layer:
+echo off, configured pool, WAL mode with tuned pragmas and statement caching.
+Each engine gets its own throwaway SQLite file with the full app schema.
+
+    python -m benchmarks.bench_db --rows 2000 --concurrency 1 16
+"""
+import argparse
+import asyncio
+import datetime
+import logging
+import os
+import shutil
+import tempfile
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.feedback import Base, Feedback
+from app.services.db_async_sqlalchemy import create_engine, listing_columns
+from app.services.search_index import create_search_schema
+from benchmarks.common import print_report, summarize
+
+
+def _row(i: int):
+    return {
+        "name": f"user{i}",
+        "email": f"user{i % 100}@example.com",
+        "feedback_text": f"Feedback number {i} about the checkout page and the mobile app.",
+        "sentiment": ("positive", "neutral", "negative")[i % 3],
+        "score_positive": 0.6,
+        "score_neutral": 0.3,
+        "score_negative": 0.1,
+        "key_phrases": ["checkout page", "mobile app"],
+        "status": "complete",
+        "created_at": datetime.datetime.utcnow(),
+    }
+
+
+async def _timed(operations, concurrency: int):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(operation):
+        async with semaphore:
+            started = time.perf_counter()
+            await operation()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(run(operation) for operation in operations))
+    return summarize(latencies, time.perf_counter() - started)
+
+
+async def _bench_engine(label: str, engine, rows: int, concurrency: int):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(create_search_schema)
+    maker = sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    def insert(i: int):
+        async def operation():
+            async with maker() as session:
+                async with session.begin():
+                    session.add(Feedback(**_row(i)))
+        return operation
+
+    async def select_page():
+        stmt = select(*listing_columns()).order_by(Feedback.created_at.desc(), Feedback.id.desc()).limit(50)
+        async with maker() as session:
+            (await session.execute(stmt)).all()
+
+    report = {"engine": label, "concurrency": concurrency}
+    report["insert"] = await _timed([insert(i) for i in range(rows)], concurrency)
+    report["select_page"] = await _timed([select_page for _ in range(rows)], concurrency)
+    await engine.dispose()
+    return report
+
+
+async def _main(rows: int, concurrency_levels):
+    # Keep echo output off the terminal without skipping its formatting cost
+    devnull = open(os.devnull, "w")
+    logging.getLogger("sqlalchemy.engine.Engine").addHandler(logging.StreamHandler(devnull))
+    directory = tempfile.mkdtemp(prefix="bench-db-")
+    reports = []
+    try:
+        for concurrency in concurrency_levels:
+            before_url = f"sqlite+aiosqlite:///{directory}/before-{concurrency}.db"
+            after_url = f"sqlite+aiosqlite:///{directory}/after-{concurrency}.db"
+            reports.append(await _bench_engine("before", create_async_engine(before_url, echo=True), rows, concurrency))
+            reports.append(await _bench_engine("after", create_engine(after_url), rows, concurrency))
+    finally:
+        shutil.rmtree(directory)
+        devnull.close()
+    print_report(reports)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16])
+    args = parser.parse_args()
+    asyncio.run(_main(args.rows, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Memory, build time and query latency of the near-duplicate LSH index.
+
+Indexes ``--documents`` synthetic feedback texts, then queries it with
+near-duplicates of indexed texts (a few words changed) and with unrelated new
+texts. Reports index size, snapshot save/load time, per-query latency (signature
+plus candidate lookup; the database check of candidates is not included), the
+share of near-duplicates found and the average number of candidates returned
+for unrelated texts.
+
+    python -m benchmarks.bench_dedup --documents 1000000 --queries 2000
+"""
+import argparse
+import os
+import random
+import resource
+import tempfile
+import time
+from typing import List
+
+from app.services.dedup import LSHIndex, jaccard, shingle_hashes
+from benchmarks.common import percentile, print_report
+
+
+def _vocabulary(rng: random.Random, size: int = 20000) -> List[str]:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(3, 10))) for _ in range(size)]
+
+
+def _text(rng: random.Random, words: List[str]) -> str:
+    return " ".join(rng.choice(words) for _ in range(rng.randint(12, 60)))
+
+
+def _near_duplicate(rng: random.Random, text: str, words: List[str], changes: int) -> str:
+    tokens = text.split()
+    for _ in range(changes):
+        tokens[rng.randrange(len(tokens))] = rng.choice(words)
+    return " ".join(tokens)
+
+
+def _latencies_ms(index: LSHIndex, texts: List[str]) -> List[float]:
+    latencies = []
+    for text in texts:
+        started = time.perf_counter()
+        index.candidates(index.keys_for(text))
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=1000000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--num-perm", type=int, default=64)
+    parser.add_argument("--bands", type=int, default=8)
+    parser.add_argument("--changes", type=int, default=1, help="Words replaced in each near-duplicate query.")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    words = _vocabulary(rng)
+    index = LSHIndex(num_perm=args.num_perm, bands=args.bands)
+    # Texts are generated on the fly so only the sampled query sources stay in memory
+    sample_every = max(1, args.documents // args.queries)
+    sources = []
+    started = time.perf_counter()
+    for feedback_id in range(1, args.documents + 1):
+        text = _text(rng, words)
+        index.add(feedback_id, index.keys_for(text))
+        if feedback_id % sample_every == 0 and len(sources) < args.queries:
+            sources.append((feedback_id, text))
+    index.merge()
+    build_seconds = time.perf_counter() - started
+
+    snapshot_path = os.path.join(tempfile.mkdtemp(prefix="bench-dedup-"), "dedup.snapshot")
+    started = time.perf_counter()
+    index.save(snapshot_path, args.documents)
+    save_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    LSHIndex(num_perm=args.num_perm, bands=args.bands).load(snapshot_path)
+    load_seconds = time.perf_counter() - started
+
+    near = [_near_duplicate(rng, text, words, args.changes) for _, text in sources]
+    similarity = [jaccard(shingle_hashes(text), shingle_hashes(copy)) for (_, text), copy in zip(sources, near)]
+    found = sum(feedback_id in index.candidates(index.keys_for(copy)) for (feedback_id, _), copy in zip(sources, near))
+    unrelated = [_text(rng, words) for _ in range(len(sources))]
+    false_candidates = sum(len(index.candidates(index.keys_for(text))) for text in unrelated)
+    latencies = _latencies_ms(index, near) + _latencies_ms(index, unrelated)
+
+    print_report({
+        "documents": args.documents,
+        "num_perm": args.num_perm,
+        "bands": args.bands,
+        "build_seconds": round(build_seconds, 2),
+        "build_docs_per_second": round(args.documents / build_seconds),
+        "index_mb": round(index.nbytes / 2 ** 20, 1),
+        "index_bytes_per_document": round(index.nbytes / args.documents, 1),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "snapshot_mb": round(os.path.getsize(snapshot_path) / 2 ** 20, 1),
+        "snapshot_save_seconds": round(save_seconds, 3),
+        "snapshot_load_seconds": round(load_seconds, 3),
+        "queries": len(latencies),
+        "query_p50_ms": round(percentile(latencies, 50), 3),
+        "query_p95_ms": round(percentile(latencies, 95), 3),
+        "query_p99_ms": round(percentile(latencies, 99), 3),
+        "near_duplicate_median_similarity": round(percentile(similarity, 50), 3),
+        "near_duplicate_recall": round(found / len(sources), 3),
+        "unrelated_candidates_per_query": round(false_candidates / len(unrelated), 3),
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Fan-out of live dashboard events to many idle subscribers.
+
+Each subscriber is a task waiting on its queue, as an idle SSE connection does.
+Reports the time a publish takes (encoding plus copying into every queue), the
+latency until the last subscriber has received each event, and the memory per
+subscriber. ``--relay`` routes events through Redis pub/sub (fakeredis).
+
+    python -m benchmarks.bench_events --subscribers 1000 --events 200
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from app.services.events import EventHub
+from benchmarks.common import percentile, print_report
+
+PAYLOAD = {
+    "id": 1,
+    "name": "Ada",
+    "email": "ada@example.com",
+    "feedback_text": "The new dashboard loads quickly and the export works well.",
+    "sentiment": "positive",
+    "confidence_scores": {"positive": 0.93, "neutral": 0.05, "negative": 0.02},
+    "key_phrases": ["new dashboard", "export"],
+    "status": "complete",
+    "created_at": "2024-01-01T00:00:00",
+}
+
+
+async def _subscriber(hub: EventHub, events: int, received: list, ready: asyncio.Event, counter: list):
+    async with hub.subscription() as queue:
+        counter[0] += 1
+        if counter[0] == counter[1]:
+            ready.set()
+        for i in range(events):
+            await queue.get()
+            received[i] = time.perf_counter()
+
+
+async def _main(subscribers: int, events: int, interval: float, relay: bool):
+    hub = EventHub(queue_size=events + 1, max_subscribers=subscribers)
+    if relay:
+        import fakeredis
+        await hub.start_relay(fakeredis.aioredis.FakeRedis())
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    ready = asyncio.Event()
+    counter = [0, subscribers]
+    received = [[0.0] * events for _ in range(subscribers)]
+    tasks = [asyncio.create_task(_subscriber(hub, events, received[i], ready, counter)) for i in range(subscribers)]
+    await ready.wait()
+    per_subscriber = (tracemalloc.get_traced_memory()[0] - before) / subscribers
+    tracemalloc.stop()
+
+    publish_times, sent_at = [], []
+    for i in range(events):
+        started = time.perf_counter()
+        await hub.publish("feedback", {**PAYLOAD, "id": i})
+        publish_times.append(time.perf_counter() - started)
+        sent_at.append(started)
+        await asyncio.sleep(interval)
+    await asyncio.gather(*tasks)
+    await hub.stop_relay()
+
+    fanout = [max(received[s][i] for s in range(subscribers)) - sent_at[i] for i in range(events)]
+    print_report({
+        "subscribers": subscribers,
+        "events": events,
+        "relay": relay,
+        "memory_per_subscriber_kb": round(per_subscriber / 1024, 2),
+        "publish_p50_ms": round(percentile(publish_times, 50) * 1000, 3),
+        "publish_p99_ms": round(percentile(publish_times, 99) * 1000, 3),
+        "last_delivery_p50_ms": round(percentile(fanout, 50) * 1000, 3),
+        "last_delivery_p99_ms": round(percentile(fanout, 99) * 1000, 3),
+        "dropped": hub.dropped,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subscribers", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--interval-ms", type=float, default=5.0, help="Pause between publishes")
+    parser.add_argument("--relay", action="store_true", help="Relay events through (fake) Redis pub/sub")
+    args = parser.parse_args()
+    asyncio.run(_main(args.subscribers, args.events, args.interval_ms / 1000, args.relay))
+
+
+if __name__ == "__main__":
+    main()
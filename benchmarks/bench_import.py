@@ -0,0 +1,81 @@
+"""
+Throughput benchmark for the bulk import endpoint.
+
+Generates a synthetic JSONL (or CSV) file, uploads it to POST /api/feedbacks/import
+in-process with the fake text analytics client and a throwaway SQLite database,
+and reports rows per minute.
+
+    python -m benchmarks.bench_import --rows 20000 --format jsonl
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import os
+import tempfile
+import time
+
+_DB_DIR = tempfile.mkdtemp(prefix="bench-import-")
+os.environ["AZURE_SQL_CONN_STR"] = f"sqlite+aiosqlite:///{_DB_DIR}/bench.db"
+os.environ["TEXT_ANALYTICS_BACKEND"] = "fake"
+
+import httpx  # noqa: E402
+
+from app.api.endpoints import app  # noqa: E402
+from app.services.db_async_sqlalchemy import async_engine, dispose_engines, init_db  # noqa: E402
+from benchmarks.common import print_report  # noqa: E402
+
+WORDS = ["great", "slow", "love", "crash", "support", "dashboard", "upload", "search", "broken", "fast"]
+
+
+def _records(rows: int):
+    for i in range(rows):
+        text = " ".join(WORDS[(i * k) % len(WORDS)] for k in range(1, 8)) + f" #{i}"
+        yield {"name": f"user{i}", "email": f"user{i % 500}@example.com", "feedback_text": text}
+
+
+def _payload(rows: int, fmt: str) -> bytes:
+    buffer = io.StringIO()
+    if fmt == "csv":
+        writer = csv.DictWriter(buffer, fieldnames=["name", "email", "feedback_text"])
+        writer.writeheader()
+        writer.writerows(_records(rows))
+    else:
+        for record in _records(rows):
+            buffer.write(json.dumps(record) + "\n")
+    return buffer.getvalue().encode("utf-8")
+
+
+async def _main(args):
+    async_engine.echo = False
+    await init_db()
+    payload = _payload(args.rows, args.format)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        started = time.perf_counter()
+        response = await client.post("/api/feedbacks/import", files={"file": (f"feedback.{args.format}", payload)})
+        elapsed = time.perf_counter() - started
+    response.raise_for_status()
+    report = response.json()
+    await dispose_engines()
+    return {
+        "rows": args.rows,
+        "format": args.format,
+        "imported": report["imported"],
+        "failed": report["failed"],
+        "seconds": round(elapsed, 2),
+        "rows_per_minute": round(report["imported"] / elapsed * 60),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    args = parser.parse_args()
+    print_report(asyncio.run(_main(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Throughput of ``python -m app.serve`` from one to several worker processes.
+
+Seeds a throwaway SQLite database (fake analysis and storage backends, no Redis
+so the workers share the SQLite cache file), then for each worker count starts
+the launcher, waits for every worker to answer /ready and drives a fixed mix of
+requests from ``--clients`` load-generating processes:
+
+    submit   POST /submit with a unique text (--submit-ratio of the requests)
+    list     GET /api/feedbacks, some filtered by sentiment or with a text search
+
+Reports throughput and latency per worker count, overall and per operation, and
+the speed-up over the first count. Submissions from every worker go through the
+single SQLite writer, so a write-heavy mix stops scaling once that writer is
+busy; and the workers and clients need a CPU each for the numbers to mean much.
+
+    python -m benchmarks.bench_scaling --workers 1 2 4 --requests 4000 --concurrency 64
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List
+
+import httpx
+
+from benchmarks.bench_startup import _free_port, _stop_worker
+from benchmarks.common import print_report, summarize
+
+_WORDS = (
+    "checkout search dashboard export login editor upload mobile app support billing report "
+    "fast slow great broken confusing helpful crashes works laggy excellent okay fixed"
+).split()
+
+
+def _text(rng: random.Random) -> str:
+    return f"{' '.join(rng.choice(_WORDS) for _ in range(rng.randint(8, 30)))} #{rng.getrandbits(48):x}"
+
+
+def _environment(data_dir: str, args: argparse.Namespace) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update({
+        "AZURE_SQL_CONN_STR": f"sqlite+aiosqlite:///{data_dir}/scaling.db",
+        "TEXT_ANALYTICS_BACKEND": "fake",
+        "FAKE_ANALYTICS_LATENCY_MS": str(args.analysis_latency_ms),
+        "STORAGE_BACKEND": "local",
+        "LOCAL_STORAGE_DIR": os.path.join(data_dir, "uploads"),
+        "REDIS_URL": os.getenv("BENCH_REDIS_URL", "redis://127.0.0.1:1"),
+        "DATA_DIR": data_dir,
+        "PYTHONPATH": os.getcwd(),
+    })
+    return env
+
+
+def _seed(base_url: str, rows: int, seed: int) -> None:
+    rng = random.Random(seed)
+    lines = [
+        json.dumps({"name": f"user{i}", "email": f"user{i % 500}@example.com", "feedback_text": _text(rng)})
+        for i in range(rows)
+    ]
+    with httpx.Client(base_url=base_url, timeout=300) as client:
+        response = client.post("/api/feedbacks/import", files={"file": ("seed.jsonl", "\n".join(lines).encode())})
+        response.raise_for_status()
+
+
+def _start_server(env: Dict[str, str], workers: int) -> Dict[str, Any]:
+    port = _free_port()
+    command = [
+        sys.executable, "-m", "app.serve", "--workers", str(workers), "--port", str(port),
+        "--host", "127.0.0.1", "--log-level", "warning",
+    ]
+    return {
+        "port": port,
+        "process": subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL),
+    }
+
+
+def _wait_ready(server: Dict[str, Any], workers: int, timeout: float) -> None:
+    """
+    Wait until /ready has answered from ``workers`` distinct processes.
+    """
+    deadline = time.perf_counter() + timeout
+    pids = set()
+    with httpx.Client(base_url=f"http://127.0.0.1:{server['port']}", timeout=timeout) as client:
+        while len(pids) < workers:
+            try:
+                response = client.get("/ready", headers={"Connection": "close"})
+                if response.status_code == 200:
+                    pids.add(response.json()["startup"]["pid"])
+            except httpx.TransportError:
+                pass
+            if time.perf_counter() > deadline or server["process"].poll() is not None:
+                raise RuntimeError(f"Only {len(pids)} of {workers} workers became ready.")
+            time.sleep(0.02)
+
+
+async def _drive_async(base_url: str, requests: int, concurrency: int, submit_ratio: float, seed: int) -> Dict[str, List[float]]:
+    rng = random.Random(seed)
+    operations = ["submit" if rng.random() < submit_ratio else "list" for _ in range(requests)]
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors = 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60, limits=limits) as client:
+        async def request(operation: str) -> httpx.Response:
+            if operation == "submit":
+                form = {"name": "bench", "email": "bench@example.com", "feedback_text": _text(rng)}
+                return await client.post("/submit", data=form)
+            params: Dict[str, Any] = {"limit": 20}
+            choice = rng.random()
+            if choice < 0.3:
+                params["sentiment"] = rng.choice(["positive", "negative", "neutral"])
+            elif choice < 0.5:
+                return await client.get("/api/search", params={"q": rng.choice(_WORDS), "limit": 20})
+            return await client.get("/api/feedbacks", params=params)
+
+        async def worker(index: int) -> None:
+            nonlocal errors
+            for operation in operations[index::concurrency]:
+                started = time.perf_counter()
+                try:
+                    response = await request(operation)
+                    ok = response.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies[operation].append(time.perf_counter() - started)
+                else:
+                    errors += 1
+
+        await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    return {**latencies, "errors": [errors]}
+
+
+def _drive(base_url: str, requests: int, concurrency: int, submit_ratio: float, seed: int) -> Dict[str, List[float]]:
+    return asyncio.run(_drive_async(base_url, requests, concurrency, submit_ratio, seed))
+
+
+def _run_level(env: Dict[str, str], workers: int, args: argparse.Namespace) -> Dict[str, Any]:
+    server = _start_server(env, workers)
+    try:
+        _wait_ready(server, workers, args.timeout)
+        base_url = f"http://127.0.0.1:{server['port']}"
+        per_client = args.requests // args.clients
+        with ProcessPoolExecutor(args.clients) as pool:
+            started = time.perf_counter()
+            futures = [
+                pool.submit(_drive, base_url, per_client, max(1, args.concurrency // args.clients), args.submit_ratio, args.seed + workers * 100 + index)
+                for index in range(args.clients)
+            ]
+            results = [future.result() for future in futures]
+            elapsed = time.perf_counter() - started
+    finally:
+        _stop_worker(server)
+
+    by_operation: Dict[str, List[float]] = defaultdict(list)
+    errors = 0
+    for result in results:
+        errors += sum(result.pop("errors"))
+        for operation, values in result.items():
+            by_operation[operation] += values
+    return {
+        "workers": workers,
+        **summarize([value for values in by_operation.values() for value in values], elapsed),
+        "errors": errors,
+        "operations": {operation: summarize(values, elapsed) for operation, values in sorted(by_operation.items())},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=None, help="Worker counts (default: 1, 2, 4, ... up to the CPU count).")
+    parser.add_argument("--requests", type=int, default=4000, help="Requests per worker count.")
+    parser.add_argument("--concurrency", type=int, default=64, help="Requests in flight, across all clients.")
+    parser.add_argument("--clients", type=int, default=2, help="Load-generating processes.")
+    parser.add_argument("--submit-ratio", type=float, default=0.2)
+    parser.add_argument("--seed-rows", type=int, default=5000)
+    parser.add_argument("--analysis-latency-ms", type=float, default=50)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    counts = args.workers
+    if counts is None:
+        cpus = os.cpu_count() or 1
+        counts = sorted({min(2 ** power, cpus) for power in range(cpus.bit_length() + 1)})
+
+    env = _environment(tempfile.mkdtemp(prefix="bench-scaling-"), args)
+    subprocess.run([sys.executable, "-m", "app.cli", "init-db"], env=env, check=True, stderr=subprocess.DEVNULL)
+    seeder = _start_server(env, 1)
+    try:
+        _wait_ready(seeder, 1, args.timeout)
+        _seed(f"http://127.0.0.1:{seeder['port']}", args.seed_rows, args.seed)
+    finally:
+        _stop_worker(seeder)
+
+    levels = [_run_level(env, workers, args) for workers in counts]
+    base = levels[0]["throughput_rps"] or 1.0
+    for level in levels:
+        level["speedup"] = round(level["throughput_rps"] / base, 2)
+    print_report({
+        "cpus": os.cpu_count(),
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "submit_ratio": args.submit_ratio,
+        "analysis_latency_ms": args.analysis_latency_ms,
+        "levels": levels,
+    })
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Full-text search vs LIKE scan on a large SQLite feedback table.
+
+Seeds a throwaway database with synthetic feedback (the FTS index is populated by
+its triggers), then times ``search_feedbacks`` against an equivalent
+``feedback_text LIKE '%term%'`` query for a set of terms.
+
+    python -m benchmarks.bench_search --rows 1000000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+_DB_DIR = tempfile.mkdtemp(prefix="bench-search-")
+_DB_PATH = f"{_DB_DIR}/bench.db"
+os.environ["AZURE_SQL_CONN_STR"] = f"sqlite+aiosqlite:///{_DB_PATH}"
+
+from sqlalchemy import or_, select  # noqa: E402
+
+from app.models.feedback import Feedback  # noqa: E402
+from app.services.db_async_sqlalchemy import async_engine, async_session_maker, dispose_engines, init_db, listing_columns  # noqa: E402
+from app.services.search import search_feedbacks  # noqa: E402
+from benchmarks.common import percentile, print_report  # noqa: E402
+
+VOCABULARY = (
+    "app dashboard upload search login payment crash slow fast great love hate support "
+    "export import chart report email notification mobile desktop browser button screen "
+    "error timeout account password invoice refund feature request bug design update"
+).split()
+RARE_TERMS = ["kaleidoscope", "quokka", "zeppelin"]
+QUERIES = ["crash", "payment refund", "kaleidoscope", "quokka zeppelin", "dashboard export"]
+
+
+def _seed(rows: int, batch: int = 50000) -> None:
+    rng = random.Random(42)
+    conn = sqlite3.connect(_DB_PATH)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=OFF")
+    insert = (
+        "INSERT INTO feedbacks (name, email, feedback_text, sentiment, key_phrases, status, created_at) "
+        "VALUES (?, ?, ?, ?, ?, 'complete', datetime('now', ?))"
+    )
+    for start in range(0, rows, batch):
+        params = []
+        for i in range(start, min(start + batch, rows)):
+            words = rng.choices(VOCABULARY, k=12)
+            if rng.random() < 0.0005:
+                words.append(rng.choice(RARE_TERMS))
+            params.append((
+                f"user{i}", f"user{i % 1000}@example.com", " ".join(words),
+                rng.choice(["positive", "neutral", "negative"]), json.dumps(words[:3]), f"-{rows - i} seconds",
+            ))
+        conn.executemany(insert, params)
+        conn.commit()
+    conn.close()
+
+
+async def _like_search(query: str, limit: int):
+    terms = query.split()
+    stmt = (
+        select(*listing_columns())
+        .where(*[or_(Feedback.feedback_text.like(f"%{t}%"), Feedback.key_phrases.like(f"%{t}%")) for t in terms])
+        .order_by(Feedback.created_at.desc(), Feedback.id.desc())
+        .limit(limit)
+    )
+    async with async_session_maker() as session:
+        return (await session.execute(stmt)).all()
+
+
+async def _time(fn, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await fn()
+        timings.append(time.perf_counter() - started)
+    return {"p50_ms": round(percentile(timings, 50) * 1000, 2), "max_ms": round(max(timings) * 1000, 2)}
+
+
+async def _main(args):
+    async_engine.echo = False
+    await init_db()
+    started = time.perf_counter()
+    _seed(args.rows)
+    report = {"rows": args.rows, "seed_seconds": round(time.perf_counter() - started, 1), "queries": []}
+    for query in QUERIES:
+        report["queries"].append({
+            "query": query,
+            "fts": await _time(lambda: search_feedbacks(query=query, limit=args.limit), args.repeat),
+            "like": await _time(lambda: _like_search(query, args.limit), args.repeat),
+        })
+    await dispose_engines()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print_report(asyncio.run(_main(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Cold start of application workers.
+
+Launches ``uvicorn app.main:app`` in fresh processes (``--concurrent`` of them at
+a time, like a process manager starting its workers) against a throwaway SQLite
+database and the fake analysis/storage backends, and measures for each worker:
+
+    spawn_to_health_s   process spawn until GET /health answers
+    first_request_ms    latency of the first request to --path
+    import_s            module import time, as the worker reports it on /ready
+    startup_s           time spent in the startup hook
+    worker_first_ms     the first request as timed inside the worker
+
+``--import-only`` instead times ``import app.main`` in a bare interpreter.
+
+    python -m benchmarks.bench_startup --runs 5 --concurrent 4
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+import httpx
+
+from benchmarks.common import percentile, print_report
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _environment(data_dir: str) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update({
+        "AZURE_SQL_CONN_STR": f"sqlite+aiosqlite:///{data_dir}/startup.db",
+        "TEXT_ANALYTICS_BACKEND": "fake",
+        "STORAGE_BACKEND": "local",
+        "LOCAL_STORAGE_DIR": os.path.join(data_dir, "uploads"),
+        "DATA_DIR": data_dir,
+        "PYTHONPATH": os.getcwd(),
+    })
+    return env
+
+
+def _time_imports(env: Dict[str, str], runs: int) -> List[float]:
+    code = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+    return [float(subprocess.check_output([sys.executable, "-c", code], env=env, stderr=subprocess.DEVNULL)) for _ in range(runs)]
+
+
+def _start_worker(env: Dict[str, str]) -> Dict[str, Any]:
+    port = _free_port()
+    command = [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"]
+    return {
+        "port": port,
+        "spawned": time.perf_counter(),
+        "process": subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL),
+    }
+
+
+def _measure_worker(worker: Dict[str, Any], path: str, timeout: float) -> Dict[str, Any]:
+    base_url = f"http://127.0.0.1:{worker['port']}"
+    deadline = worker["spawned"] + timeout
+    with httpx.Client(base_url=base_url, timeout=timeout) as client:
+        while True:
+            try:
+                if client.get("/health").status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if time.perf_counter() > deadline or worker["process"].poll() is not None:
+                raise RuntimeError(f"Worker on port {worker['port']} did not come up.")
+            time.sleep(0.005)
+        healthy = time.perf_counter()
+        # /health was the worker's first request, so its own first-request timing covers that
+        started = time.perf_counter()
+        client.get(path).raise_for_status()
+        first_request = time.perf_counter() - started
+        timings = client.get("/ready").json()["startup"]
+    return {
+        "spawn_to_health_s": round(healthy - worker["spawned"], 3),
+        "first_request_ms": round(first_request * 1000, 2),
+        "import_s": round(timings["import_seconds"], 3),
+        "startup_s": round(timings["startup_seconds"], 3),
+        "worker_first_ms": round(timings["first_request_seconds"] * 1000, 2),
+    }
+
+
+def _stop_worker(worker: Dict[str, Any]) -> None:
+    worker["process"].terminate()
+    try:
+        worker["process"].wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        worker["process"].kill()
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    return {"p50": percentile(values, 50), "p95": percentile(values, 95), "max": max(values)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Rounds of worker starts.")
+    parser.add_argument("--concurrent", type=int, default=1, help="Workers started together in each round.")
+    parser.add_argument("--path", default="/api/feedbacks?limit=20", help="First request sent once a worker is up.")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--import-only", action="store_true", help="Only time `import app.main`.")
+    args = parser.parse_args()
+
+    env = _environment(tempfile.mkdtemp(prefix="bench-startup-"))
+    if args.import_only:
+        imports = _time_imports(env, args.runs)
+        print_report({"runs": args.runs, "import_s": _summary([round(value, 3) for value in imports])})
+        return
+
+    subprocess.run([sys.executable, "-m", "app.cli", "init-db"], env=env, check=True, stderr=subprocess.DEVNULL)
+    workers: List[Dict[str, Any]] = []
+    for _ in range(args.runs):
+        started = [_start_worker(env) for _ in range(args.concurrent)]
+        try:
+            workers += [_measure_worker(worker, args.path, args.timeout) for worker in started]
+        finally:
+            for worker in started:
+                _stop_worker(worker)
+
+    report = {
+        "runs": args.runs,
+        "concurrent": args.concurrent,
+        "path": args.path,
+        **{key: _summary([worker[key] for worker in workers]) for key in workers[0]},
+        "workers": workers,
+    }
+    print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Attachment upload memory and throughput with the local storage backend.
+
+Compares the old approach (read the whole upload into memory, wrap it in BytesIO)
+with streaming straight from the spooled temp file an ``UploadFile`` keeps, and
+reports peak Python heap use (tracemalloc) and MB/s for each.
+
+    python -m benchmarks.bench_storage --size-mb 64 --repeat 3
+"""
+import argparse
+import io
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from app.services.storage import LocalFileStorage
+from benchmarks.common import print_report
+
+# Starlette spools uploads to disk above this size
+SPOOL_MAX_SIZE = 1024 * 1024
+
+
+def _spooled_upload(size: int):
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    block = os.urandom(1024 * 1024)
+    written = 0
+    while written < size:
+        spool.write(block[:min(len(block), size - written)])
+        written += len(block)
+    spool.seek(0)
+    return spool
+
+
+def _run(mode: str, storage: LocalFileStorage, size: int, repeat: int):
+    peaks, elapsed = [], 0.0
+    for i in range(repeat):
+        spool = _spooled_upload(size)
+        tracemalloc.start()
+        started = time.perf_counter()
+        if mode == "buffered":
+            storage.upload(io.BytesIO(spool.read()), f"bench/{mode}-{i}.bin")
+        else:
+            storage.upload(spool, f"bench/{mode}-{i}.bin", length=size)
+        elapsed += time.perf_counter() - started
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        spool.close()
+    return {
+        "mode": mode,
+        "size_mb": size / 2**20,
+        "peak_heap_mb": round(max(peaks) / 2**20, 2),
+        "throughput_mb_s": round(size * repeat / 2**20 / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="bench-storage-")
+    storage = LocalFileStorage(root, "/static/uploads")
+    storage.ensure_container()
+    try:
+        size = args.size_mb * 2**20
+        print_report([_run(mode, storage, size, args.repeat) for mode in ("buffered", "streaming")])
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
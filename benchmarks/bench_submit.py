@@ -0,0 +1,74 @@
+"""
+Load benchmark for the /submit pipeline with stubbed backends.
+
+Drives the API app in-process (httpx ASGI transport) with the fake text analytics
+client, the fake blob storage backend that sleeps like a network call, and a throwaway
+SQLite database, and reports requests/sec per concurrency level.
+
+    python -m benchmarks.bench_submit --requests 300 --concurrency 1 10 100
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+_DB_DIR = tempfile.mkdtemp(prefix="bench-submit-")
+os.environ["AZURE_SQL_CONN_STR"] = f"sqlite+aiosqlite:///{_DB_DIR}/bench.db"
+os.environ["TEXT_ANALYTICS_BACKEND"] = "fake"
+os.environ["DATA_DIR"] = _DB_DIR
+
+import httpx  # noqa: E402
+
+from app.api.endpoints import app  # noqa: E402
+from app.services import storage  # noqa: E402
+from app.services.db_async_sqlalchemy import async_engine, dispose_engines, init_db  # noqa: E402
+from app.services.fakes import FakeBlobStorage  # noqa: E402
+from benchmarks.common import print_report, summarize  # noqa: E402
+
+
+async def _run(requests: int, concurrency: int, with_attachment: bool):
+    gate = asyncio.Semaphore(concurrency)
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one(i):
+            data = {"name": f"user{i}", "email": f"user{i}@example.com", "feedback_text": f"Great app number {i}"}
+            # Distinct content per request, or deduplication would skip all but the first upload
+            files = {"attachment": (f"log{i}.txt", f"{concurrency}-{i}\n".encode() + b"x" * 1024)} if with_attachment else None
+            async with gate:
+                started = time.perf_counter()
+                response = await client.post("/submit", data=data, files=files)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        return summarize(latencies, time.perf_counter() - started)
+
+
+async def _main(args):
+    async_engine.echo = False
+    await init_db()
+    storage.set_storage(FakeBlobStorage(latency=args.upload_latency_ms / 1000))
+    report = []
+    for concurrency in args.concurrency:
+        result = await _run(args.requests, concurrency, not args.no_attachment)
+        result["concurrency"] = concurrency
+        report.append(result)
+    await dispose_engines()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--upload-latency-ms", type=float, default=30.0)
+    parser.add_argument("--no-attachment", action="store_true")
+    args = parser.parse_args()
+    print_report(asyncio.run(_main(args)))
+
+
+if __name__ == "__main__":
+    main()
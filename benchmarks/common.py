@@ -0,0 +1,34 @@
+"""
+Shared helpers for the offline benchmark scripts.
+"""
+import json
+import math
+from typing import Any, Dict, List
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of ``values`` (``pct`` in 0-100).
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, Any]:
+    """
+    Summarize per-request latencies (seconds) for a run that took ``elapsed`` seconds.
+    """
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+
+
+def print_report(report: Any) -> None:
+    print(json.dumps(report, indent=2))
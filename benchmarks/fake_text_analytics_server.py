@@ -0,0 +1,159 @@
+"""
+Local stand-in for the Azure Text Analytics v3.1 REST API, with injectable
+latency, errors and throttling.
+
+Serves ``/text/analytics/v3.1/sentiment`` and ``/text/analytics/v3.1/keyPhrases``
+(scored by the local analyzer), so the real SDK client can be pointed at it:
+
+    python -m benchmarks.fake_text_analytics_server --port 5005 --error-rate 0.2
+
+    AZURE_ENDPOINT=http://127.0.0.1:5005 AZURE_KEY=fake \\
+    AZURE_TEXT_ANALYTICS_API_VERSION=v3.1 uvicorn app.main:app
+
+Failures are 503s (``--error-rate``) and 429s with a Retry-After header
+(``--throttle-rate``). Settings can be changed while it runs, e.g. to simulate an
+outage and its recovery:
+
+    curl -X POST localhost:5005/_control -H 'Content-Type: application/json' \\
+         -d '{"error_rate": 1.0}'
+
+``GET /_control`` returns the current settings and request counters.
+"""
+import argparse
+import asyncio
+import random
+from typing import Any, Dict, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.services.local_analyzer import extract_phrases, score_sentiment
+
+# The service's per-request document limit
+MAX_DOCUMENTS = 10
+
+settings: Dict[str, float] = {
+    "latency_ms": 50.0,
+    "jitter_ms": 0.0,
+    "error_rate": 0.0,
+    "throttle_rate": 0.0,
+    "retry_after": 1.0,
+}
+counters: Dict[str, int] = {"requests": 0, "documents": 0, "errors": 0, "throttled": 0}
+
+app = FastAPI()
+
+
+def _error(status_code: int, code: str, message: str, headers: Optional[Dict[str, str]] = None) -> JSONResponse:
+    return JSONResponse(status_code=status_code, content={"error": {"code": code, "message": message}}, headers=headers)
+
+
+async def _simulate(documents: List[Dict[str, Any]]) -> Optional[JSONResponse]:
+    """
+    Apply the configured latency and failures; returns an error response or None.
+    """
+    counters["requests"] += 1
+    counters["documents"] += len(documents)
+    delay = settings["latency_ms"] + random.uniform(0, settings["jitter_ms"])
+    await asyncio.sleep(delay / 1000)
+    if len(documents) > MAX_DOCUMENTS:
+        return _error(400, "InvalidDocumentBatch", f"Batch request contains too many records. Max {MAX_DOCUMENTS} records are permitted.")
+    roll = random.random()
+    if roll < settings["throttle_rate"]:
+        counters["throttled"] += 1
+        return _error(
+            429, "429", "Rate limit is exceeded.", headers={"Retry-After": f"{settings['retry_after']:g}"}
+        )
+    if roll < settings["throttle_rate"] + settings["error_rate"]:
+        counters["errors"] += 1
+        return _error(503, "ServiceUnavailable", "The service is temporarily unavailable.")
+    return None
+
+
+def _sentiment_document(document: Dict[str, Any]) -> Dict[str, Any]:
+    text = document.get("text", "")
+    label, (positive, neutral, negative) = score_sentiment(text)
+    scores = {"positive": positive, "neutral": neutral, "negative": negative}
+    return {
+        "id": document["id"],
+        "sentiment": label,
+        "confidenceScores": scores,
+        "sentences": [{
+            # Sentence labels do not include "mixed"
+            "sentiment": label if label != "mixed" else "neutral",
+            "confidenceScores": scores,
+            "offset": 0,
+            "length": len(text),
+            "text": text,
+        }],
+        "warnings": [],
+    }
+
+
+@app.post("/text/analytics/v3.1/sentiment")
+async def sentiment(request: Request):
+    documents = (await request.json()).get("documents", [])
+    error = await _simulate(documents)
+    if error is not None:
+        return error
+    return {
+        "documents": [_sentiment_document(document) for document in documents],
+        "errors": [],
+        "modelVersion": "local",
+    }
+
+
+@app.post("/text/analytics/v3.1/keyPhrases")
+async def key_phrases(request: Request):
+    documents = (await request.json()).get("documents", [])
+    error = await _simulate(documents)
+    if error is not None:
+        return error
+    return {
+        "documents": [
+            {"id": document["id"], "keyPhrases": extract_phrases(document.get("text", "")), "warnings": []}
+            for document in documents
+        ],
+        "errors": [],
+        "modelVersion": "local",
+    }
+
+
+@app.get("/_control")
+async def get_control():
+    return {"settings": settings, "counters": counters}
+
+
+@app.post("/_control")
+async def set_control(request: Request):
+    changes = await request.json()
+    unknown = set(changes) - set(settings)
+    if unknown:
+        return _error(400, "UnknownSetting", f"Unknown settings: {', '.join(sorted(unknown))}")
+    settings.update({key: float(value) for key, value in changes.items()})
+    return {"settings": settings, "counters": counters}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5005)
+    parser.add_argument("--latency-ms", type=float, default=settings["latency_ms"])
+    parser.add_argument("--jitter-ms", type=float, default=settings["jitter_ms"])
+    parser.add_argument("--error-rate", type=float, default=settings["error_rate"])
+    parser.add_argument("--throttle-rate", type=float, default=settings["throttle_rate"])
+    parser.add_argument("--retry-after", type=float, default=settings["retry_after"])
+    args = parser.parse_args()
+    settings.update(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""
+Load test of the whole application with stubbed backends.
+
+Starts ``app.main`` in-process (httpx ASGI transport, startup and shutdown hooks
+included) on a throwaway SQLite database, with the fake text analytics client and
+a fake blob store, seeds it, and replays a weighted mix of operations at each
+concurrency level:
+
+    submit     POST /submit (form post; --attachment-ratio of them with a file)
+    list       GET /api/feedbacks, sometimes filtered or followed to the next page
+    dashboard  GET /dashboard, then GET /api/stats as the page's script does
+    export     GET /api/feedbacks/export, streamed to the end
+
+Texts come from the repository's requests.jsonl (``--source requests``) or a
+synthetic generator (``--source synthetic``). Everything random derives from
+``--seed``, so runs are repeatable. The JSON report has throughput and p50/p95/p99
+latency per level and per operation; ``--compare`` checks it against an earlier
+report and exits non-zero on regressions.
+
+    python -m benchmarks.loadtest --concurrency 1 10 50 --requests 500 --output base.json
+    python -m benchmarks.loadtest --concurrency 1 10 50 --requests 500 --compare base.json
+"""
+import argparse
+import asyncio
+import datetime
+import io
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Tuple
+
+_DATA_DIR = tempfile.mkdtemp(prefix="loadtest-")
+os.environ["AZURE_SQL_CONN_STR"] = f"sqlite+aiosqlite:///{_DATA_DIR}/loadtest.db"
+os.environ["TEXT_ANALYTICS_BACKEND"] = "fake"
+os.environ["STORAGE_BACKEND"] = "local"
+os.environ["LOCAL_STORAGE_DIR"] = os.path.join(_DATA_DIR, "uploads")
+os.environ["DATA_DIR"] = _DATA_DIR
+
+import httpx  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.services import cognitive, storage  # noqa: E402
+from app.services.bulk_import import import_feedbacks  # noqa: E402
+from app.services.db_async_sqlalchemy import init_db  # noqa: E402
+from app.services.fakes import FakeBlobStorage, FakeTextAnalyticsClient  # noqa: E402
+from benchmarks.common import print_report, summarize  # noqa: E402
+
+OPERATIONS = ("submit", "list", "dashboard", "export")
+DEFAULT_MIX = "submit=30,list=45,dashboard=20,export=5"
+REQUESTS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "requests.jsonl")
+
+_SUBJECTS = ["The dashboard", "Checkout", "The mobile app", "Search", "The export", "Support", "Login", "The new editor"]
+_OPINIONS = [
+    "is great and really fast", "works well most of the time", "is slow and crashes on large files",
+    "is confusing but the docs helped", "is broken since the last update", "is excellent, I love it",
+    "feels laggy on older phones", "was fixed quickly, thanks", "is okay", "keeps logging me out",
+]
+_DETAILS = [
+    "I use it every day.", "Please add dark mode.", "Tested on Firefox and Chrome.", "Our whole team noticed.",
+    "It took a while to figure out.", "Would recommend to others.", "Not sure if this is expected.", "",
+]
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """
+    Parse ``op=weight,...`` into operation weights.
+    """
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Unknown operation {name!r}; expected one of {', '.join(OPERATIONS)}.")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def requests_texts(path: str = REQUESTS_FILE) -> List[str]:
+    with open(path, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return [f"{record['title']}. {record['body']}" for record in records]
+
+
+def synthetic_texts(count: int, rng: random.Random) -> List[str]:
+    return [
+        f"{rng.choice(_SUBJECTS)} {rng.choice(_OPINIONS)}. {rng.choice(_DETAILS)} (build {rng.randint(1, 500)})".replace("  ", " ")
+        for _ in range(count)
+    ]
+
+
+class Workload:
+    """
+    Texts and the deterministic operation sequence replayed at one concurrency level.
+    """
+
+    def __init__(self, texts: List[str], mix: Dict[str, float], attachment_ratio: float, seed: int):
+        self.texts = texts
+        self.mix = mix
+        self.attachment_ratio = attachment_ratio
+        self.seed = seed
+
+    def operations(self, count: int, level: int) -> List[str]:
+        rng = random.Random(f"{self.seed}-{level}")
+        return rng.choices(list(self.mix), weights=list(self.mix.values()), k=count)
+
+    def text(self, rng: random.Random, number: int) -> str:
+        # A distinct suffix keeps the analysis cache from absorbing repeated texts
+        return f"{rng.choice(self.texts)} #{number}"
+
+
+async def _submit(client: httpx.AsyncClient, workload: Workload, rng: random.Random, number: int) -> httpx.Response:
+    data = {"name": f"User {number}", "email": f"user{number}@example.com", "feedback_text": workload.text(rng, number)}
+    files = None
+    if rng.random() < workload.attachment_ratio:
+        files = {"attachment": (f"log-{number}.txt", f"attachment {number}\n".encode() * 200)}
+    return await client.post("/submit", data=data, files=files)
+
+
+async def _list(client: httpx.AsyncClient, workload: Workload, rng: random.Random, number: int) -> httpx.Response:
+    params = {"limit": 50}
+    if rng.random() < 0.3:
+        params["sentiment"] = rng.choice(["positive", "neutral", "negative"])
+    response = await client.get("/api/feedbacks", params=params)
+    if response.status_code == 200 and rng.random() < 0.5 and response.json().get("next_cursor"):
+        response = await client.get("/api/feedbacks", params={**params, "cursor": response.json()["next_cursor"]})
+    return response
+
+
+async def _dashboard(client: httpx.AsyncClient, workload: Workload, rng: random.Random, number: int) -> httpx.Response:
+    response = await client.get("/dashboard")
+    if response.status_code == 200:
+        response = await client.get("/api/stats", params={"series": "day"})
+    return response
+
+
+async def _export(client: httpx.AsyncClient, workload: Workload, rng: random.Random, number: int) -> httpx.Response:
+    async with client.stream("GET", "/api/feedbacks/export", params={"format": "ndjson"}) as response:
+        async for _ in response.aiter_bytes():
+            pass
+    return response
+
+
+_HANDLERS = {"submit": _submit, "list": _list, "dashboard": _dashboard, "export": _export}
+
+
+async def _seed(rows: int, texts: List[str], seed: int) -> int:
+    """
+    Bulk-import ``rows`` feedback records spread over the last 90 days.
+    """
+    rng = random.Random(f"{seed}-seed")
+    now = datetime.datetime.utcnow()
+    lines = [
+        json.dumps({
+            "name": f"Seed {i}",
+            "email": f"seed{i}@example.com",
+            "feedback_text": f"{rng.choice(texts)} #seed{i}",
+            "created_at": (now - datetime.timedelta(minutes=rng.randint(0, 90 * 24 * 60))).isoformat(),
+        })
+        for i in range(rows)
+    ]
+    report = await import_feedbacks(io.BytesIO("\n".join(lines).encode()), fmt="jsonl")
+    return report["imported"]
+
+
+async def _run_level(client: httpx.AsyncClient, workload: Workload, requests: int, concurrency: int, first_number: int) -> Dict[str, Any]:
+    operations = workload.operations(requests, concurrency)
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    position = iter(range(requests))
+
+    async def worker(index: int) -> None:
+        rng = random.Random(f"{workload.seed}-{concurrency}-{index}")
+        for i in position:
+            name = operations[i]
+            started = time.perf_counter()
+            try:
+                response = await _HANDLERS[name](client, workload, rng, first_number + i)
+                failed = response.status_code >= 400
+            except Exception:
+                failed = True
+            latencies[name].append(time.perf_counter() - started)
+            errors[name] += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    everything = [latency for values in latencies.values() for latency in values]
+    return {
+        "concurrency": concurrency,
+        **summarize(everything, elapsed),
+        "errors": sum(errors.values()),
+        "operations": {
+            name: {**summarize(latencies[name], elapsed), "errors": errors[name]}
+            for name in OPERATIONS if name in latencies
+        },
+    }
+
+
+async def _main(args) -> Dict[str, Any]:
+    if args.source == "requests":
+        texts = requests_texts(args.requests_file)
+    else:
+        texts = synthetic_texts(1000, random.Random(f"{args.seed}-texts"))
+    workload = Workload(texts, args.mix, args.attachment_ratio, args.seed)
+
+    analyzer = FakeTextAnalyticsClient(latency=args.analysis_latency_ms / 1000)
+    blobs = FakeBlobStorage(latency=args.upload_latency_ms / 1000)
+    storage.set_storage(blobs)
+    report: Dict[str, Any] = {
+        "config": {
+            "source": args.source,
+            "mix": args.mix,
+            "seed": args.seed,
+            "seed_rows": args.seed_rows,
+            "requests_per_level": args.requests,
+            "analysis_latency_ms": args.analysis_latency_ms,
+            "upload_latency_ms": args.upload_latency_ms,
+            "attachment_ratio": args.attachment_ratio,
+        },
+        "levels": [],
+    }
+    # The app no longer creates the schema at startup (see `python -m app.cli init-db`)
+    await init_db()
+    async with app.router.lifespan_context(app):
+        # Seeding is not measured, so it runs without the simulated analysis latency
+        cognitive.set_client(FakeTextAnalyticsClient(latency=0))
+        report["config"]["seeded"] = await _seed(args.seed_rows, texts, args.seed)
+        cognitive.set_client(analyzer)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=None) as client:
+            if args.warmup:
+                await _run_level(client, workload, args.warmup, 1, first_number=-args.warmup)
+            for index, concurrency in enumerate(args.concurrency):
+                level = await _run_level(client, workload, args.requests, concurrency, first_number=index * args.requests)
+                report["levels"].append(level)
+                print(f"concurrency {concurrency}: {level['throughput_rps']} req/s, p95 {level['p95_ms']} ms", file=sys.stderr)
+    report["backends"] = {"analysis_calls": analyzer.calls, "uploads": blobs.uploads}
+    return report
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float, min_delta_ms: float = 5.0) -> List[str]:
+    """
+    Regressions of ``report`` against ``baseline``: p95 latency more than
+    ``threshold`` (a fraction) and ``min_delta_ms`` higher, or throughput more than
+    ``threshold`` lower, for each concurrency level and operation present in both.
+    """
+    regressions = []
+    base_levels = {level["concurrency"]: level for level in baseline.get("levels", [])}
+    for level in report["levels"]:
+        base = base_levels.get(level["concurrency"])
+        if base is None:
+            continue
+        pairs: List[Tuple[str, Dict[str, Any], Dict[str, Any]]] = [("all", level, base)]
+        pairs += [
+            (name, stats, base["operations"][name])
+            for name, stats in level["operations"].items() if name in base.get("operations", {})
+        ]
+        for name, current, previous in pairs:
+            where = f"concurrency {level['concurrency']} {name}"
+            slower = current["p95_ms"] - previous["p95_ms"]
+            if slower > min_delta_ms and current["p95_ms"] > previous["p95_ms"] * (1 + threshold):
+                regressions.append(f"{where}: p95 {previous['p95_ms']} -> {current['p95_ms']} ms")
+            if name == "all" and current["throughput_rps"] < previous["throughput_rps"] * (1 - threshold):
+                regressions.append(f"{where}: throughput {previous['throughput_rps']} -> {current['throughput_rps']} req/s")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--requests", type=int, default=500, help="Requests per concurrency level")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX), help=f"Operation weights (default {DEFAULT_MIX})")
+    parser.add_argument("--source", choices=["requests", "synthetic"], default="synthetic")
+    parser.add_argument("--requests-file", default=REQUESTS_FILE)
+    parser.add_argument("--seed-rows", type=int, default=2000, help="Rows imported before the run")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests before the first level")
+    parser.add_argument("--analysis-latency-ms", type=float, default=50.0)
+    parser.add_argument("--upload-latency-ms", type=float, default=30.0)
+    parser.add_argument("--attachment-ratio", type=float, default=0.2)
+    parser.add_argument("--output", help="Also write the report to this file")
+    parser.add_argument("--compare", help="Earlier report to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Tolerated regression (fraction)")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="Ignore p95 increases smaller than this")
+    args = parser.parse_args()
+
+    # The app logs every request at INFO; keep the report readable
+    logging.getLogger().setLevel(logging.WARNING)
+    report = asyncio.run(_main(args))
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.threshold, args.min_delta_ms)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
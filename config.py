@@ -3,8 +3,147 @@ import os
 class Config:
     # Use an async-supported connection string (here using SQLite for example)
     AZURE_SQL_CONN_STR = os.getenv("AZURE_SQL_CONN_STR", "sqlite+aiosqlite:///./test.db")
+    # Directory for local state files (index snapshots, shared cache, lock files)
+    DATA_DIR = os.getenv("DATA_DIR", "data")
+    # Web worker processes started by `python -m app.serve` (0 = one per CPU); each
+    # worker takes its share of the ANALYSIS_* rate and concurrency limits
+    WEB_WORKERS = int(os.getenv("WEB_WORKERS", "0"))
+    # Create and upgrade the schema at startup; otherwise run `python -m app.cli init-db`
+    AUTO_CREATE_SCHEMA = os.getenv("AUTO_CREATE_SCHEMA", "false").lower() == "true"
+    # Seconds each /ready dependency check may take before it counts as failed
+    READY_CHECK_TIMEOUT = float(os.getenv("READY_CHECK_TIMEOUT", "2.0"))
+    # Connection pool of the async engine (ignored for in-memory SQLite)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    # Log every SQL statement (slow; for debugging only)
+    DB_ECHO = os.getenv("DB_ECHO", "false").lower() == "true"
+    # Compiled SQL cache entries per engine, and prepared statements cached per SQLite connection
+    DB_QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", "1200"))
+    DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "256"))
+    # SQLite: milliseconds a writer waits for a lock, and the WAL-mode sync level
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    # Funnel SQLite writes through one connection per process, each transaction
+    # taking the write lock with BEGIN IMMEDIATE (see db_async_sqlalchemy.py)
+    SQLITE_SERIALIZE_WRITES = os.getenv("SQLITE_SERIALIZE_WRITES", "true").lower() == "true"
+    # Seconds a write may wait for the write connection before failing
+    DB_WRITE_TIMEOUT = float(os.getenv("DB_WRITE_TIMEOUT", "30"))
     AZURE_ENDPOINT = os.getenv("AZURE_ENDPOINT", "https://<your-resource-name>.cognitiveservices.azure.com/")
     AZURE_KEY = os.getenv("AZURE_KEY", "your_azure_key")
     BLOB_CONN_STRING = os.getenv("BLOB_CONN_STRING", "your_blob_conn_string")
+    BLOB_CONTAINER_NAME = os.getenv("BLOB_CONTAINER_NAME", "feedback-uploads")
+    # Parallel block uploads for attachments larger than one block
+    BLOB_UPLOAD_CONCURRENCY = int(os.getenv("BLOB_UPLOAD_CONCURRENCY", "4"))
+    BLOB_BLOCK_SIZE = int(os.getenv("BLOB_BLOCK_SIZE", str(4 * 1024 * 1024)))
+    # Attachment storage: "azure" (Blob Storage) or "local" (filesystem, served under /static)
+    STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "azure")
+    LOCAL_STORAGE_DIR = os.getenv("LOCAL_STORAGE_DIR", "static/uploads")
+    LOCAL_STORAGE_URL = os.getenv("LOCAL_STORAGE_URL", "/static/uploads")
+
+    # Text analytics client: "azure" for the real service, "local" for the in-process
+    # CPU analyzer (lexicon sentiment + RAKE key phrases), "fake" for offline runs
+    TEXT_ANALYTICS_BACKEND = os.getenv("TEXT_ANALYTICS_BACKEND", "azure")
+    # Worker processes of the local analyzer (0 scores in the calling thread)
+    LOCAL_ANALYZER_WORKERS = int(os.getenv("LOCAL_ANALYZER_WORKERS", str(os.cpu_count() or 1)))
+    LOCAL_ANALYZER_MAX_PHRASES = int(os.getenv("LOCAL_ANALYZER_MAX_PHRASES", "10"))
+    FAKE_ANALYTICS_LATENCY_MS = float(os.getenv("FAKE_ANALYTICS_LATENCY_MS", "50"))
+    # Micro-batching: the service accepts at most 10 documents per sentiment/key-phrase call
+    ANALYSIS_MAX_BATCH_SIZE = int(os.getenv("ANALYSIS_MAX_BATCH_SIZE", "10"))
+    ANALYSIS_MAX_BATCH_DELAY_MS = float(os.getenv("ANALYSIS_MAX_BATCH_DELAY_MS", "20"))
+    # Protection of the analysis service: concurrent calls, calls per second
+    # (0 = unlimited) with bursts up to ANALYSIS_RATE_BURST, retries of throttled
+    # and transient failures with jittered exponential backoff, and the per-call timeout
+    ANALYSIS_MAX_CONCURRENCY = int(os.getenv("ANALYSIS_MAX_CONCURRENCY", "8"))
+    ANALYSIS_RATE_LIMIT = float(os.getenv("ANALYSIS_RATE_LIMIT", "0"))
+    ANALYSIS_RATE_BURST = float(os.getenv("ANALYSIS_RATE_BURST", "10"))
+    ANALYSIS_RETRIES = int(os.getenv("ANALYSIS_RETRIES", "3"))
+    ANALYSIS_BACKOFF_BASE = float(os.getenv("ANALYSIS_BACKOFF_BASE", "0.5"))
+    ANALYSIS_BACKOFF_MAX = float(os.getenv("ANALYSIS_BACKOFF_MAX", "10"))
+    ANALYSIS_TIMEOUT = float(os.getenv("ANALYSIS_TIMEOUT", "10"))
+    # Consecutive failed calls that open the circuit, and seconds before a trial call
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+    CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+    # While analysis is unavailable, save submissions as pending for background
+    # enrichment instead of failing them
+    ANALYSIS_DEGRADED_MODE = os.getenv("ANALYSIS_DEGRADED_MODE", "true").lower() == "true"
+    # Azure SDK's own retries; the wrapper above retries, so the SDK's are off by default
+    AZURE_SDK_RETRIES = int(os.getenv("AZURE_SDK_RETRIES", "0"))
+    # Text Analytics API version (empty for the SDK default; "v3.1" for the fake server)
+    AZURE_TEXT_ANALYTICS_API_VERSION = os.getenv("AZURE_TEXT_ANALYTICS_API_VERSION", "")
+    # Analysis cache keyed on normalized text: in-process LRU (size 0 disables it)
+    # backed by Redis (TTL 0 disables the Redis tier); TTLs are in seconds
+    ANALYSIS_CACHE_SIZE = int(os.getenv("ANALYSIS_CACHE_SIZE", "10000"))
+    ANALYSIS_CACHE_TTL = float(os.getenv("ANALYSIS_CACHE_TTL", "3600"))
+    ANALYSIS_CACHE_REDIS_TTL = int(os.getenv("ANALYSIS_CACHE_REDIS_TTL", "86400"))
+    # Rows per validated/analyzed/inserted batch in bulk imports
+    IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+    # Seconds /api/stats responses are cached for
+    STATS_CACHE_TTL = int(os.getenv("STATS_CACHE_TTL", "5"))
+    # Response cache for the read endpoints: Redis when reachable, else in-process
+    # (entries bounded by RESPONSE_CACHE_SIZE). Writes invalidate entries by tag.
+    REDIS_URL = os.getenv("REDIS_URL", "redis://localhost")
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "60"))
+    RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1000"))
+    # Seconds a cache miss holds the recompute lock (and others wait for it)
+    CACHE_LOCK_TIMEOUT = int(os.getenv("CACHE_LOCK_TIMEOUT", "5"))
+    # Without Redis: "memory" keeps a cache per process, "sqlite" shares one
+    # between the workers of a host in the CACHE_SQLITE_PATH file
+    CACHE_FALLBACK = os.getenv("CACHE_FALLBACK", "memory")
+    CACHE_SQLITE_PATH = os.getenv("CACHE_SQLITE_PATH", os.path.join(DATA_DIR, "cache.sqlite"))
+    # Live dashboard events (/api/events): frames buffered per subscriber, subscriber
+    # limit, keep-alive interval in seconds, and the Redis channel relaying events
+    # between workers (used when Redis is connected)
+    EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "100"))
+    EVENTS_MAX_SUBSCRIBERS = int(os.getenv("EVENTS_MAX_SUBSCRIBERS", "5000"))
+    EVENTS_KEEPALIVE = float(os.getenv("EVENTS_KEEPALIVE", "15"))
+    EVENTS_REDIS_CHANNEL = os.getenv("EVENTS_REDIS_CHANNEL", "feedback-events")
+    # Prometheus metrics on /metrics (needs prometheus_client)
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    # Seconds between updates of each worker's stats gauges when several workers
+    # share metrics through PROMETHEUS_MULTIPROC_DIR (set by `python -m app.serve`)
+    METRICS_PUBLISH_INTERVAL = float(os.getenv("METRICS_PUBLISH_INTERVAL", "10"))
+    # Size of the thread pool that runs blocking SDK calls off the event loop
+    BLOCKING_IO_WORKERS = int(os.getenv("BLOCKING_IO_WORKERS", "16"))
+    # Ingestion: "sync" analyzes inline on /submit, "queue" saves the raw feedback
+    # and enriches it with background workers (which also run in "sync" mode when
+    # ANALYSIS_DEGRADED_MODE is on, to catch up on deferred submissions)
+    INGESTION_MODE = os.getenv("INGESTION_MODE", "sync")
+    INGESTION_QUEUE_SIZE = int(os.getenv("INGESTION_QUEUE_SIZE", "1000"))
+    INGESTION_WORKERS = int(os.getenv("INGESTION_WORKERS", "4"))
+    INGESTION_MAX_ATTEMPTS = int(os.getenv("INGESTION_MAX_ATTEMPTS", "3"))
+    INGESTION_RETRY_DELAY = float(os.getenv("INGESTION_RETRY_DELAY", "1.0"))
+    # Seconds a worker's claim on a pending record lasts, and between scans for
+    # unclaimed pending records (left by restarts or other worker processes)
+    INGESTION_LEASE_SECONDS = float(os.getenv("INGESTION_LEASE_SECONDS", "300"))
+    INGESTION_RECOVERY_INTERVAL = float(os.getenv("INGESTION_RECOVERY_INTERVAL", "60"))
+    # Retention: feedback older than RETENTION_DAYS is moved to the archive table
+    # (0 disables it), in batches of RETENTION_BATCH_SIZE with a short pause between
+    # batches, every RETENTION_INTERVAL seconds
+    RETENTION_DAYS = int(os.getenv("RETENTION_DAYS", "0"))
+    RETENTION_BATCH_SIZE = int(os.getenv("RETENTION_BATCH_SIZE", "500"))
+    RETENTION_INTERVAL = float(os.getenv("RETENTION_INTERVAL", "3600"))
+    RETENTION_BATCH_PAUSE = float(os.getenv("RETENTION_BATCH_PAUSE", "0.05"))
+    # Optional directory for monthly gzipped JSON-lines copies of archived rows
+    ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "")
+    # Lock file electing the one worker process per host that runs retention ("" disables)
+    RETENTION_LOCK_PATH = os.getenv("RETENTION_LOCK_PATH", os.path.join(DATA_DIR, "retention.lock"))
+    # Near-duplicate submissions: "flag" stores them with duplicate_of set and the
+    # original's analysis, "collapse" returns the original without storing (unless
+    # there is an attachment; then it is flagged), "off" disables the check. Texts
+    # shorter than DEDUP_MIN_CHARS are never duplicates.
+    DEDUP_MODE = os.getenv("DEDUP_MODE", "flag")
+    DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.85"))
+    DEDUP_MIN_CHARS = int(os.getenv("DEDUP_MIN_CHARS", "30"))
+    # MinHash signature size and LSH bands; changing them rebuilds the index
+    DEDUP_NUM_PERM = int(os.getenv("DEDUP_NUM_PERM", "64"))
+    DEDUP_BANDS = int(os.getenv("DEDUP_BANDS", "8"))
+    # Most candidates checked per lookup (those sharing most LSH bands)
+    DEDUP_MAX_CANDIDATES = int(os.getenv("DEDUP_MAX_CANDIDATES", "50"))
+    # Snapshot of the index, loaded at startup so only newer rows are re-indexed ("" disables)
+    DEDUP_SNAPSHOT_PATH = os.getenv("DEDUP_SNAPSHOT_PATH", os.path.join(DATA_DIR, "dedup.snapshot"))
+    # Seconds between scans for rows stored by other workers or bulk imports
+    DEDUP_REFRESH_INTERVAL = float(os.getenv("DEDUP_REFRESH_INTERVAL", "30"))
 
 config = Config()
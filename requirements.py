@@ -2,8 +2,13 @@ fastapi
 uvicorn
 sqlalchemy
 aiosqlite
-databases
 pydantic
+email-validator
 azure-ai-textanalytics
 azure-storage-blob
 python-dotenv
+greenlet
+python-multipart
+httpx
+redis
+prometheus_client
@@ -1,52 +1,149 @@
-window.addEventListener('load', async () => {
-    try {
-        // Fetch feedback data from API endpoint
-        const response = await fetch('/api/feedbacks');
-        const data = await response.json();
-        
-        // Populate the feedback table
-        const tbody = document.getElementById('feedbackTableBody');
-        data.forEach(fb => {
-            const row = document.createElement('tr');
-            row.innerHTML = `
-                <td>${fb.id}</td>
-                <td>${fb.name}</td>
-                <td>${fb.email}</td>
-                <td>${fb.feedback_text}</td>
-                <td>${fb.sentiment}</td>
-                <td>${fb.created_at}</td>
-            `;
-            tbody.appendChild(row);
-        });
-        
-        // Prepare sentiment trend data
-        let sentimentCount = { Positive: 0, Neutral: 0, Negative: 0 };
-        data.forEach(fb => {
-            if (fb.sentiment in sentimentCount) {
-                sentimentCount[fb.sentiment] += 1;
+const PAGE_SIZE = 50;
+let nextCursor = null;
+let sentimentCount = { Positive: 0, Neutral: 0, Negative: 0 };
+let sentimentChart = null;
+
+function capitalize(value) {
+    return value ? value.charAt(0).toUpperCase() + value.slice(1).toLowerCase() : value;
+}
+
+function renderRow(fb) {
+    const row = document.createElement('tr');
+    row.dataset.id = fb.id;
+    // Cells are set as text: names, emails and feedback come from anonymous submitters
+    [fb.id, fb.name, fb.email, fb.feedback_text, fb.sentiment ?? fb.status, fb.created_at].forEach(value => {
+        const cell = document.createElement('td');
+        cell.textContent = value ?? '';
+        row.appendChild(cell);
+    });
+    return row;
+}
+
+function findRow(id) {
+    return document.querySelector(`#feedbackTableBody tr[data-id="${id}"]`);
+}
+
+async function loadPage(cursor) {
+    // Fetch one page of feedback data from the API endpoint
+    const params = new URLSearchParams({ limit: PAGE_SIZE, include_text: 'true' });
+    if (cursor) {
+        params.set('cursor', cursor);
+    }
+    const response = await fetch(`/api/feedbacks?${params}`);
+    const data = await response.json();
+
+    // Append the page to the feedback table
+    const tbody = document.getElementById('feedbackTableBody');
+    data.items.forEach(fb => {
+        if (!findRow(fb.id)) {
+            tbody.appendChild(renderRow(fb));
+        }
+    });
+
+    nextCursor = data.next_cursor;
+    document.getElementById('loadMore').hidden = !nextCursor;
+}
+
+async function loadStats() {
+    // Sentiment totals are precomputed server-side
+    const response = await fetch('/api/stats');
+    const stats = await response.json();
+    sentimentCount = { Positive: 0, Neutral: 0, Negative: 0 };
+    Object.entries(stats.totals).forEach(([sentiment, totals]) => {
+        const label = capitalize(sentiment);
+        if (label in sentimentCount) {
+            sentimentCount[label] = totals.count;
+        }
+    });
+}
+
+function renderChart() {
+    const labels = Object.keys(sentimentCount);
+    const counts = Object.values(sentimentCount);
+    if (sentimentChart) {
+        sentimentChart.data.datasets[0].data = counts;
+        sentimentChart.update();
+        return;
+    }
+    const ctx = document.getElementById('sentimentChart').getContext('2d');
+    sentimentChart = new Chart(ctx, {
+        type: 'bar',
+        data: {
+            labels: labels,
+            datasets: [{
+                label: 'Feedback Count',
+                data: counts,
+                borderWidth: 1
+            }]
+        },
+        options: {
+            scales: {
+                y: { beginAtZero: true }
             }
-        });
-        const labels = Object.keys(sentimentCount);
-        const counts = Object.values(sentimentCount);
-        
-        const ctx = document.getElementById('sentimentChart').getContext('2d');
-        new Chart(ctx, {
-            type: 'bar',
-            data: {
-                labels: labels,
-                datasets: [{
-                    label: 'Feedback Count',
-                    data: counts,
-                    borderWidth: 1
-                }]
-            },
-            options: {
-                scales: {
-                    y: { beginAtZero: true }
-                }
+        }
+    });
+}
+
+function subscribeToEvents() {
+    // Live updates: new or enriched feedback, deletions and sentiment count deltas
+    const source = new EventSource('/api/events');
+    let reconnecting = false;
+
+    source.addEventListener('feedback', event => {
+        const fb = JSON.parse(event.data);
+        const existing = findRow(fb.id);
+        if (existing) {
+            existing.replaceWith(renderRow(fb));
+        } else {
+            document.getElementById('feedbackTableBody').prepend(renderRow(fb));
+        }
+    });
+
+    source.addEventListener('deleted', event => {
+        const existing = findRow(JSON.parse(event.data).id);
+        if (existing) {
+            existing.remove();
+        }
+    });
+
+    source.addEventListener('stats', event => {
+        const { counts } = JSON.parse(event.data);
+        Object.entries(counts).forEach(([sentiment, delta]) => {
+            const label = capitalize(sentiment);
+            if (label in sentimentCount) {
+                sentimentCount[label] += delta;
             }
         });
+        renderChart();
+    });
+
+    source.addEventListener('open', async () => {
+        // Deltas sent while disconnected were missed; resynchronize the counts
+        if (reconnecting) {
+            await loadStats();
+            renderChart();
+        }
+    });
+
+    source.addEventListener('error', () => {
+        reconnecting = true;
+    });
+}
+
+window.addEventListener('load', async () => {
+    try {
+        await Promise.all([loadPage(null), loadStats()]);
+        renderChart();
     } catch (err) {
         console.error('Error fetching feedback data:', err);
     }
+    subscribeToEvents();
+
+    document.getElementById('loadMore').addEventListener('click', async () => {
+        try {
+            await loadPage(nextCursor);
+        } catch (err) {
+            console.error('Error fetching feedback data:', err);
+        }
+    });
 });
@@ -0,0 +1,46 @@
+"""
+Test settings: a throwaway SQLite database and the fake analysis and storage
+backends, set before anything imports ``config``.
+"""
+import asyncio
+import os
+import tempfile
+from typing import Any, Awaitable
+
+import pytest
+
+_DATA_DIR = tempfile.mkdtemp(prefix="feedback-tests-")
+os.environ.update({
+    "AZURE_SQL_CONN_STR": f"sqlite+aiosqlite:///{_DATA_DIR}/tests.db",
+    "TEXT_ANALYTICS_BACKEND": "fake",
+    "FAKE_ANALYTICS_LATENCY_MS": "0",
+    "STORAGE_BACKEND": "local",
+    "LOCAL_STORAGE_DIR": os.path.join(_DATA_DIR, "uploads"),
+    "DATA_DIR": _DATA_DIR,
+    "REDIS_URL": "redis://127.0.0.1:1",
+    "DEDUP_MODE": "off",
+    "METRICS_ENABLED": "false",
+})
+
+from app.services import cognitive  # noqa: E402
+from app.services.db_async_sqlalchemy import dispose_engines, init_db  # noqa: E402
+
+
+def run(coroutine: Awaitable[Any]) -> Any:
+    """
+    Run ``coroutine`` on a fresh event loop, then release everything bound to it.
+    """
+    async def main() -> Any:
+        try:
+            return await coroutine
+        finally:
+            await cognitive.drain()
+            cognitive.close()
+            await dispose_engines()
+
+    return asyncio.run(main())
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database() -> None:
+    run(init_db())
@@ -0,0 +1,55 @@
+import asyncio
+
+from app.services.analysis_cache import AnalysisCache, LRUCache, text_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_trivially_different_texts_share_a_key():
+    assert text_key("  The app is GREAT!  ") == text_key("the app   is great")
+    assert text_key("the app is great") != text_key("the app is slow")
+
+
+def test_lru_evicts_least_recently_used_and_expires():
+    clock = FakeClock()
+    cache = LRUCache(maxsize=2, ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.evictions == 1
+
+    clock.now = 10
+    assert cache.get("a") is None
+    assert cache.expirations == 1
+
+
+def test_concurrent_misses_share_one_upstream_call():
+    cache = AnalysisCache(redis_ttl=0)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"sentiment": "positive", "key_phrases": ["editor"]}
+
+    async def scenario():
+        results = await asyncio.gather(*(cache.get_or_compute("The new editor is great.", compute) for _ in range(5)))
+        again = await cache.get_or_compute("the new editor is great", compute)
+        return results, again
+
+    results, again = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert cache.coalesced == 4
+    assert again == results[0]
+    # Callers get their own key phrase lists
+    results[0]["key_phrases"].append("mutated")
+    assert results[1]["key_phrases"] == ["editor"]
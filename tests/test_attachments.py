@@ -0,0 +1,42 @@
+import io
+
+from app.services import attachments, storage
+from app.services.attachments import content_name, hash_stream, store_attachment
+from tests.conftest import run
+
+
+def test_content_name_keeps_only_a_safe_extension():
+    sha256 = "ab" + "0" * 62
+    assert content_name(sha256, "Report.PDF") == f"ab/{sha256}.pdf"
+    assert content_name(sha256, "../../etc/passwd") == f"ab/{sha256}"
+    assert content_name(sha256, "archive.tar.<script>") == f"ab/{sha256}"
+
+
+def test_hash_stream_rewinds(monkeypatch):
+    monkeypatch.setattr(attachments, "CHUNK_SIZE", 4)
+    stream = io.BytesIO(b"attachment bytes")
+    sha256, size = hash_stream(stream)
+    assert size == 16
+    assert stream.read() == b"attachment bytes"
+
+
+def test_identical_content_is_uploaded_once(monkeypatch):
+    uploads = []
+    upload = storage.upload_file_to_blob_async
+
+    async def counting_upload(*args, **kwargs):
+        uploads.append(args[1])
+        return await upload(*args, **kwargs)
+
+    monkeypatch.setattr(storage, "upload_file_to_blob_async", counting_upload)
+
+    async def scenario():
+        first = await store_attachment(io.BytesIO(b"same screenshot"), "one.png")
+        second = await store_attachment(io.BytesIO(b"same screenshot"), "two.png")
+        other = await store_attachment(io.BytesIO(b"other screenshot"), "one.png")
+        return first, second, other
+
+    first, second, other = run(scenario())
+    assert first == second
+    assert other != first
+    assert len(uploads) == 2
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from app.services.batching import MicroBatchAnalyzer
+from app.services.fakes import FakeTextAnalyticsClient
+from app.services.resilience import CircuitBreaker, ResilientCaller
+
+
+def test_concurrent_texts_are_sent_in_batches():
+    client = FakeTextAnalyticsClient(latency=0, max_batch_size=10)
+    analyzer = MicroBatchAnalyzer(client, max_batch_size=10, max_delay=0.01)
+    texts = ["Great support, thanks." if i % 2 else "Checkout is broken and slow." for i in range(25)]
+
+    async def scenario():
+        return await asyncio.gather(*(analyzer.analyze(text) for text in texts))
+
+    results = asyncio.run(scenario())
+    assert analyzer.batches == 3
+    # One sentiment and one key-phrase call per batch
+    assert client.calls == 6
+    assert [result["sentiment"] for result in results] == ["negative", "positive"] * 12 + ["negative"]
+
+
+def test_batch_failure_reaches_every_caller():
+    class BrokenClient:
+        def analyze_sentiment(self, texts):
+            raise RuntimeError("service down")
+
+        def extract_key_phrases(self, texts):
+            return []
+
+    analyzer = MicroBatchAnalyzer(BrokenClient(), max_delay=0.01)
+
+    async def scenario():
+        return await asyncio.gather(*(analyzer.analyze(f"text {i}") for i in range(3)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert analyzer.batches == 0
+
+
+def test_drain_flushes_buffered_texts():
+    client = FakeTextAnalyticsClient(latency=0)
+    analyzer = MicroBatchAnalyzer(client, max_delay=60)
+
+    async def scenario():
+        pending = asyncio.ensure_future(analyzer.analyze("Quick question about billing."))
+        await asyncio.sleep(0)
+        assert analyzer.buffered == 1
+        await analyzer.drain()
+        return await asyncio.wait_for(pending, 1)
+
+    assert asyncio.run(scenario())["sentiment"] == "neutral"
+
+
+@pytest.mark.parametrize("size", [1, 10])
+def test_batches_respect_the_size_limit(size):
+    client = FakeTextAnalyticsClient(latency=0, max_batch_size=size)
+    analyzer = MicroBatchAnalyzer(client, max_batch_size=size, max_delay=0.01)
+
+    async def scenario():
+        await asyncio.gather(*(analyzer.analyze(f"text {i}") for i in range(12)))
+
+    asyncio.run(scenario())
+    assert analyzer.documents == 12
+    assert analyzer.batches == -(-12 // size)
+
+
+def test_half_open_batch_closes_the_circuit():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    caller = ResilientCaller(retries=0, breaker=breaker)
+    analyzer = MicroBatchAnalyzer(FakeTextAnalyticsClient(latency=0), max_delay=0.01, caller=caller)
+
+    async def scenario():
+        breaker.record_failure()
+        await asyncio.sleep(0.01)
+        # Both requests of the trial batch go through the single trial slot
+        return await analyzer.analyze("The new editor is great.")
+
+    assert asyncio.run(scenario())["sentiment"] == "positive"
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert caller.rejected == 0
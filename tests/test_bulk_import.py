@@ -0,0 +1,59 @@
+import io
+import json
+
+import httpx
+
+from app.main import app
+from app.services.bulk_import import import_feedbacks
+from tests.conftest import run
+
+
+def _jsonl(*records) -> bytes:
+    return "\n".join(json.dumps(record) for record in records).encode()
+
+
+def _row(number: int) -> dict:
+    return {"name": f"user{number}", "email": f"user{number}@example.com", "feedback_text": f"Import test row {number}."}
+
+
+def test_imports_valid_rows_and_reports_invalid_ones():
+    data = _jsonl(_row(1), {"name": "x", "email": "not-an-email", "feedback_text": "bad email"}, _row(3)) + b"\n{broken\n[1, 2]"
+    report = run(import_feedbacks(io.BytesIO(data), fmt="jsonl"))
+    assert report["imported"] == 2
+    assert [error["row"] for error in report["errors"]] == [2, 4, 5]
+    assert report["errors"][1]["error"].startswith("Invalid JSON")
+    assert report["errors"][2]["error"] == "Expected a JSON object."
+
+
+def test_invalid_utf8_is_a_row_error():
+    data = _jsonl(_row(1)) + b"\n" + b'{"name": "x\xff\xfe"}' + b"\n" + _jsonl(_row(3))
+    report = run(import_feedbacks(io.BytesIO(data), fmt="jsonl"))
+    assert report["imported"] == 2
+    assert report["errors"] == [{"row": 2, "error": "Invalid UTF-8 text."}]
+
+
+def test_csv_row_with_extra_fields_is_a_row_error():
+    data = (
+        "name,email,feedback_text\n"
+        "a,a@example.com,first\n"
+        "b,b@example.com,second,unexpected\n"
+        "c,c@example.com,\xe9t\xe9\n"
+    ).encode("utf-8") + b"d,d@example.com,caf\xe9\n"
+    report = run(import_feedbacks(io.BytesIO(data), fmt="csv"))
+    assert report["imported"] == 2
+    assert report["errors"] == [
+        {"row": 2, "error": "Expected 3 fields, got 4."},
+        {"row": 4, "error": "Invalid UTF-8 text."},
+    ]
+
+
+def test_bad_upload_is_reported_not_a_server_error():
+    async def post():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            files = {"file": ("bad.csv", b"name,email,feedback_text\nb,b@example.com,x,y\n\xff\xfe,c@example.com,z\n")}
+            return await client.post("/api/feedbacks/import", files=files)
+
+    response = run(post())
+    assert response.status_code == 200
+    assert response.json()["failed"] == 2
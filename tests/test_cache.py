@@ -0,0 +1,47 @@
+import httpx
+
+from app import cache
+from app.main import app
+from app.services.db_async_sqlalchemy import save_feedback
+from tests.conftest import run
+
+
+def test_response_is_computed_once_until_its_tag_is_invalidated():
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        return {"calls": len(calls)}
+
+    async def scenario():
+        first = await cache.get_or_compute_response("test:tagged", ["test-tag"], compute)
+        second = await cache.get_or_compute_response("test:tagged", ["test-tag"], compute)
+        await cache.invalidate_tags("test-tag")
+        third = await cache.get_or_compute_response("test:tagged", ["test-tag"], compute)
+        return first, second, third
+
+    first, second, third = run(scenario())
+    assert len(calls) == 2
+    assert first == second
+    assert third["body"] == '{"calls": 2}'
+    assert third["etag"] != first["etag"]
+
+
+def test_etag_revalidation_and_invalidation_on_write():
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = await client.get("/api/feedbacks", params={"limit": 5, "email": "cache@example.com"})
+            etag = first.headers["etag"]
+            unchanged = await client.get("/api/feedbacks", params={"limit": 5, "email": "cache@example.com"}, headers={"If-None-Match": etag})
+            await save_feedback({"name": "cache", "email": "cache@example.com", "feedback_text": "Cache test.", "sentiment": "positive"})
+            changed = await client.get("/api/feedbacks", params={"limit": 5, "email": "cache@example.com"}, headers={"If-None-Match": etag})
+            return first, unchanged, changed
+
+    first, unchanged, changed = run(scenario())
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "no-cache"
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != first.headers["etag"]
@@ -0,0 +1,51 @@
+import asyncio
+
+from sqlalchemy import text
+
+from app.services.db_async_sqlalchemy import create_engine, is_file_sqlite
+from tests.conftest import run
+
+
+def test_file_sqlite_detection():
+    assert is_file_sqlite("sqlite+aiosqlite:////tmp/feedback.db")
+    assert not is_file_sqlite("sqlite+aiosqlite:///:memory:")
+    assert not is_file_sqlite("postgresql+asyncpg://db/feedback")
+
+
+def test_sqlite_connections_use_wal(tmp_path):
+    engine = create_engine(f"sqlite+aiosqlite:///{tmp_path}/wal.db")
+
+    async def scenario():
+        async with engine.connect() as conn:
+            mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+        await engine.dispose()
+        return mode
+
+    assert run(scenario()) == "wal"
+
+
+def test_immediate_writers_from_separate_engines_serialize(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path}/writers.db"
+    # One engine per simulated worker process, each with its own write connection
+    engines = [create_engine(url, immediate=True, pool_size=1, max_overflow=0) for _ in range(2)]
+
+    async def increment(engine):
+        for _ in range(20):
+            async with engine.begin() as conn:
+                # Read, then write: a deferred transaction could not upgrade its lock here
+                value = (await conn.execute(text("SELECT value FROM counter"))).scalar()
+                await asyncio.sleep(0)
+                await conn.execute(text("UPDATE counter SET value = :value"), {"value": value + 1})
+
+    async def scenario():
+        async with engines[0].begin() as conn:
+            await conn.execute(text("CREATE TABLE counter (value INTEGER)"))
+            await conn.execute(text("INSERT INTO counter VALUES (0)"))
+        await asyncio.gather(*(increment(engine) for engine in engines))
+        async with engines[0].connect() as conn:
+            value = (await conn.execute(text("SELECT value FROM counter"))).scalar()
+        for engine in engines:
+            await engine.dispose()
+        return value
+
+    assert run(scenario()) == 40
@@ -0,0 +1,113 @@
+import io
+import random
+from datetime import datetime
+
+from fastapi import UploadFile
+
+from app.services import dedup, submission
+from app.services.db_async_sqlalchemy import save_feedback
+from app.services.dedup import DuplicateDetector, LSHIndex
+from config import config
+from tests.conftest import run
+
+_rng = random.Random(22)
+_WORDS = ["".join(_rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(_rng.randint(3, 9))) for _ in range(2000)]
+
+
+def _text(words: int = 40) -> str:
+    return " ".join(_rng.choice(_WORDS) for _ in range(words))
+
+
+def _changed(text: str, changes: int) -> str:
+    tokens = text.split()
+    for position in _rng.sample(range(len(tokens)), changes):
+        tokens[position] = _rng.choice(_WORDS)
+    return " ".join(tokens)
+
+
+async def _save(text: str, duplicate_of=None) -> int:
+    return await save_feedback({
+        "name": "dedup",
+        "email": "dedup@example.com",
+        "feedback_text": text,
+        "sentiment": "neutral",
+        "status": "complete",
+        "duplicate_of": duplicate_of,
+        "created_at": datetime.utcnow(),
+    })
+
+
+def test_threshold_separates_near_duplicates_from_different_texts():
+    original = _text()
+
+    async def scenario():
+        detector = DuplicateDetector(threshold=0.85, min_chars=30)
+        await _save(original)
+        await detector.catch_up()
+        detector.ready = True
+        return (
+            await detector.find_duplicate(_changed(original, 1)),
+            await detector.find_duplicate(_changed(original, 15)),
+            await detector.find_duplicate(_text()),
+            await detector.find_duplicate(original[:20]),
+        )
+
+    near, distant, unrelated, short = run(scenario())
+    assert near is not None and near["feedback_text"] == original and near["similarity"] >= 0.85
+    assert distant is None
+    assert unrelated is None
+    assert short is None
+
+
+def test_catch_up_skips_flagged_duplicates_and_rows_added_by_this_worker():
+    original = _text()
+
+    async def scenario():
+        detector = DuplicateDetector()
+        await detector.catch_up()
+        documents = detector.index.documents
+        original_id = await _save(original)
+        await _save(_changed(original, 1), duplicate_of=original_id)
+        detector.add(original_id, original)
+        await detector.catch_up()
+        # A row the scan already covered is not indexed again
+        detector.add(original_id, original)
+        return detector.index.documents - documents
+
+    assert run(scenario()) == 1
+
+
+def test_candidates_are_capped_to_those_sharing_most_bands():
+    index = LSHIndex()
+    text = _text()
+    index.add(1, index.keys_for(text))
+    for feedback_id in range(2, 500):
+        index.add(feedback_id, index.keys_for(_changed(text, 2)))
+    index.merge()
+    keys = index.keys_for(text)
+    assert len(index.candidates(keys)) > 20
+    capped = index.candidates(keys, limit=20)
+    assert len(capped) == 20
+    assert 1 in capped
+
+
+def test_collapse_keeps_a_duplicate_that_brings_an_attachment(monkeypatch):
+    original = _text()
+    monkeypatch.setattr(config, "DEDUP_MODE", "collapse")
+
+    async def scenario():
+        detector = DuplicateDetector()
+        monkeypatch.setattr(dedup, "detector", detector)
+        original_id = await _save(original)
+        await detector.catch_up()
+        detector.ready = True
+        collapsed = await submission.process_submission("a", "a@example.com", _changed(original, 1))
+        attachment = UploadFile(io.BytesIO(b"screenshot"), filename="screenshot.png")
+        kept = await submission.process_submission("b", "b@example.com", _changed(original, 1), attachment)
+        return original_id, collapsed, kept
+
+    original_id, collapsed, kept = run(scenario())
+    assert collapsed["id"] == original_id
+    assert kept["id"] != original_id
+    assert kept["duplicate_of"] == original_id
+    assert kept["attachment_url"]
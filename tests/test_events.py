@@ -0,0 +1,56 @@
+import asyncio
+import json
+
+import pytest
+
+from app.services.events import EventHub, TooManySubscribersError
+
+
+def _data(frame):
+    return json.loads(frame.split("data: ", 1)[1])
+
+
+def test_every_subscriber_gets_each_event():
+    hub = EventHub()
+
+    async def scenario():
+        async with hub.subscription() as first, hub.subscription() as second:
+            await hub.publish("feedback", {"id": 1})
+            frames = [first.get_nowait(), second.get_nowait()]
+        return frames
+
+    frames = asyncio.run(scenario())
+    assert frames[0] == frames[1]
+    assert frames[0].startswith("event: feedback\n")
+    assert _data(frames[0]) == {"id": 1}
+    assert hub.subscriber_count == 0
+
+
+def test_slow_subscriber_loses_oldest_frames():
+    hub = EventHub(queue_size=2)
+
+    async def scenario():
+        queue = hub.subscribe()
+        for i in range(5):
+            await hub.publish("feedback", {"id": i})
+        return [_data(queue.get_nowait())["id"] for _ in range(queue.qsize())]
+
+    assert asyncio.run(scenario()) == [3, 4]
+    assert hub.dropped == 3
+
+
+def test_publish_without_subscribers_is_skipped():
+    hub = EventHub()
+    asyncio.run(hub.publish("feedback", {"id": 1}))
+    assert hub.published == 0
+
+
+def test_subscriber_limit():
+    hub = EventHub(max_subscribers=1)
+
+    async def scenario():
+        hub.subscribe()
+        with pytest.raises(TooManySubscribersError):
+            hub.subscribe()
+
+    asyncio.run(scenario())
@@ -0,0 +1,33 @@
+import csv
+import io
+import json
+from datetime import datetime
+
+from app.services.db_async_sqlalchemy import save_feedback
+from app.services.export import export_feedbacks
+from tests.conftest import run
+
+
+async def _collect(fmt):
+    return "".join([chunk async for chunk in export_feedbacks(fmt, batch_size=2, email="export@example.com")])
+
+
+def test_ndjson_and_csv_exports_stream_every_row():
+    async def scenario():
+        for i in range(5):
+            await save_feedback({
+                "name": f"export{i}", "email": "export@example.com", "feedback_text": f"Export test {i}.",
+                "sentiment": "positive", "key_phrases": ["export", f"row {i}"], "created_at": datetime(2024, 3, 1, 12, i),
+            })
+        return await _collect("ndjson"), await _collect("csv")
+
+    ndjson, text = run(scenario())
+    records = [json.loads(line) for line in ndjson.splitlines()]
+    assert [record["name"] for record in records] == [f"export{i}" for i in reversed(range(5))]
+    assert records[0]["key_phrases"] == ["export", "row 4"]
+    assert records[0]["created_at"] == "2024-03-01T12:04:00"
+
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert [row["name"] for row in rows] == [record["name"] for record in records]
+    assert rows[0]["feedback_text"] == "Export test 4."
+    assert rows[0]["key_phrases"] == "export; row 4"
@@ -0,0 +1,65 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.models.feedback import STATUS_COMPLETE, STATUS_PENDING
+from app.services.db_async_sqlalchemy import get_feedback, save_feedback
+from app.services.ingestion import IngestionQueue, QueueFullError
+from tests.conftest import run
+
+
+def test_pending_feedback_is_enriched_in_the_background():
+    queue = IngestionQueue(maxsize=10, workers=2)
+
+    async def scenario():
+        await queue.start()
+        try:
+            feedback_ids = []
+            for text in ("The new editor is great.", "Checkout is broken."):
+                async with queue.slot():
+                    feedback_id = await save_feedback({
+                        "name": "queue", "email": "queue@example.com", "feedback_text": text,
+                        "status": STATUS_PENDING, "created_at": datetime.utcnow(),
+                    })
+                    queue.put(feedback_id)
+                feedback_ids.append(feedback_id)
+            for _ in range(200):
+                rows = [await get_feedback(feedback_id) for feedback_id in feedback_ids]
+                if all(row.status == STATUS_COMPLETE for row in rows):
+                    return rows
+                await asyncio.sleep(0.01)
+            return rows
+        finally:
+            await queue.stop()
+
+    rows = run(scenario())
+    assert [row.status for row in rows] == [STATUS_COMPLETE, STATUS_COMPLETE]
+    assert [row.sentiment for row in rows] == ["positive", "negative"]
+
+
+def test_slot_is_refused_when_the_queue_is_full():
+    queue = IngestionQueue(maxsize=1, workers=1)
+
+    async def scenario():
+        await queue.start()
+        try:
+            async with queue.slot():
+                with pytest.raises(QueueFullError):
+                    async with queue.slot():
+                        pass
+            async with queue.slot():
+                return queue.depth
+        finally:
+            await queue.stop()
+
+    assert run(scenario()) == 1
+
+
+def test_slot_requires_a_running_queue():
+    async def scenario():
+        async with IngestionQueue().slot():
+            pass
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(scenario())
@@ -0,0 +1,36 @@
+import threading
+
+from app.services.local_analyzer import LocalTextAnalyticsClient
+
+
+def test_concurrent_first_calls_share_one_process_pool(monkeypatch):
+    created = []
+
+    class RecordingPool:
+        def __init__(self, *args, **kwargs):
+            created.append(self)
+
+        def submit(self, func, *args):
+            class Done:
+                def result(self):
+                    return func(*args)
+            return Done()
+
+        def shutdown(self, **kwargs):
+            pass
+
+    monkeypatch.setattr("app.services.local_analyzer.ProcessPoolExecutor", RecordingPool)
+    client = LocalTextAnalyticsClient(workers=2)
+    barrier = threading.Barrier(8)
+
+    def call():
+        barrier.wait()
+        client.analyze_sentiment(["The new editor is great."])
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    client.close()
+    assert len(created) == 1
@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("prometheus_client")
+
+# Metrics are configured at import, so each scenario runs in its own interpreter
+_SCRIPT = """
+import asyncio
+import sys
+import httpx
+from app.main import app
+from app.services.db_async_sqlalchemy import dispose_engines
+
+async def main():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/health")
+        if sys.argv[1] == "render":
+            sys.stdout.write((await client.get("/metrics")).text)
+    await dispose_engines()
+
+asyncio.run(main())
+"""
+
+
+def _run(mode, **env):
+    result = subprocess.run(
+        [sys.executable, "-c", _SCRIPT, mode],
+        env={**os.environ, "METRICS_ENABLED": "true", **env}, capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+def _request_count(body):
+    series = 'http_request_duration_seconds_count{method="GET",route="/health",status="200"}'
+    return [float(line.split()[-1]) for line in body.splitlines() if line.startswith(series)]
+
+
+def test_requests_are_labelled_by_route():
+    assert _request_count(_run("render")) == [1.0]
+
+
+def test_multiprocess_mode_merges_workers(tmp_path):
+    env = {"PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    _run("request", **env)
+    assert _request_count(_run("render", **env)) == [2.0]
@@ -0,0 +1,41 @@
+from datetime import datetime
+
+import pytest
+
+from app.services.db_async_sqlalchemy import get_feedbacks_page, save_feedback
+from app.services.pagination import decode_cursor, encode_cursor
+from tests.conftest import run
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 250000)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", encode_cursor(datetime(2024, 1, 1), 1)[:-4]])
+def test_malformed_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_pages_cover_every_row_once_in_order():
+    created_at = datetime.utcnow()
+
+    async def scenario():
+        ids = [
+            await save_feedback({
+                "name": "page", "email": "pages@example.com", "feedback_text": f"Page test {i}.",
+                "sentiment": "neutral", "created_at": created_at,
+            })
+            for i in range(7)
+        ]
+        seen, after = [], None
+        while True:
+            rows, after = await get_feedbacks_page(limit=3, after=after, email="pages@example.com")
+            seen += [row["id"] for row in rows]
+            if after is None:
+                return ids, seen
+
+    ids, seen = run(scenario())
+    # Rows with the same timestamp are ordered by id
+    assert seen == sorted(ids, reverse=True)
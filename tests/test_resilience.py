@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+
+from app.services.resilience import (
+    AnalysisUnavailableError,
+    CircuitBreaker,
+    CircuitOpenError,
+    ResilientCaller,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ServiceError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def test_breaker_opens_after_threshold_and_half_opens_after_timeout():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10, clock=clock)
+    for _ in range(3):
+        breaker.check()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+
+    clock.now = 10
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.check()
+    # Only one trial call while half-open
+    with pytest.raises(CircuitOpenError):
+        breaker.check()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.opened == 1
+
+
+def test_failed_trial_reopens_the_circuit():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5, clock=clock)
+    breaker.record_failure()
+    clock.now = 5
+    breaker.check()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.retry_in == 5
+    assert breaker.opened == 2
+
+
+def test_caller_retries_transient_errors_only():
+    async def scenario():
+        caller = ResilientCaller(retries=2, backoff_base=0, backoff_cap=0)
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise ServiceError(503)
+            return "ok"
+
+        assert await caller.call(flaky) == "ok"
+        assert caller.retried == 2
+
+        async def bad_request():
+            raise ServiceError(400)
+
+        with pytest.raises(ServiceError):
+            await caller.call(bad_request)
+        assert caller.breaker.state == CircuitBreaker.CLOSED
+
+    asyncio.run(scenario())
+
+
+def test_caller_gives_up_and_then_fails_fast():
+    async def scenario():
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+        caller = ResilientCaller(retries=1, backoff_base=0, backoff_cap=0, breaker=breaker)
+        calls = []
+
+        async def down():
+            calls.append(1)
+            raise ServiceError(503)
+
+        with pytest.raises(AnalysisUnavailableError):
+            await caller.call(down)
+        assert len(calls) == 2
+        with pytest.raises(CircuitOpenError):
+            await caller.call(down)
+        assert len(calls) == 2
+        assert caller.rejected == 1
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_trial_frees_the_half_open_circuit():
+    async def scenario():
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        caller = ResilientCaller(retries=0, breaker=breaker)
+        breaker.record_failure()
+        await asyncio.sleep(0.05)
+
+        async def hang():
+            await asyncio.sleep(60)
+
+        trial = asyncio.ensure_future(caller.call(hang))
+        await asyncio.sleep(0)
+        with pytest.raises(CircuitOpenError):
+            await caller.call(hang)
+        trial.cancel()
+        await asyncio.gather(trial, return_exceptions=True)
+
+        async def ok():
+            return "ok"
+
+        assert await caller.call(ok) == "ok"
+        assert breaker.state == CircuitBreaker.CLOSED
+
+    asyncio.run(scenario())
@@ -0,0 +1,54 @@
+import gzip
+import json
+from datetime import datetime
+
+from app.models.archive import FeedbackArchive
+from app.services.db_async_sqlalchemy import get_feedback, get_feedbacks_page, get_sentiment_stats, save_feedback
+from app.services.retention import RetentionMover
+from tests.conftest import run
+
+
+def test_old_feedback_moves_to_the_archive_and_stays_listed(tmp_path):
+    mover = RetentionMover(batch_size=2, batch_pause=0, archive_dir=str(tmp_path))
+    # Only rows older than 2001 are old enough, so rows written by other tests stay live
+    days = (datetime.utcnow() - datetime(2001, 1, 1)).days
+
+    async def scenario():
+        feedback_ids = [
+            await save_feedback({
+                "name": "old", "email": "retention@example.com", "feedback_text": f"Retention test {i}.",
+                "sentiment": "negative", "created_at": datetime(2000, 6, 1 + i),
+            })
+            for i in range(3)
+        ]
+        # The newest record is never archived
+        await save_feedback({
+            "name": "new", "email": "retention-new@example.com", "feedback_text": "Retention test.",
+            "sentiment": "positive", "created_at": datetime.utcnow(),
+        })
+        before = await get_sentiment_stats()
+        moved = await mover.run_once(days=days)
+        after = await get_sentiment_stats()
+        rows, _ = await get_feedbacks_page(limit=10, email="retention@example.com")
+        archived = [await get_feedback(feedback_id) for feedback_id in feedback_ids]
+        return feedback_ids, moved, before, after, rows, archived
+
+    feedback_ids, moved, before, after, rows, archived = run(scenario())
+    assert moved == 3
+    # Single-record reads fall back to the archive
+    assert all(isinstance(row, FeedbackArchive) for row in archived)
+    assert [row["id"] for row in rows] == list(reversed(feedback_ids))
+    # Archiving does not change the dashboard figures
+    assert after["totals"] == before["totals"]
+    with gzip.open(tmp_path / "feedbacks-2000-06.jsonl.gz", "rt", encoding="utf-8") as archive_file:
+        assert [json.loads(line)["id"] for line in archive_file] == feedback_ids
+
+
+def test_one_mover_per_lock_file(tmp_path):
+    lock_path = str(tmp_path / "locks" / "retention.lock")
+    first, second = RetentionMover(lock_path=lock_path), RetentionMover(lock_path=lock_path)
+    assert first._lead()
+    assert not second._lead()
+    first._resign()
+    assert second._lead()
+    second._resign()
@@ -0,0 +1,100 @@
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import func, select
+
+from app.models.archive import FeedbackArchive
+from app.models.feedback import Feedback
+from app.services import rollups
+from app.services.db_async_sqlalchemy import (
+    async_session_maker, delete_feedback, get_sentiment_stats, rebuild_sentiment_rollups, save_feedback, update_feedback,
+)
+from tests.conftest import run
+
+
+def _feedback(sentiment: str, positive: float) -> dict:
+    return {
+        "name": "rollups",
+        "email": "rollups@example.com",
+        "feedback_text": f"Rollup test ({sentiment}).",
+        "sentiment": sentiment,
+        "score_positive": positive,
+        "score_neutral": 0.0,
+        "score_negative": 1.0 - positive,
+        "created_at": datetime.utcnow(),
+    }
+
+
+def _counts(stats: dict) -> dict:
+    return {sentiment: totals["count"] for sentiment, totals in stats["totals"].items() if totals["count"]}
+
+
+def _series(stats: dict) -> list:
+    return [
+        {sentiment: totals for sentiment, totals in point["sentiments"].items() if totals["count"]}
+        for point in stats["series"]
+    ]
+
+
+async def _counted_rows() -> dict:
+    # Rollups keep counting archived records
+    counts: dict = {}
+    async with async_session_maker() as session:
+        for model in (Feedback, FeedbackArchive):
+            result = await session.execute(
+                select(model.sentiment, func.count()).where(model.sentiment.isnot(None)).group_by(model.sentiment)
+            )
+            for sentiment, count in result.all():
+                counts[sentiment] = counts.get(sentiment, 0) + count
+    return counts
+
+
+def test_rollups_follow_saves_updates_and_deletes():
+    async def scenario():
+        before = _counts(await get_sentiment_stats())
+        feedback_id = await save_feedback(_feedback("positive", 0.9))
+        saved = _counts(await get_sentiment_stats())
+        await update_feedback(feedback_id, {"sentiment": "negative", "score_positive": 0.1, "score_negative": 0.9})
+        updated = _counts(await get_sentiment_stats())
+        await delete_feedback(feedback_id)
+        deleted = _counts(await get_sentiment_stats())
+        return before, saved, updated, deleted
+
+    before, saved, updated, deleted = run(scenario())
+    assert saved.get("positive", 0) == before.get("positive", 0) + 1
+    assert updated.get("positive", 0) == before.get("positive", 0)
+    assert updated.get("negative", 0) == before.get("negative", 0) + 1
+    assert deleted.get("negative", 0) == before.get("negative", 0)
+
+
+def test_concurrent_saves_to_new_buckets_are_all_counted():
+    async def scenario():
+        await asyncio.gather(*(save_feedback(_feedback("mixed", 0.5)) for _ in range(20)))
+        return _counts(await get_sentiment_stats()), await _counted_rows()
+
+    stats, rows = run(scenario())
+    assert stats == rows
+
+
+def test_rebuild_matches_incremental_rollups():
+    async def scenario():
+        await save_feedback(_feedback("neutral", 0.2))
+        incremental = await get_sentiment_stats(series="day")
+        await rebuild_sentiment_rollups(batch_size=7)
+        return incremental, await get_sentiment_stats(series="day")
+
+    incremental, rebuilt = run(scenario())
+    assert _counts(rebuilt) == _counts(incremental)
+    assert _series(rebuilt) == _series(incremental)
+
+
+def test_update_or_insert_fallback_counts_every_save(monkeypatch):
+    # Path taken by databases without ON CONFLICT (e.g. SQL Server)
+    monkeypatch.setattr(rollups, "_UPSERT_DIALECTS", {})
+
+    async def scenario():
+        await asyncio.gather(*(save_feedback(_feedback("fallback", 0.5)) for _ in range(5)))
+        return _counts(await get_sentiment_stats()), await _counted_rows()
+
+    stats, rows = run(scenario())
+    assert stats["fallback"] == rows["fallback"] == 5
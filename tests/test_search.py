@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from app.services.db_async_sqlalchemy import save_feedback
+from app.services.search import fts5_query, search_feedbacks
+from tests.conftest import run
+
+
+def test_fts5_query_quotes_terms_and_keeps_prefixes():
+    assert fts5_query('export* "csv" OR NEAR(a)') == '"export"* "csv" "OR" "NEAR" "a"'
+
+
+def test_search_ranks_matches_and_filters_by_phrase():
+    async def scenario():
+        rows = [
+            ("Zanzibar checkout fails on zanzibar cards.", ["zanzibar checkout"]),
+            ("The zanzibar theme looks nice.", ["theme"]),
+            ("Nothing relevant here.", ["nothing"]),
+        ]
+        for text, phrases in rows:
+            await save_feedback({
+                "name": "search", "email": "search@example.com", "feedback_text": text,
+                "sentiment": "neutral", "key_phrases": phrases, "created_at": datetime.utcnow(),
+            })
+        matches, more = await search_feedbacks("zanzibar", include_text=True)
+        by_phrase, _ = await search_feedbacks(phrase="Zanzibar Checkout", include_text=True)
+        return matches, more, by_phrase
+
+    matches, more, by_phrase = run(scenario())
+    assert [row["feedback_text"] for row in matches] == [
+        "Zanzibar checkout fails on zanzibar cards.",
+        "The zanzibar theme looks nice.",
+    ]
+    assert more is False
+    assert matches[0]["score"] > matches[1]["score"]
+    assert [row["feedback_text"] for row in by_phrase] == ["Zanzibar checkout fails on zanzibar cards."]
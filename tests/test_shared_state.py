@@ -0,0 +1,47 @@
+import asyncio
+from datetime import datetime
+
+from app.cache import SQLiteBackend
+from app.models.feedback import STATUS_PENDING
+from app.services.db_async_sqlalchemy import claim_feedback, release_feedback, save_feedback
+from tests.conftest import run
+
+
+def test_sqlite_backend_is_shared_between_instances(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.sqlite")
+    first, second = SQLiteBackend(path), SQLiteBackend(path)
+    now = [1000.0]
+    monkeypatch.setattr("app.cache.time.time", lambda: now[0])
+
+    async def scenario():
+        await first.set("shared", "value", ex=10)
+        seen = await second.get("shared")
+        taken = await second.set("shared", "other", ex=10, nx=True)
+        counts = [await first.incr("counter"), await second.incr("counter")]
+        now[0] += 11
+        expired = await second.get("shared")
+        retaken = await second.set("shared", "other", ex=10, nx=True)
+        return seen, taken, counts, expired, retaken
+
+    seen, taken, counts, expired, retaken = run(scenario())
+    assert seen == "value"
+    assert taken is False
+    assert counts == [1, 2]
+    assert expired is None
+    assert retaken is True
+
+
+def test_only_one_claim_wins_until_released():
+    async def scenario():
+        feedback_id = await save_feedback({
+            "name": "claim", "email": "claim@example.com", "feedback_text": "Claim test.",
+            "status": STATUS_PENDING, "created_at": datetime.utcnow(),
+        })
+        claims = await asyncio.gather(*(claim_feedback(feedback_id, lease_seconds=60) for _ in range(5)))
+        await release_feedback(feedback_id)
+        reclaimed = await claim_feedback(feedback_id, lease_seconds=60)
+        return claims, reclaimed
+
+    claims, reclaimed = run(scenario())
+    assert claims.count(True) == 1
+    assert reclaimed is True
@@ -0,0 +1,36 @@
+import os
+import subprocess
+import sys
+
+import httpx
+
+from app.main import app
+from tests.conftest import run
+
+_IMPORT_CHECK = """
+import sys
+import app.main
+from app.services import cognitive, storage
+assert not [name for name in sys.modules if name.startswith("azure")], "Azure SDK imported"
+assert cognitive._client is None and storage._storage is None, "client built at import"
+"""
+
+
+def test_importing_the_app_builds_no_azure_clients():
+    env = {**os.environ, "TEXT_ANALYTICS_BACKEND": "azure", "STORAGE_BACKEND": "azure"}
+    result = subprocess.run([sys.executable, "-c", _IMPORT_CHECK], env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_health_and_readiness():
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get("/health"), await client.get("/ready")
+
+    health, ready = run(scenario())
+    assert health.json() == {"status": "ok"}
+    assert ready.status_code == 200
+    checks = ready.json()["checks"]
+    assert checks["database"] == {"ok": True, "schema": True}
+    assert checks["analysis"]["circuit_open"] is False
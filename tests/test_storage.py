@@ -0,0 +1,37 @@
+import io
+import os
+
+import pytest
+
+from app.services import storage
+from app.services.storage import LocalFileStorage
+
+
+def test_local_upload_streams_in_chunks_and_publishes_atomically(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "CHUNK_SIZE", 1024)
+    backend = LocalFileStorage(str(tmp_path), "http://files.test/uploads/")
+    data = os.urandom(10 * 1024 + 7)
+
+    url = backend.upload(io.BytesIO(data), "ab/report.bin", length=len(data))
+
+    assert url == "http://files.test/uploads/ab/report.bin"
+    assert (tmp_path / "ab" / "report.bin").read_bytes() == data
+    # No temporary files are left next to the published one
+    assert os.listdir(tmp_path / "ab") == ["report.bin"]
+
+
+def test_failed_upload_leaves_nothing_behind(tmp_path):
+    class BrokenStream:
+        def read(self, size=-1):
+            raise OSError("connection reset")
+
+    backend = LocalFileStorage(str(tmp_path), "http://files.test")
+    with pytest.raises(OSError):
+        backend.upload(BrokenStream(), "broken.bin")
+    assert os.listdir(tmp_path) == []
+
+
+def test_local_paths_stay_inside_the_root(tmp_path):
+    backend = LocalFileStorage(str(tmp_path / "root"), "http://files.test")
+    with pytest.raises(ValueError):
+        backend.upload(io.BytesIO(b"x"), "../escape.txt")
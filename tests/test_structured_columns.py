@@ -0,0 +1,56 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from app.models.types import split_key_phrases
+from app.services.db_async_sqlalchemy import get_feedback, save_feedback, write_session_maker
+from app.services.migrations import backfill_structured_batch
+from tests.conftest import run
+
+
+@pytest.mark.parametrize("value, phrases", [
+    (None, []),
+    (["checkout", " slow "], ["checkout", "slow"]),
+    ('["checkout", "slow"]', ["checkout", "slow"]),
+    ("checkout, slow,", ["checkout", "slow"]),
+    ("[checkout, slow", ["checkout", "slow"]),
+])
+def test_split_key_phrases_reads_every_stored_form(value, phrases):
+    assert split_key_phrases(value) == phrases
+
+
+def test_key_phrases_round_trip_as_a_list():
+    async def scenario():
+        feedback_id = await save_feedback({
+            "name": "columns", "email": "columns@example.com", "feedback_text": "Structured test.",
+            "sentiment": "neutral", "key_phrases": ["dark mode", "export, csv"], "created_at": datetime.utcnow(),
+        })
+        return (await get_feedback(feedback_id)).key_phrases
+
+    # Commas inside a phrase survive the JSON encoding
+    assert run(scenario()) == ["dark mode", "export, csv"]
+
+
+def test_backfill_converts_legacy_rows():
+    async def scenario():
+        # Written without a sentiment since this bypasses the rollups
+        async with write_session_maker() as session:
+            async with session.begin():
+                result = await session.execute(text(
+                    "INSERT INTO feedbacks (name, email, feedback_text, sentiment, confidence_scores, key_phrases, status, created_at) "
+                    "VALUES ('legacy', 'legacy@example.com', 'Legacy row.', NULL, "
+                    "\"{'positive': 0.1, 'neutral': 0.2, 'negative': 0.7}\", 'checkout, slow', 'complete', :created_at)"
+                ), {"created_at": datetime.utcnow()})
+                legacy_id = result.lastrowid
+                converted, _ = await backfill_structured_batch(session, after_id=legacy_id - 1)
+        async with write_session_maker() as session:
+            stored = (await session.execute(
+                text("SELECT key_phrases FROM feedbacks WHERE id = :id"), {"id": legacy_id}
+            )).scalar()
+        return converted, stored, await get_feedback(legacy_id)
+
+    converted, stored, feedback = run(scenario())
+    assert converted == 1
+    assert stored == '["checkout", "slow"]'
+    assert (feedback.score_positive, feedback.score_neutral, feedback.score_negative) == (0.1, 0.2, 0.7)
@@ -0,0 +1,72 @@
+import asyncio
+import time
+
+import httpx
+
+from app.api import endpoints
+from app.main import app
+from app.services import cognitive
+from app.services.fakes import FakeTextAnalyticsClient
+from tests.conftest import run
+
+
+def _client(asgi_app=app):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=asgi_app), base_url="http://test")
+
+
+def test_submit_analyzes_stores_and_uploads():
+    async def scenario():
+        # The JSON API's /submit returns the stored record
+        async with _client(endpoints.app) as client:
+            return await client.post(
+                "/submit",
+                data={"name": "Ada", "email": "submit@example.com", "feedback_text": "The new editor is great."},
+                files={"attachment": ("notes.txt", b"submit test attachment", "text/plain")},
+            )
+
+    response = run(scenario())
+    assert response.status_code == 200
+    body = response.json()
+    assert body["sentiment"] == "positive"
+    assert body["status"] == "complete"
+    assert body["attachment_url"].endswith(".txt")
+
+
+def test_slow_analysis_does_not_block_other_requests():
+    async def scenario():
+        # Synchronous SDK calls that sleep; they must run off the event loop
+        cognitive.set_client(FakeTextAnalyticsClient(latency=0.5))
+        async with _client() as client:
+            submit = asyncio.ensure_future(client.post(
+                "/submit", data={"name": "Ada", "email": "submit@example.com", "feedback_text": "Slow analysis test."},
+            ))
+            await asyncio.sleep(0.05)
+            started = time.perf_counter()
+            health = await client.get("/health")
+            health_seconds = time.perf_counter() - started
+            return health, health_seconds, await submit
+
+    health, health_seconds, submitted = run(scenario())
+    assert health.status_code == 200
+    assert health_seconds < 0.25
+    # The form redirects back once the submission is stored
+    assert submitted.status_code == 302
+
+
+def test_failed_upload_reports_the_stage(monkeypatch):
+    async def broken_upload(stream, file_name):
+        raise OSError("storage unreachable")
+
+    monkeypatch.setattr("app.services.submission.store_attachment", broken_upload)
+
+    async def scenario():
+        async with _client() as client:
+            return await client.post(
+                "/submit",
+                data={"name": "Ada", "email": "submit@example.com", "feedback_text": "Upload failure test."},
+                files={"attachment": ("notes.txt", b"never stored", "text/plain")},
+            )
+
+    response = run(scenario())
+    assert response.status_code == 500
+    assert response.json() == {"detail": "Attachment upload error."}